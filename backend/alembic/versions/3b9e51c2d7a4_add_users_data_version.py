@@ -0,0 +1,31 @@
+"""Add data_version counter to users
+
+Revision ID: 3b9e51c2d7a4
+Revises: 7a031d4a1d3d
+Create Date: 2026-10-18 14:05:12.418093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e51c2d7a4'
+down_revision: Union[str, None] = '7a031d4a1d3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bumped by every write to the user's financial data; part of the
+    # response cache key (app/utils/cache.py)
+    op.add_column(
+        'users',
+        sa.Column('data_version', sa.BigInteger(), server_default='0', nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'data_version')
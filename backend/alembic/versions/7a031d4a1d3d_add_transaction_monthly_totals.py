@@ -0,0 +1,54 @@
+"""Add transaction monthly totals aggregate table
+
+Revision ID: 7a031d4a1d3d
+Revises: ebd2b70e2746
+Create Date: 2026-10-18 12:48:09.210554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a031d4a1d3d'
+down_revision: Union[str, None] = 'ebd2b70e2746'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'transaction_monthly_totals',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('account_id', sa.UUID(), nullable=False),
+        sa.Column('category_id', sa.UUID(), nullable=False),
+        sa.Column('type', sa.String(length=20), nullable=False),
+        sa.Column('total', sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'month', 'account_id', 'category_id', 'type')
+    )
+    op.create_index('ix_transaction_monthly_totals_account', 'transaction_monthly_totals', ['account_id'], unique=False)
+    op.create_index('ix_transaction_monthly_totals_category', 'transaction_monthly_totals', ['category_id'], unique=False)
+
+    # Backfill from existing transactions
+    op.execute("""
+        INSERT INTO transaction_monthly_totals
+            (user_id, month, account_id, category_id, type, total, count)
+        SELECT user_id, CAST(date_trunc('month', date) AS DATE), account_id,
+               category_id, type, SUM(amount), COUNT(id)
+        FROM transactions
+        GROUP BY user_id, CAST(date_trunc('month', date) AS DATE), account_id,
+                 category_id, type
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transaction_monthly_totals_category', table_name='transaction_monthly_totals')
+    op.drop_index('ix_transaction_monthly_totals_account', table_name='transaction_monthly_totals')
+    op.drop_table('transaction_monthly_totals')
@@ -0,0 +1,31 @@
+"""Add transactions ledger order index for keyset pagination
+
+Revision ID: 91db8ab51ec5
+Revises: 46fadc0f7e55
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '91db8ab51ec5'
+down_revision: Union[str, None] = '46fadc0f7e55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_transactions_user_date_created_id',
+        'transactions',
+        ['user_id', sa.text('date DESC'), sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_user_date_created_id', table_name='transactions')
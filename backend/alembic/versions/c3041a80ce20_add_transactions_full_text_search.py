@@ -0,0 +1,52 @@
+"""Add full-text search vector to transactions
+
+Revision ID: c3041a80ce20
+Revises: 91db8ab51ec5
+Create Date: 2026-10-18 11:02:47.518320
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3041a80ce20'
+down_revision: Union[str, None] = '91db8ab51ec5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('italian', coalesce(description, '')), 'A') || "
+    "setweight(to_tsvector('italian', coalesce(notes, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(notes, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # Generated column: existing rows are computed while the table is rewritten
+    op.add_column(
+        'transactions',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+            nullable=True
+        )
+    )
+    op.create_index(
+        'ix_transactions_search_vector',
+        'transactions',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_search_vector', table_name='transactions', postgresql_using='gin')
+    op.drop_column('transactions', 'search_vector')
@@ -0,0 +1,95 @@
+"""Add recurring transaction occurrence columns
+
+Revision ID: d81f4a6c9b27
+Revises: 3b9e51c2d7a4
+Create Date: 2026-10-18 17:41:06.215384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f4a6c9b27'
+down_revision: Union[str, None] = '3b9e51c2d7a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('next_occurrence_date', sa.Date(), nullable=True))
+    op.add_column(
+        'transactions',
+        sa.Column('recurring_parent_id', postgresql.UUID(as_uuid=True), nullable=True)
+    )
+    op.create_foreign_key(
+        'transactions_recurring_parent_id_fkey',
+        'transactions', 'transactions',
+        ['recurring_parent_id'], ['id'],
+        ondelete='SET NULL'
+    )
+    # Occurrence key: re-running the materialization cannot duplicate
+    op.create_index(
+        'uq_transactions_recurring_occurrence',
+        'transactions',
+        ['recurring_parent_id', 'date'],
+        unique=True
+    )
+    op.create_index(
+        'ix_transactions_recurring_due',
+        'transactions',
+        ['next_occurrence_date', 'id'],
+        unique=False,
+        postgresql_where=sa.text('next_occurrence_date IS NOT NULL')
+    )
+
+    # Existing recurring rows were never materialized: schedule them like a
+    # new template (app.crud.transaction._schedule_start), from their first
+    # occurrence after max(date, yesterday), rather than backfilling history.
+    # Months/years are added to the original date (clamped to month end).
+    op.execute("""
+        WITH base AS (
+            SELECT id, date, recurring_frequency AS frequency,
+                   GREATEST(date, CURRENT_DATE - 1) AS reference
+            FROM transactions
+            WHERE is_recurring
+              AND recurring_frequency IN ('daily', 'weekly', 'monthly', 'yearly')
+        ),
+        schedule AS (
+            SELECT id, date, frequency, reference,
+                   (EXTRACT(YEAR FROM reference) - EXTRACT(YEAR FROM date))::int AS years,
+                   ((EXTRACT(YEAR FROM reference) - EXTRACT(YEAR FROM date)) * 12
+                    + EXTRACT(MONTH FROM reference) - EXTRACT(MONTH FROM date))::int AS months
+            FROM base
+        ),
+        candidate AS (
+            SELECT id, date, frequency, reference, years, months,
+                   CASE frequency
+                       WHEN 'monthly' THEN (date + make_interval(months => months))::date
+                       WHEN 'yearly' THEN (date + make_interval(years => years))::date
+                   END AS scheduled
+            FROM schedule
+        )
+        UPDATE transactions AS t
+        SET next_occurrence_date = CASE c.frequency
+            WHEN 'daily' THEN c.reference + 1
+            WHEN 'weekly' THEN c.date + 7 * ((c.reference - c.date) / 7 + 1)
+            WHEN 'monthly' THEN CASE WHEN c.scheduled > c.reference THEN c.scheduled
+                ELSE (c.date + make_interval(months => c.months + 1))::date END
+            WHEN 'yearly' THEN CASE WHEN c.scheduled > c.reference THEN c.scheduled
+                ELSE (c.date + make_interval(years => c.years + 1))::date END
+        END
+        FROM candidate AS c
+        WHERE t.id = c.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_recurring_due', table_name='transactions')
+    op.drop_index('uq_transactions_recurring_occurrence', table_name='transactions')
+    op.drop_constraint('transactions_recurring_parent_id_fkey', 'transactions', type_='foreignkey')
+    op.drop_column('transactions', 'recurring_parent_id')
+    op.drop_column('transactions', 'next_occurrence_date')
@@ -0,0 +1,32 @@
+"""Add GIN index on transactions tags
+
+Revision ID: ebd2b70e2746
+Revises: c3041a80ce20
+Create Date: 2026-10-18 12:21:35.635585
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ebd2b70e2746'
+down_revision: Union[str, None] = 'c3041a80ce20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves both tag filters: overlap (&&, any tag) and contains (@>, all tags)
+    op.create_index(
+        'ix_transactions_tags',
+        'transactions',
+        ['tags'],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_tags', table_name='transactions', postgresql_using='gin')
@@ -24,12 +24,31 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10  # Persistent connections in the pool
+    DB_MAX_OVERFLOW: int = 20  # Extra connections under load
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    
+    # Concurrency
+    # Requests using the DB are admitted up to pool size + overflow (see
+    # app.database.db_slots): a request keeps its connection across several
+    # threadpool calls, so connections scale with requests in flight, not
+    # with busy threads. Sync endpoints and dependencies run in the AnyIO
+    # worker thread pool; by default it has one thread per admitted request.
+    THREADPOOL_WORKERS: Optional[int] = None
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Password hashing
+    # bcrypt cost factor; hashes with a different cost are rehashed at login
+    PASSWORD_HASH_ROUNDS: int = 12
+    # Concurrent hashes per worker process (each one keeps a CPU core busy)
+    PASSWORD_HASH_WORKERS: int = 2
+    # Hashes allowed to wait for a free slot before requests get 503
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    
     # CORS
     cors_origins: list[str] = Field(  
         default=[
@@ -49,6 +68,21 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 50
     MAX_PAGE_SIZE: int = 100
     
+    # Response compression (brotli needs the optional `brotli` package)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Smaller bodies are sent as they are
+    GZIP_COMPRESSION_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+    
+    # Response cache (analytics and summary endpoints)
+    # Entries are keyed on the user's data_version, so writes invalidate
+    # them immediately; the TTL only bounds how long unused entries live.
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "memory"  # "memory" (per worker) or "redis" (shared)
+    CACHE_REDIS_URL: Optional[str] = None  # e.g. redis://localhost:6379/0
+    CACHE_TTL_SECONDS: int = 600
+    CACHE_MAX_ENTRIES: int = 10000  # memory backend only
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # memory backend only
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -57,5 +91,18 @@ class Settings(BaseSettings):
     )
 
 
+    @property
+    def db_session_slots(self) -> int:
+        """Requests holding a DB session at once (pool size + overflow)."""
+        return self.DB_POOL_SIZE + self.DB_MAX_OVERFLOW
+
+    @property
+    def threadpool_workers(self) -> int:
+        """Worker threads for sync endpoints (default: one per DB session slot)."""
+        if self.THREADPOOL_WORKERS:
+            return self.THREADPOOL_WORKERS
+        return self.db_session_slots
+
+
 # Create a global settings instance
 settings = Settings()
\ No newline at end of file
@@ -5,11 +5,14 @@ CRUD operations package.
 from app.crud.user import (
     get_user_by_email,
     get_user_by_id,
+    get_user_principal,
     create_user,
     authenticate_user,
     update_user,
+    update_password_hash,
     delete_user,
     deactivate_user,
+    bump_data_version,
 )
 
 from app.crud.account import (
@@ -21,6 +24,7 @@ from app.crud.account import (
     delete_account,
     deactivate_account,
     update_account_balance,
+    apply_balance_deltas,
     get_total_balance,
     get_accounts_summary,
 )
@@ -30,6 +34,9 @@ from app.crud.category import (
     get_categories_tree,
     get_category,
     get_category_by_id,
+    get_category_with_subcategories,
+    category_has_transactions,
+    get_first_category_with_transactions,
     create_category,
     update_category,
     delete_category,
@@ -40,6 +47,7 @@ from app.crud.category import (
 
 from app.crud.transaction import (
     get_transactions,
+    get_transactions_page,
     get_transaction,
     get_transaction_by_id,
     create_transaction,
@@ -48,6 +56,7 @@ from app.crud.transaction import (
     get_transaction_summary,
     get_transactions_by_category,
     get_monthly_totals,
+    materialize_recurring_transactions,
 )
 
 from app.crud.transfer import (
@@ -84,16 +93,20 @@ from app.crud import vacation_entry
 from app.crud import italian_holiday
 from app.crud import user_holiday
 from app.crud import budget
+from app.crud import monthly_total
 
 __all__ = [
     # User CRUD
     "get_user_by_email",
     "get_user_by_id",
+    "get_user_principal",
     "create_user",
     "authenticate_user",
     "update_user",
+    "update_password_hash",
     "delete_user",
     "deactivate_user",
+    "bump_data_version",
     # Account CRUD
     "get_accounts",
     "get_account",
@@ -103,6 +116,7 @@ __all__ = [
     "delete_account",
     "deactivate_account",
     "update_account_balance",
+    "apply_balance_deltas",
     "get_total_balance",
     "get_accounts_summary",
     # Category CRUD
@@ -110,6 +124,9 @@ __all__ = [
     "get_categories_tree",
     "get_category",
     "get_category_by_id",
+    "get_category_with_subcategories",
+    "category_has_transactions",
+    "get_first_category_with_transactions",
     "create_category",
     "update_category",
     "delete_category",
@@ -118,6 +135,7 @@ __all__ = [
     "get_category_statistics",
     # Transaction CRUD
     "get_transactions",
+    "get_transactions_page",
     "get_transaction",
     "get_transaction_by_id",
     "create_transaction",
@@ -126,6 +144,7 @@ __all__ = [
     "get_transaction_summary",
     "get_transactions_by_category",
     "get_monthly_totals",
+    "materialize_recurring_transactions",
     # Transfer CRUD
     "get_transfers",
     "get_transfer",
@@ -156,4 +175,6 @@ __all__ = [
     "user_holiday",
     # Budget CRUD module
     "budget",
+    # Monthly aggregate maintenance
+    "monthly_total",
 ]
\ No newline at end of file
@@ -6,13 +6,33 @@ Balance Strategy:
 - initial_balance: Set at creation, NEVER modified
 - current_balance: Updated by transactions and transfers
 """
-from sqlalchemy.orm import Session
-from typing import List, Optional, Union
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy import Numeric, case, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from typing import Dict, List, Optional, Union
 from decimal import Decimal
+from datetime import date, timedelta
 from uuid import UUID
 
 from app.models.account import Account
+from app.models.transaction import Transaction
+from app.models.transfer import Transfer
 from app.schemas.account import AccountCreate, AccountUpdate
+from app.crud.user import bump_data_version
+
+# Loader profiles
+# Every read chooses explicitly which Account relationships come with the rows:
+# - header: balances and metadata only, O(accounts)
+# - recent: header + transactions/transfers of the last N days
+# - ledger: header + full transaction/transfer history (reconciliation only)
+ACCOUNT_PROFILE_HEADER = "header"
+ACCOUNT_PROFILE_RECENT = "recent"
+ACCOUNT_PROFILE_LEDGER = "ledger"
+ACCOUNT_LOAD_PROFILES = [ACCOUNT_PROFILE_HEADER, ACCOUNT_PROFILE_RECENT, ACCOUNT_PROFILE_LEDGER]
+
+# Default window for the "recent" profile
+RECENT_ACTIVITY_DAYS = 30
+
 
 def _to_uuid(value: Union[str, UUID]) -> UUID:
     """Convert string to UUID if necessary."""
@@ -20,13 +40,46 @@ def _to_uuid(value: Union[str, UUID]) -> UUID:
         return UUID(value)
     return value
 
+
+def _loader_options(profile: str, recent_days: int = RECENT_ACTIVITY_DAYS) -> list:
+    """
+    Return the SQLAlchemy loader options for a loading profile.
+    
+    The header profile uses raiseload so that an accidental access to
+    a history collection fails loudly instead of silently loading it.
+    """
+    if profile == ACCOUNT_PROFILE_HEADER:
+        return [
+            raiseload(Account.transactions),
+            raiseload(Account.transfers_from),
+            raiseload(Account.transfers_to),
+        ]
+    
+    if profile == ACCOUNT_PROFILE_RECENT:
+        since = date.today() - timedelta(days=recent_days)
+        return [
+            selectinload(Account.transactions.and_(Transaction.date >= since)),
+            selectinload(Account.transfers_from.and_(Transfer.date >= since)),
+            selectinload(Account.transfers_to.and_(Transfer.date >= since)),
+        ]
+    
+    if profile == ACCOUNT_PROFILE_LEDGER:
+        return [
+            selectinload(Account.transactions),
+            selectinload(Account.transfers_from),
+            selectinload(Account.transfers_to),
+        ]
+    
+    raise ValueError(f"Invalid profile: {profile}. Must be one of: {', '.join(ACCOUNT_LOAD_PROFILES)}")
+
 def get_accounts(
     db: Session, 
     user_id: Union[str, UUID], 
     skip: int = 0, 
     limit: int = 100,
     is_active: Optional[bool] = None,
-    account_type: Optional[str] = None
+    account_type: Optional[str] = None,
+    profile: str = ACCOUNT_PROFILE_HEADER
 ) -> List[Account]:
     """
     List all accounts for a user.
@@ -38,12 +91,13 @@ def get_accounts(
         limit: Maximum results
         is_active: Filter by active/inactive status
         account_type: Filter by account type
+        profile: Loader profile (header, recent, ledger)
     
     Returns:
         List of Account objects
     """
     user_id = _to_uuid(user_id)
-    query = db.query(Account).filter(Account.user_id == user_id)
+    query = db.query(Account).options(*_loader_options(profile)).filter(Account.user_id == user_id)
     
     if is_active is not None:
         query = query.filter(Account.is_active == is_active)
@@ -57,7 +111,9 @@ def get_accounts(
 def get_account(
     db: Session, 
     account_id: Union[str, UUID], 
-    user_id: Union[str, UUID]
+    user_id: Union[str, UUID],
+    profile: str = ACCOUNT_PROFILE_HEADER,
+    recent_days: int = RECENT_ACTIVITY_DAYS
 ) -> Optional[Account]:
     """
     Get single account verifying ownership.
@@ -66,13 +122,15 @@ def get_account(
         db: Database session
         account_id: Account ID to retrieve
         user_id: User ID (for ownership verification)
+        profile: Loader profile (header, recent, ledger)
+        recent_days: Window in days for the recent profile
     
     Returns:
         Account object if found and belongs to user, None otherwise
     """
     account_id = _to_uuid(account_id)
     user_id = _to_uuid(user_id)
-    return db.query(Account).filter(
+    return db.query(Account).options(*_loader_options(profile, recent_days)).filter(
         Account.id == account_id,
         Account.user_id == user_id
     ).first()
@@ -121,6 +179,7 @@ def create_account(
     )
     
     db.add(db_account)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_account)
     
@@ -160,6 +219,7 @@ def update_account(
     for field, value in update_data.items():
         setattr(db_account, field, value)
     
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_account)
     
@@ -188,6 +248,7 @@ def delete_account(
         return False
     
     db.delete(db_account)
+    bump_data_version(db, user_id)
     db.commit()
     
     return True
@@ -215,12 +276,86 @@ def deactivate_account(
         return None
     
     db_account.is_active = False
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_account)
     
     return db_account
 
 
+def add_balance_delta(
+    deltas: Dict[UUID, Decimal],
+    account_id: Optional[Union[str, UUID]],
+    amount: Decimal
+) -> None:
+    """Accumulate a current_balance change for an account into `deltas`."""
+    if account_id is None:
+        return
+    account_id = _to_uuid(account_id)
+    deltas[account_id] = deltas.get(account_id, Decimal("0.00")) + amount
+
+
+# From this many accounts, one ordered lock query plus one UPDATE is cheaper
+# than an UPDATE per account
+_BULK_BALANCE_MIN_ACCOUNTS = 8
+
+
+def apply_balance_deltas(db: Session, deltas: Dict[UUID, Decimal]) -> None:
+    """
+    Apply current_balance changes as in-database increments.
+    
+    Each account gets a single `current_balance = current_balance + :delta`
+    UPDATE, so concurrent writers never overwrite each other's changes (no
+    read-modify-write in Python). Accounts are updated in id order: two
+    transactions touching the same pair of accounts take the row locks in
+    the same order and cannot deadlock. Zero deltas are skipped. Many
+    accounts are locked in id order first and updated by one statement.
+    
+    Account objects already loaded in the session have their
+    current_balance expired and reload the committed value on next access.
+    
+    Note:
+        This function does NOT commit - caller must manage the transaction.
+    """
+    changed = sorted(account_id for account_id, delta in deltas.items() if delta)
+    
+    if len(changed) >= _BULK_BALANCE_MIN_ACCOUNTS:
+        # Bulk writers (recurring materialization) touch many accounts: lock
+        # them in id order, then apply every delta in a single UPDATE. NO KEY
+        # UPDATE is the lock UPDATE itself takes; plain FOR UPDATE would also
+        # wait on the key-share locks of concurrent inserts referencing them.
+        db.execute(
+            select(Account.id)
+            .where(Account.id.in_(changed))
+            .order_by(Account.id)
+            .with_for_update(key_share=True)
+        )
+        changes = values(
+            column("id", PGUUID(as_uuid=True)),
+            column("delta", Numeric(15, 2)),
+            name="balance_deltas"
+        ).data([(account_id, deltas[account_id]) for account_id in changed])
+        db.execute(
+            update(Account)
+            .where(Account.id == changes.c.id)
+            .values(current_balance=Account.current_balance + changes.c.delta)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        for account_id in changed:
+            db.execute(
+                update(Account)
+                .where(Account.id == account_id)
+                .values(current_balance=Account.current_balance + deltas[account_id])
+                .execution_options(synchronize_session=False)
+            )
+    
+    for account_id in changed:
+        account = db.identity_map.get(db.identity_key(Account, account_id))
+        if account is not None:
+            db.expire(account, ["current_balance"])
+
+
 def update_account_balance(
     db: Session,
     account_id: Union[str, UUID],
@@ -250,12 +385,14 @@ def update_account_balance(
         return None
     
     if operation == 'add':
-        account.current_balance += amount
+        delta = amount
     elif operation == 'subtract':
-        account.current_balance -= amount
+        delta = -amount
     else:
         raise ValueError(f"Invalid operation: {operation}. Must be 'add' or 'subtract'")
     
+    apply_balance_deltas(db, {account_id: delta})
+    
     return account
 
 
@@ -271,13 +408,13 @@ def get_total_balance(db: Session, user_id: Union[str, UUID], is_active: Optiona
     Returns:
         Sum of current_balance of all matching accounts
     """
-    accounts = get_accounts(db, user_id, is_active=is_active, limit=1000)
+    user_id = _to_uuid(user_id)
+    query = db.query(func.coalesce(func.sum(Account.current_balance), 0)).filter(Account.user_id == user_id)
     
-    total = Decimal("0.00")
-    for account in accounts:
-        total += account.current_balance
+    if is_active is not None:
+        query = query.filter(Account.is_active == is_active)
     
-    return total
+    return Decimal(query.scalar())
 
 
 def get_accounts_summary(db: Session, user_id: Union[str, UUID]) -> dict:
@@ -294,7 +431,7 @@ def get_accounts_summary(db: Session, user_id: Union[str, UUID]) -> dict:
     Returns:
         Dict with totals by category and net worth calculations
     """
-    accounts = get_accounts(db, user_id, is_active=True, limit=500)
+    accounts = get_accounts(db, user_id, is_active=True, limit=500, profile=ACCOUNT_PROFILE_HEADER)
     
     # Account type categories
     liquid_types = ['checking', 'savings', 'cash']
@@ -398,6 +535,178 @@ def get_accounts_summary(db: Session, user_id: Union[str, UUID]) -> dict:
     }
 
 
+# Differences below this are rounding (converted transfers), not drift
+BALANCE_TOLERANCE = Decimal("0.01")
+
+
+def expected_balances_query(
+    user_id: Optional[Union[str, UUID]] = None,
+    account_id: Optional[Union[str, UUID]] = None
+):
+    """
+    SELECT of every account's balance recomputed from its ledger.
+
+    expected_balance = initial_balance + income - expenses
+                       + transfers in (converted) - transfers out (with fee)
+
+    Each ledger table is aggregated once per account in a grouped subquery
+    and joined to `accounts`, so the cost is one scan per table whatever
+    the number of accounts and no ORM object is loaded.
+
+    Args:
+        user_id: Only this user's accounts (default: all accounts)
+        account_id: Only this account
+
+    Returns:
+        Select with account_id, user_id, account_name, current_balance and
+        expected_balance columns
+    """
+    user_id = _to_uuid(user_id) if user_id is not None else None
+    account_id = _to_uuid(account_id) if account_id is not None else None
+
+    def scoped(query, user_column):
+        return query.where(user_column == user_id) if user_id is not None else query
+
+    tx_net = scoped(
+        select(
+            Transaction.account_id.label("account_id"),
+            func.sum(
+                case((Transaction.type == "income", Transaction.amount), else_=-Transaction.amount)
+            ).label("net")
+        ),
+        Transaction.user_id
+    ).group_by(Transaction.account_id).subquery("tx_net")
+
+    transfers_in = scoped(
+        select(
+            Transfer.to_account_id.label("account_id"),
+            func.sum(Transfer.amount * func.coalesce(Transfer.exchange_rate, 1)).label("total")
+        ),
+        Transfer.user_id
+    ).group_by(Transfer.to_account_id).subquery("transfers_in")
+
+    transfers_out = scoped(
+        select(
+            Transfer.from_account_id.label("account_id"),
+            func.sum(Transfer.amount + Transfer.fee).label("total")
+        ),
+        Transfer.user_id
+    ).group_by(Transfer.from_account_id).subquery("transfers_out")
+
+    expected = (
+        Account.initial_balance
+        + func.coalesce(tx_net.c.net, 0)
+        + func.coalesce(transfers_in.c.total, 0)
+        - func.coalesce(transfers_out.c.total, 0)
+    )
+
+    query = scoped(
+        select(
+            Account.id.label("account_id"),
+            Account.user_id.label("user_id"),
+            Account.name.label("account_name"),
+            Account.current_balance.label("current_balance"),
+            expected.label("expected_balance")
+        )
+        .outerjoin(tx_net, tx_net.c.account_id == Account.id)
+        .outerjoin(transfers_in, transfers_in.c.account_id == Account.id)
+        .outerjoin(transfers_out, transfers_out.c.account_id == Account.id),
+        Account.user_id
+    )
+    if account_id is not None:
+        query = query.where(Account.id == account_id)
+
+    return query
+
+
+def find_balance_discrepancies(
+    db: Session,
+    user_id: Optional[Union[str, UUID]] = None,
+    limit: Optional[int] = None
+) -> List[dict]:
+    """
+    Accounts whose current_balance differs from the ledger, in one query.
+
+    Args:
+        db: Database session
+        user_id: Only this user's accounts (default: all accounts)
+        limit: Maximum number of discrepancies returned
+
+    Returns:
+        List of dicts with account_id, user_id, account_name,
+        current_balance, calculated_balance and difference (Decimal)
+    """
+    expected = expected_balances_query(user_id).subquery("expected")
+    difference = expected.c.current_balance - expected.c.expected_balance
+
+    query = (
+        select(expected, difference.label("difference"))
+        .where(func.abs(difference) >= BALANCE_TOLERANCE)
+        .order_by(expected.c.user_id, expected.c.account_name)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+
+    return [
+        {
+            "account_id": row.account_id,
+            "user_id": row.user_id,
+            "account_name": row.account_name,
+            "current_balance": row.current_balance,
+            "calculated_balance": row.expected_balance,
+            "difference": row.difference
+        }
+        for row in db.execute(query)
+    ]
+
+
+def fix_balances(
+    db: Session,
+    user_id: Optional[Union[str, UUID]] = None,
+    account_id: Optional[Union[str, UUID]] = None,
+    force: bool = False
+) -> List[UUID]:
+    """
+    Set current_balance to the ledger balance with one UPDATE ... FROM.
+
+    Only accounts out of tolerance are written (every selected account
+    with force=True). An account whose balance changes while the statement
+    runs is skipped rather than overwritten with a stale value: the
+    update is guarded on the balance it was compared with, and Postgres
+    re-checks that guard after waiting on the row lock. The owners' data
+    version is bumped. Does not commit.
+
+    Args:
+        db: Database session
+        user_id: Only this user's accounts (default: all accounts)
+        account_id: Only this account
+        force: Rewrite balances within tolerance as well
+
+    Returns:
+        IDs of the updated accounts
+    """
+    expected = expected_balances_query(user_id, account_id).subquery("expected")
+
+    stmt = (
+        update(Account)
+        .where(
+            Account.id == expected.c.account_id,
+            Account.current_balance == expected.c.current_balance
+        )
+        .values(current_balance=expected.c.expected_balance)
+        .returning(Account.id, Account.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    if not force:
+        stmt = stmt.where(
+            func.abs(Account.current_balance - expected.c.expected_balance) >= BALANCE_TOLERANCE
+        )
+
+    rows = db.execute(stmt).all()
+    bump_data_version(db, *(row.user_id for row in rows))
+    return [row.id for row in rows]
+
+
 def verify_all_balances(db: Session, user_id: Union[str, UUID]) -> List[dict]:
     """
     Verify balance integrity for all user accounts.
@@ -405,21 +714,16 @@ def verify_all_balances(db: Session, user_id: Union[str, UUID]) -> List[dict]:
     Returns:
         List of accounts with balance discrepancies
     """
-    accounts = get_accounts(db, user_id, limit=1000)
-    discrepancies = []
-    
-    for account in accounts:
-        is_valid, difference = account.verify_balance_integrity()
-        if not is_valid:
-            discrepancies.append({
-                "account_id": account.id,
-                "account_name": account.name,
-                "current_balance": float(account.current_balance),
-                "calculated_balance": float(account.recalculate_balance()),
-                "difference": float(difference)
-            })
-    
-    return discrepancies
+    return [
+        {
+            "account_id": item["account_id"],
+            "account_name": item["account_name"],
+            "current_balance": float(item["current_balance"]),
+            "calculated_balance": float(item["calculated_balance"]),
+            "difference": float(item["difference"])
+        }
+        for item in find_balance_discrepancies(db, user_id)
+    ]
 
 
 def fix_account_balance(db: Session, account_id: Union[str, UUID], user_id: Union[str, UUID]) -> Optional[Account]:
@@ -441,9 +745,8 @@ def fix_account_balance(db: Session, account_id: Union[str, UUID], user_id: Unio
     if not account:
         return None
     
-    # Recalculate from transactions and transfers
-    correct_balance = account.recalculate_balance()
-    account.current_balance = correct_balance
+    # Recalculate from transactions and transfers in SQL
+    fix_balances(db, user_id=user_id, account_id=account.id, force=True)
     
     db.commit()
     db.refresh(account)
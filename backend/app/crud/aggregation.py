@@ -0,0 +1,361 @@
+"""
+Aggregation CRUD Operations
+Shared SQL-side aggregation of transactions for analytics and reports.
+
+Totals are computed by Postgres with SUM/COUNT ... GROUP BY and only the
+aggregated rows are returned; no Transaction object is hydrated.
+
+Month-granular totals can also be read from the pre-aggregated
+transaction_monthly_totals table (see app.crud.monthly_total), which costs
+O(months) instead of O(transactions): monthly_totals_query() reads whole
+months only, period_totals_query() combines whole months from the table
+with the partial months at the edges of a date range.
+"""
+from sqlalchemy import BigInteger, Date, and_, cast, func, or_, union_all
+from sqlalchemy.orm import Query, Session
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+from uuid import UUID
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.models.transaction import Transaction
+from app.models.monthly_total import MonthlyTotal
+
+# Transaction types that count as expenses
+EXPENSE_TYPES = ("expense_necessity", "expense_extra")
+
+# Available grouping dimensions -> SQL expression
+GROUP_BY_COLUMNS = {
+    "type": Transaction.type,
+    "account": Transaction.account_id,
+    "category": Transaction.category_id,
+    "year": func.extract("year", Transaction.date),
+    "month": cast(func.date_trunc("month", Transaction.date), Date),
+    "day": Transaction.date,
+}
+
+# Same dimensions on the monthly aggregate table (no 'day')
+MONTHLY_GROUP_BY_COLUMNS = {
+    "type": MonthlyTotal.type,
+    "account": MonthlyTotal.account_id,
+    "category": MonthlyTotal.category_id,
+    "year": func.extract("year", MonthlyTotal.month),
+    "month": MonthlyTotal.month,
+}
+
+
+def _to_uuid(value: Union[str, UUID, None]) -> Optional[UUID]:
+    """Convert string to UUID if necessary."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return UUID(value)
+    return value
+
+
+def transaction_totals_query(
+    db: Session,
+    user_id: Union[str, UUID],
+    group_by: Sequence[str] = ("type",),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[Union[str, UUID]] = None,
+    transaction_type: Optional[str] = None,
+    years: Optional[Iterable[int]] = None
+) -> Query:
+    """
+    Build the grouped SUM/COUNT query behind transaction_totals().
+
+    Returned unexecuted so callers can use it as a subquery and join
+    metadata onto the aggregated rows. Columns are labelled with the
+    dimension names plus 'total' and 'count'.
+
+    `years` keeps only those calendar years, as one date range per year so
+    the (user_id, date) index still applies and the years in between are
+    never read.
+
+    Raises:
+        ValueError: If an unknown dimension is requested
+    """
+    unknown = [key for key in group_by if key not in GROUP_BY_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown group_by dimension(s): {', '.join(unknown)}")
+
+    user_id = _to_uuid(user_id)
+    dimensions = [GROUP_BY_COLUMNS[key].label(key) for key in group_by]
+
+    query = db.query(
+        *dimensions,
+        func.coalesce(func.sum(Transaction.amount), 0).label("total"),
+        func.count(Transaction.id).label("count")
+    ).filter(Transaction.user_id == user_id)
+
+    if start_date:
+        query = query.filter(Transaction.date >= start_date)
+    if end_date:
+        query = query.filter(Transaction.date <= end_date)
+    if account_id:
+        query = query.filter(Transaction.account_id == _to_uuid(account_id))
+    if transaction_type:
+        query = query.filter(Transaction.type == transaction_type)
+    if years is not None:
+        query = query.filter(or_(*(
+            and_(Transaction.date >= date(year, 1, 1), Transaction.date <= date(year, 12, 31))
+            for year in sorted(set(years))
+        )))
+
+    if dimensions:
+        query = query.group_by(*dimensions)
+
+    return query
+
+
+def transaction_totals(
+    db: Session,
+    user_id: Union[str, UUID],
+    group_by: Sequence[str] = ("type",),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[Union[str, UUID]] = None,
+    transaction_type: Optional[str] = None,
+    years: Optional[Iterable[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Sum and count the user's transactions grouped by the given dimensions.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        group_by: Dimensions among 'type', 'account', 'category', 'year',
+            'month' (first day of month) and 'day'
+        start_date: Period start (inclusive)
+        end_date: Period end (inclusive)
+        account_id: Filter by specific account
+        transaction_type: Filter by type
+        years: Keep only these calendar years
+
+    Returns:
+        One dict per group with the dimension keys plus 'total' (Decimal)
+        and 'count'
+
+    Raises:
+        ValueError: If an unknown dimension is requested
+    """
+    query = transaction_totals_query(
+        db, user_id,
+        group_by=group_by,
+        start_date=start_date,
+        end_date=end_date,
+        account_id=account_id,
+        transaction_type=transaction_type,
+        years=years
+    )
+
+    return _rows_as_dicts(query)
+
+
+def _rows_as_dicts(query: Query) -> List[Dict[str, Any]]:
+    """Execute a totals query and return its rows as dicts."""
+    rows = []
+    for row in query.all():
+        data = row._asdict()
+        if "year" in data:
+            data["year"] = int(data["year"])
+        rows.append(data)
+    return rows
+
+
+def monthly_totals_query(
+    db: Session,
+    user_id: Union[str, UUID],
+    group_by: Sequence[str] = ("type",),
+    start_month: Optional[date] = None,
+    end_month: Optional[date] = None,
+    account_id: Optional[Union[str, UUID]] = None,
+    transaction_type: Optional[str] = None
+) -> Query:
+    """
+    Same as transaction_totals_query(), read from the monthly aggregate table.
+
+    Args:
+        start_month: First month included (first day of the month)
+        end_month: Last month included (first day of the month)
+
+    Raises:
+        ValueError: If an unknown dimension is requested
+    """
+    unknown = [key for key in group_by if key not in MONTHLY_GROUP_BY_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown monthly group_by dimension(s): {', '.join(unknown)}")
+
+    user_id = _to_uuid(user_id)
+    dimensions = [MONTHLY_GROUP_BY_COLUMNS[key].label(key) for key in group_by]
+
+    query = db.query(
+        *dimensions,
+        func.coalesce(func.sum(MonthlyTotal.total), 0).label("total"),
+        cast(func.coalesce(func.sum(MonthlyTotal.count), 0), BigInteger).label("count")
+    ).filter(MonthlyTotal.user_id == user_id)
+
+    if start_month:
+        query = query.filter(MonthlyTotal.month >= start_month)
+    if end_month:
+        query = query.filter(MonthlyTotal.month <= end_month)
+    if account_id:
+        query = query.filter(MonthlyTotal.account_id == _to_uuid(account_id))
+    if transaction_type:
+        query = query.filter(MonthlyTotal.type == transaction_type)
+
+    if dimensions:
+        query = query.group_by(*dimensions)
+
+    return query
+
+
+def _first_of_next_month(value: date) -> date:
+    """First day of the month after the given date."""
+    return (date(value.year, value.month, 1) + timedelta(days=32)).replace(day=1)
+
+
+def period_totals_query(
+    db: Session,
+    user_id: Union[str, UUID],
+    group_by: Sequence[str] = ("type",),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[Union[str, UUID]] = None,
+    transaction_type: Optional[str] = None
+) -> Query:
+    """
+    Same result as transaction_totals_query(), mostly from the monthly table.
+
+    Months entirely inside [start_date, end_date] are read from the
+    aggregate table; only the days of the partial first and last month are
+    aggregated from `transactions`. Dimensions are those of
+    MONTHLY_GROUP_BY_COLUMNS.
+
+    Raises:
+        ValueError: If an unknown dimension is requested
+    """
+    # Whole months: [full_start, full_end) - None means unbounded
+    full_start = start_date
+    if start_date and start_date.day != 1:
+        full_start = _first_of_next_month(start_date)
+    full_end = None
+    if end_date:
+        full_end = end_date + timedelta(days=1)
+        if full_end.day != 1:
+            full_end = full_end.replace(day=1)
+
+    filters = dict(account_id=account_id, transaction_type=transaction_type)
+
+    if full_start and full_end and full_start >= full_end:
+        return transaction_totals_query(
+            db, user_id, group_by=group_by,
+            start_date=start_date, end_date=end_date, **filters
+        )
+
+    last_full_month = (full_end - timedelta(days=1)).replace(day=1) if full_end else None
+    parts = [
+        monthly_totals_query(
+            db, user_id, group_by=group_by,
+            start_month=full_start, end_month=last_full_month, **filters
+        )
+    ]
+    if start_date and start_date < full_start:
+        parts.append(transaction_totals_query(
+            db, user_id, group_by=group_by,
+            start_date=start_date, end_date=full_start - timedelta(days=1), **filters
+        ))
+    if end_date and full_end <= end_date:
+        parts.append(transaction_totals_query(
+            db, user_id, group_by=group_by,
+            start_date=full_end, end_date=end_date, **filters
+        ))
+
+    if len(parts) == 1:
+        return parts[0]
+
+    combined = union_all(*(part.statement for part in parts)).subquery()
+    dimensions = [combined.c[key] for key in group_by]
+    query = db.query(
+        *dimensions,
+        func.sum(combined.c.total).label("total"),
+        cast(func.sum(combined.c.count), BigInteger).label("count")
+    )
+    if dimensions:
+        query = query.group_by(*dimensions)
+    return query
+
+
+def period_totals(
+    db: Session,
+    user_id: Union[str, UUID],
+    group_by: Sequence[str] = ("type",),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[Union[str, UUID]] = None,
+    transaction_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Same as transaction_totals(), computed by period_totals_query().
+
+    Raises:
+        ValueError: If an unknown dimension is requested
+    """
+    return _rows_as_dicts(period_totals_query(
+        db, user_id,
+        group_by=group_by,
+        start_date=start_date,
+        end_date=end_date,
+        account_id=account_id,
+        transaction_type=transaction_type
+    ))
+
+
+def empty_type_totals() -> Dict[str, Any]:
+    """Zeroed per-type totals bucket."""
+    return {
+        "income": Decimal("0.00"),
+        "expense_necessity": Decimal("0.00"),
+        "expense_extra": Decimal("0.00"),
+        "expenses": Decimal("0.00"),
+        "net": Decimal("0.00"),
+        "transaction_count": 0
+    }
+
+
+def add_type_total(bucket: Dict[str, Any], row: Dict[str, Any]) -> None:
+    """Accumulate an aggregated row (with 'type') into a per-type bucket."""
+    if row["type"] in bucket:
+        bucket[row["type"]] += row["total"]
+    if row["type"] in EXPENSE_TYPES:
+        bucket["expenses"] += row["total"]
+    bucket["net"] = bucket["income"] - bucket["expenses"]
+    bucket["transaction_count"] += row["count"]
+
+
+def pivot_by_type(
+    rows: Iterable[Dict[str, Any]],
+    key: str
+) -> Dict[Any, Dict[str, Any]]:
+    """
+    Pivot rows grouped by (key, type) into one per-type bucket per key value.
+    """
+    buckets: Dict[Any, Dict[str, Any]] = {}
+    for row in rows:
+        bucket = buckets.setdefault(row[key], empty_type_totals())
+        add_type_total(bucket, row)
+    return buckets
+
+
+def type_totals_as_float(bucket: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a per-type bucket to JSON-friendly floats."""
+    return {
+        "income": float(bucket["income"]),
+        "expense_necessity": float(bucket["expense_necessity"]),
+        "expense_extra": float(bucket["expense_extra"]),
+        "expenses": float(bucket["expenses"]),
+        "net": float(bucket["net"]),
+        "transaction_count": bucket["transaction_count"]
+    }
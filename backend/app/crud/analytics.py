@@ -4,7 +4,8 @@ Calculations and aggregations for statistics and reports.
 
 Uses current_balance for all balance-related calculations.
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import Date, case, cast, func, select, union_all
+from sqlalchemy.orm import Session, aliased
 from typing import Optional, Dict, List, Any, Union
 from uuid import UUID
 from datetime import date, timedelta
@@ -14,6 +15,16 @@ from app.models.transaction import Transaction
 from app.models.transfer import Transfer
 from app.models.account import Account
 from app.models.category import Category
+from app.crud.aggregation import (
+    EXPENSE_TYPES,
+    transaction_totals,
+    period_totals,
+    period_totals_query,
+    empty_type_totals,
+    add_type_total,
+    pivot_by_type,
+    type_totals_as_float,
+)
 
 def _to_uuid(value: Union[str, UUID, None]) -> Optional[UUID]:
     """Convert string to UUID if necessary."""
@@ -51,42 +62,32 @@ def calculate_summary(
     if not end_date:
         end_date = date.today()
     
-    # Query transactions in period
-    query = db.query(Transaction).filter(
-        Transaction.user_id == user_id,
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
-    )
-    
-    if account_id:
-        account_id = _to_uuid(account_id)
-        query = query.filter(Transaction.account_id == account_id)
-    
-    transactions = query.all()
-    
-    # Calculate totals by type
-    total_income = Decimal("0.00")
-    total_expense_necessity = Decimal("0.00")
-    total_expense_extra = Decimal("0.00")
-    
-    for t in transactions:
-        if t.type == "income":
-            total_income += t.amount
-        elif t.type == "expense_necessity":
-            total_expense_necessity += t.amount
-        elif t.type == "expense_extra":
-            total_expense_extra += t.amount
-    
-    total_expenses = total_expense_necessity + total_expense_extra
-    net = total_income - total_expenses
-    
-    # Calculate total current_balance of accounts
-    accounts = db.query(Account).filter(
+    # Totals by type in period (single grouped query)
+    totals = empty_type_totals()
+    for row in transaction_totals(
+        db, user_id,
+        group_by=("type",),
+        start_date=start_date,
+        end_date=end_date,
+        account_id=account_id
+    ):
+        add_type_total(totals, row)
+    
+    total_income = totals["income"]
+    total_expense_necessity = totals["expense_necessity"]
+    total_expense_extra = totals["expense_extra"]
+    total_expenses = totals["expenses"]
+    net = totals["net"]
+    
+    # Calculate total current_balance of active accounts
+    account_count, total_balance, total_initial = db.query(
+        func.count(Account.id),
+        func.coalesce(func.sum(Account.current_balance), 0),  # Use current_balance
+        func.coalesce(func.sum(Account.initial_balance), 0)
+    ).filter(
         Account.user_id == user_id,
         Account.is_active == True
-    ).all()
-    total_balance = sum(a.current_balance for a in accounts)  # Use current_balance
-    total_initial = sum(a.initial_balance for a in accounts)
+    ).one()
     
     # Metrics
     days_in_period = (end_date - start_date).days + 1
@@ -110,10 +111,10 @@ def calculate_summary(
             "total_balance": float(total_balance),  # Current balance
             "total_initial": float(total_initial),  # Initial balance for reference
             "balance_change": float(total_balance - total_initial),
-            "count": len(accounts)
+            "count": account_count
         },
         "metrics": {
-            "transaction_count": len(transactions),
+            "transaction_count": totals["transaction_count"],
             "avg_daily_expense": float(round(avg_daily_expense, 2)),
             "savings_rate": float(round(savings_rate, 2))
         }
@@ -143,59 +144,20 @@ def calculate_monthly_trend(
     start_date = date(today.year, today.month, 1) - timedelta(days=30 * (months - 1))
     start_date = date(start_date.year, start_date.month, 1)
     
-    # Query transactions
-    query = db.query(Transaction).filter(
-        Transaction.user_id == user_id,
-        Transaction.date >= start_date
+    # Group by month and type (whole months: read from the monthly table)
+    rows = period_totals(
+        db, user_id,
+        group_by=("month", "type"),
+        start_date=start_date,
+        account_id=account_id
     )
+    monthly_data = pivot_by_type(rows, "month")
     
-    if account_id:
-        account_id = _to_uuid(account_id)
-        query = query.filter(Transaction.account_id == account_id)
-    
-    transactions = query.all()
-    
-    # Group by month
-    monthly_data = {}
-    
-    for t in transactions:
-        month_key = t.date.strftime('%Y-%m')
-        
-        if month_key not in monthly_data:
-            monthly_data[month_key] = {
-                "month": month_key,
-                "income": Decimal("0.00"),
-                "expense_necessity": Decimal("0.00"),
-                "expense_extra": Decimal("0.00"),
-                "expenses": Decimal("0.00"),
-                "net": Decimal("0.00"),
-                "transaction_count": 0
-            }
-        
-        if t.type == "income":
-            monthly_data[month_key]["income"] += t.amount
-        elif t.type == "expense_necessity":
-            monthly_data[month_key]["expense_necessity"] += t.amount
-            monthly_data[month_key]["expenses"] += t.amount
-        elif t.type == "expense_extra":
-            monthly_data[month_key]["expense_extra"] += t.amount
-            monthly_data[month_key]["expenses"] += t.amount
-        
-        monthly_data[month_key]["transaction_count"] += 1
-    
-    # Calculate net and convert to list
     result = []
-    for month_key in sorted(monthly_data.keys()):
-        data = monthly_data[month_key]
-        data["net"] = data["income"] - data["expenses"]
+    for month_start in sorted(monthly_data.keys()):
         result.append({
-            "month": data["month"],
-            "income": float(data["income"]),
-            "expense_necessity": float(data["expense_necessity"]),
-            "expense_extra": float(data["expense_extra"]),
-            "expenses": float(data["expenses"]),
-            "net": float(data["net"]),
-            "transaction_count": data["transaction_count"]
+            "month": month_start.strftime('%Y-%m'),
+            **type_totals_as_float(monthly_data[month_start])
         })
     
     return {
@@ -208,12 +170,75 @@ def calculate_monthly_trend(
     }
 
 
+def _category_totals_rows(
+    db: Session,
+    user_id: UUID,
+    leaf_totals,
+    rollup: bool
+) -> List[Any]:
+    """
+    Category totals with metadata joined in a single query.
+
+    Leaf mode returns the categories that have transactions. Rollup mode
+    expands the user's category hierarchy with a recursive CTE of
+    (ancestor_id, descendant_id) pairs, so every category's total includes
+    the totals of all its descendants.
+    """
+    parent = aliased(Category)
+
+    if rollup:
+        child = aliased(Category)
+        tree = (
+            select(Category.id.label("ancestor_id"), Category.id.label("descendant_id"))
+            .where(Category.user_id == user_id)
+            .cte("category_tree", recursive=True)
+        )
+        tree = tree.union_all(
+            select(tree.c.ancestor_id, child.id)
+            .join(child, child.parent_id == tree.c.descendant_id)
+        )
+        totals = (
+            select(
+                tree.c.ancestor_id.label("category_id"),
+                func.sum(leaf_totals.c.total).label("total"),
+                func.sum(leaf_totals.c.count).label("count")
+            )
+            .join(leaf_totals, leaf_totals.c.category == tree.c.descendant_id)
+            .group_by(tree.c.ancestor_id)
+            .subquery()
+        )
+        own_total = func.coalesce(leaf_totals.c.total, 0)
+        query = (
+            db.query(
+                Category, parent.name.label("parent_name"),
+                totals.c.total, totals.c.count, own_total.label("own_total")
+            )
+            .join(totals, totals.c.category_id == Category.id)
+            .outerjoin(leaf_totals, leaf_totals.c.category == Category.id)
+        )
+    else:
+        query = (
+            db.query(
+                Category, parent.name.label("parent_name"),
+                leaf_totals.c.total, leaf_totals.c.count
+            )
+            .join(leaf_totals, leaf_totals.c.category == Category.id)
+        )
+
+    return (
+        query.outerjoin(parent, parent.id == Category.parent_id)
+        .filter(Category.user_id == user_id)
+        .all()
+    )
+
+
 def calculate_totals_by_category(
     db: Session,
     user_id: Union[str, UUID],
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    transaction_type: Optional[str] = None
+    transaction_type: Optional[str] = None,
+    rollup: bool = False
 ) -> Dict[str, Any]:
     """
     Calculate totals grouped by category.
@@ -224,6 +249,10 @@ def calculate_totals_by_category(
         start_date: Period start
         end_date: Period end
         transaction_type: Filter by type (income, expense_necessity, expense_extra)
+        rollup: If True, parent categories include the totals of their
+            subcategories and every category of the hierarchy with activity
+            is returned (with parent_id and own_total). Percentages and
+            grand total are computed on top-level categories only.
     
     Returns:
         Dict with totals by category and grand total
@@ -236,57 +265,44 @@ def calculate_totals_by_category(
     if not end_date:
         end_date = date.today()
     
-    # Query transactions
-    query = db.query(Transaction).filter(
-        Transaction.user_id == user_id,
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
-    )
-    
-    if transaction_type:
-        query = query.filter(Transaction.type == transaction_type)
-    
-    transactions = query.all()
-    
-    # Group by category
-    category_totals = {}
+    # Leaf totals: whole months from the monthly table, partial months at
+    # the edges of the period from transactions
+    leaf_totals = period_totals_query(
+        db, user_id,
+        group_by=("category",),
+        start_date=start_date,
+        end_date=end_date,
+        transaction_type=transaction_type
+    ).subquery()
     
-    for t in transactions:
-        cat_id = str(t.category_id)
-        if cat_id not in category_totals:
-            category_totals[cat_id] = {
-                "category_id": cat_id,
-                "total": Decimal("0.00"),
-                "count": 0
-            }
-        category_totals[cat_id]["total"] += t.amount
-        category_totals[cat_id]["count"] += 1
-    
-    # Enrich with category info
     result = []
-    for cat_id, data in category_totals.items():
-        category = db.query(Category).filter(
-            Category.id == cat_id,
-            Category.user_id == user_id
-        ).first()
-        
-        if category:
-            result.append({
-                "category_id": cat_id,
-                "category_name": category.name,
-                "category_full_name": category.full_name,
-                "category_type": category.type,
-                "category_color": category.color,
-                "category_icon": category.icon,
-                "total": float(data["total"]),
-                "transaction_count": data["count"],
-                "percentage": 0.0
-            })
+    grand_total = Decimal("0.00")
+    for row in _category_totals_rows(db, user_id, leaf_totals, rollup):
+        category = row.Category
+        # Top-level totals already include their subcategories in rollup mode
+        if not rollup or category.parent_id is None:
+            grand_total += row.total
+        item = {
+            "category_id": str(category.id),
+            "category_name": category.name,
+            "category_full_name": (
+                f"{row.parent_name} > {category.name}" if row.parent_name else category.name
+            ),
+            "category_type": category.type,
+            "category_color": category.color,
+            "category_icon": category.icon,
+            "total": float(row.total),
+            "transaction_count": int(row.count),
+            "percentage": 0.0
+        }
+        if rollup:
+            item["parent_id"] = str(category.parent_id) if category.parent_id else None
+            item["own_total"] = float(row.own_total)
+        result.append(item)
     
     # Calculate percentages
-    grand_total = sum(item["total"] for item in result)
     for item in result:
-        item["percentage"] = round((item["total"] / grand_total * 100), 2) if grand_total > 0 else 0.0
+        item["percentage"] = round((item["total"] / float(grand_total) * 100), 2) if grand_total > 0 else 0.0
     
     # Sort by total descending
     result.sort(key=lambda x: x["total"], reverse=True)
@@ -310,6 +326,11 @@ def calculate_totals_by_account(
     """
     Calculate totals grouped by account.
     
+    Transaction income/expenses and transfer inflows/outflows of the period
+    are aggregated per account in SQL and joined to the active accounts in
+    a single query. Outflows include the fee, inflows are converted with
+    the exchange rate, as in the balance updates.
+    
     Args:
         db: Database session
         user_id: User ID
@@ -327,38 +348,105 @@ def calculate_totals_by_account(
     if not end_date:
         end_date = date.today()
     
-    # Get all active accounts
-    accounts = db.query(Account).filter(
-        Account.user_id == user_id,
-        Account.is_active == True
-    ).all()
-    
-    result = []
-    
-    for account in accounts:
-        transactions = db.query(Transaction).filter(
+    # Per-account transaction totals (one grouped scan)
+    tx_totals = (
+        db.query(
+            Transaction.account_id.label("account_id"),
+            func.coalesce(
+                func.sum(case((Transaction.type == "income", Transaction.amount))), 0
+            ).label("income"),
+            func.coalesce(
+                func.sum(case((Transaction.type.in_(EXPENSE_TYPES), Transaction.amount))), 0
+            ).label("expenses"),
+            func.count(Transaction.id).label("count")
+        )
+        .filter(
             Transaction.user_id == user_id,
-            Transaction.account_id == account.id,
             Transaction.date >= start_date,
             Transaction.date <= end_date
-        ).all()
-        
-        income = sum(t.amount for t in transactions if t.type == "income")
-        expenses = sum(t.amount for t in transactions if t.type in ["expense_necessity", "expense_extra"])
-        
+        )
+        .group_by(Transaction.account_id)
+        .subquery()
+    )
+    
+    # Transfer outflows (amount + fee) and inflows (converted amount)
+    transfers_out = (
+        db.query(
+            Transfer.from_account_id.label("account_id"),
+            func.sum(Transfer.amount + Transfer.fee).label("total"),
+            func.count(Transfer.id).label("count")
+        )
+        .filter(
+            Transfer.user_id == user_id,
+            Transfer.date >= start_date,
+            Transfer.date <= end_date
+        )
+        .group_by(Transfer.from_account_id)
+        .subquery()
+    )
+    transfers_in = (
+        db.query(
+            Transfer.to_account_id.label("account_id"),
+            func.sum(Transfer.amount * func.coalesce(Transfer.exchange_rate, 1)).label("total"),
+            func.count(Transfer.id).label("count")
+        )
+        .filter(
+            Transfer.user_id == user_id,
+            Transfer.date >= start_date,
+            Transfer.date <= end_date
+        )
+        .group_by(Transfer.to_account_id)
+        .subquery()
+    )
+    
+    # Active accounts joined to all aggregates
+    rows = (
+        db.query(
+            Account.id,
+            Account.name,
+            Account.type,
+            Account.color,
+            Account.currency,
+            Account.initial_balance,
+            Account.current_balance,
+            func.coalesce(tx_totals.c.income, 0).label("income"),
+            func.coalesce(tx_totals.c.expenses, 0).label("expenses"),
+            func.coalesce(tx_totals.c.count, 0).label("transaction_count"),
+            func.coalesce(transfers_in.c.total, 0).label("transfers_in"),
+            func.coalesce(transfers_out.c.total, 0).label("transfers_out"),
+            (
+                func.coalesce(transfers_in.c.count, 0) + func.coalesce(transfers_out.c.count, 0)
+            ).label("transfer_count")
+        )
+        .outerjoin(tx_totals, tx_totals.c.account_id == Account.id)
+        .outerjoin(transfers_out, transfers_out.c.account_id == Account.id)
+        .outerjoin(transfers_in, transfers_in.c.account_id == Account.id)
+        .filter(
+            Account.user_id == user_id,
+            Account.is_active == True
+        )
+        .all()
+    )
+    
+    result = []
+    
+    for row in rows:
         result.append({
-            "account_id": str(account.id),
-            "account_name": account.name,
-            "account_type": account.type,
-            "account_color": account.color,
-            "currency": account.currency,
-            "initial_balance": float(account.initial_balance),
-            "current_balance": float(account.current_balance),  # Use current_balance
-            "balance_change": float(account.current_balance - account.initial_balance),
-            "period_income": float(income),
-            "period_expenses": float(expenses),
-            "period_net": float(income - expenses),
-            "transaction_count": len(transactions)
+            "account_id": str(row.id),
+            "account_name": row.name,
+            "account_type": row.type,
+            "account_color": row.color,
+            "currency": row.currency,
+            "initial_balance": float(row.initial_balance),
+            "current_balance": float(row.current_balance),  # Use current_balance
+            "balance_change": float(row.current_balance - row.initial_balance),
+            "period_income": float(row.income),
+            "period_expenses": float(row.expenses),
+            "period_net": float(row.income - row.expenses),
+            "period_transfers_in": float(row.transfers_in),
+            "period_transfers_out": float(row.transfers_out),
+            "transaction_count": row.transaction_count,
+            "transfer_count": row.transfer_count
         })
     
     result.sort(key=lambda x: x["current_balance"], reverse=True)
@@ -374,7 +462,9 @@ def calculate_totals_by_account(
             "total_current_balance": sum(a["current_balance"] for a in result),
             "total_balance_change": sum(a["balance_change"] for a in result),
             "total_income": sum(a["period_income"] for a in result),
-            "total_expenses": sum(a["period_expenses"] for a in result)
+            "total_expenses": sum(a["period_expenses"] for a in result),
+            "total_transfers_in": sum(a["period_transfers_in"] for a in result),
+            "total_transfers_out": sum(a["period_transfers_out"] for a in result)
         }
     }
 
@@ -405,64 +495,25 @@ def calculate_daily_breakdown(
     if not start_date:
         start_date = end_date - timedelta(days=30)
     
-    # Query transactions
-    query = db.query(Transaction).filter(
-        Transaction.user_id == user_id,
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
+    # Group by day and type
+    rows = transaction_totals(
+        db, user_id,
+        group_by=("day", "type"),
+        start_date=start_date,
+        end_date=end_date,
+        account_id=account_id
     )
+    daily_data = pivot_by_type(rows, "day")
     
-    if account_id:
-        account_id = _to_uuid(account_id)
-        query = query.filter(Transaction.account_id == account_id)
-    
-    transactions = query.all()
-    
-    # Initialize all days in range
-    daily_data = {}
+    # Every day in range, including days without transactions
+    result = []
     current = start_date
     while current <= end_date:
-        day_key = current.isoformat()
-        daily_data[day_key] = {
-            "date": day_key,
-            "income": Decimal("0.00"),
-            "expense_necessity": Decimal("0.00"),
-            "expense_extra": Decimal("0.00"),
-            "expenses": Decimal("0.00"),
-            "net": Decimal("0.00"),
-            "transaction_count": 0
-        }
-        current += timedelta(days=1)
-    
-    # Populate with transactions
-    for t in transactions:
-        day_key = t.date.isoformat()
-        if day_key in daily_data:
-            if t.type == "income":
-                daily_data[day_key]["income"] += t.amount
-            elif t.type == "expense_necessity":
-                daily_data[day_key]["expense_necessity"] += t.amount
-                daily_data[day_key]["expenses"] += t.amount
-            elif t.type == "expense_extra":
-                daily_data[day_key]["expense_extra"] += t.amount
-                daily_data[day_key]["expenses"] += t.amount
-            
-            daily_data[day_key]["transaction_count"] += 1
-    
-    # Convert to list
-    result = []
-    for day_key in sorted(daily_data.keys()):
-        data = daily_data[day_key]
-        data["net"] = data["income"] - data["expenses"]
         result.append({
-            "date": data["date"],
-            "income": float(data["income"]),
-            "expense_necessity": float(data["expense_necessity"]),
-            "expense_extra": float(data["expense_extra"]),
-            "expenses": float(data["expenses"]),
-            "net": float(data["net"]),
-            "transaction_count": data["transaction_count"]
+            "date": current.isoformat(),
+            **type_totals_as_float(daily_data.get(current, empty_type_totals()))
         })
+        current += timedelta(days=1)
     
     return {
         "period": {
@@ -474,6 +525,288 @@ def calculate_daily_breakdown(
     }
 
 
+# Balance history downsampling -> step between points
+BALANCE_GRANULARITIES = ("day", "week", "month")
+
+# Upper bound on the number of points of a balance history
+MAX_BALANCE_HISTORY_POINTS = 1000
+
+
+def _next_bucket(bucket: date, granularity: str) -> date:
+    """Start of the bucket following the given one."""
+    if granularity == "day":
+        return bucket + timedelta(days=1)
+    if granularity == "week":
+        return bucket + timedelta(days=7)
+    return (bucket + timedelta(days=32)).replace(day=1)
+
+
+def _truncate_date(value: date, granularity: str) -> date:
+    """Start of the bucket containing a date (weeks start on Monday)."""
+    if granularity == "week":
+        return value - timedelta(days=value.weekday())
+    if granularity == "month":
+        return value.replace(day=1)
+    return value
+
+
+def calculate_balance_history(
+    db: Session,
+    user_id: Union[str, UUID],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    granularity: str = "day",
+    account_id: Optional[Union[str, UUID]] = None,
+    include_inactive: bool = False
+) -> Dict[str, Any]:
+    """
+    Balance of each account and net worth over time.
+
+    Transactions (income +, expenses -) and transfers (outflows with fee,
+    inflows converted with the exchange rate) are netted per account and
+    bucket in SQL; a window running sum over the buckets, on top of
+    initial_balance, gives the balance at the end of each bucket. All
+    movements before the period collapse into one opening row, so the
+    ledger is never shipped to Python. Buckets without movements carry
+    the previous balance forward.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        start_date: Period start (default: one year before end_date)
+        end_date: Period end (default: today)
+        granularity: 'day', 'week' (Monday-based) or 'month'
+        account_id: Only this account
+        include_inactive: Include inactive accounts
+
+    Returns:
+        Dict with the accounts and one point per bucket with each account's
+        balance and their sum (net worth, in the accounts' currencies as
+        in the summary's total_balance) at the end of the bucket
+
+    Raises:
+        ValueError: If granularity is invalid, the period is empty or it
+            has too many points
+    """
+    user_id = _to_uuid(user_id)
+    if granularity not in BALANCE_GRANULARITIES:
+        raise ValueError(f"Invalid granularity. Must be one of: {', '.join(BALANCE_GRANULARITIES)}")
+    if not end_date:
+        end_date = date.today()
+    if not start_date:
+        start_date = end_date - timedelta(days=365)
+    if start_date > end_date:
+        raise ValueError("start_date must be before end_date")
+
+    buckets = [_truncate_date(start_date, granularity)]
+    while _next_bucket(buckets[-1], granularity) <= end_date:
+        buckets.append(_next_bucket(buckets[-1], granularity))
+        if len(buckets) > MAX_BALANCE_HISTORY_POINTS:
+            raise ValueError(
+                f"Too many points (max {MAX_BALANCE_HISTORY_POINTS}): "
+                "shorten the period or use a coarser granularity"
+            )
+
+    accounts_query = db.query(Account).filter(Account.user_id == user_id)
+    if account_id:
+        accounts_query = accounts_query.filter(Account.id == _to_uuid(account_id))
+    if not include_inactive:
+        accounts_query = accounts_query.filter(Account.is_active == True)
+    accounts = accounts_query.order_by(Account.name).all()
+    account_ids = [account.id for account in accounts]
+
+    # Signed ledger movements up to the end of the period
+    movements = union_all(
+        select(
+            Transaction.account_id.label("account_id"),
+            Transaction.date.label("date"),
+            case(
+                (Transaction.type == "income", Transaction.amount),
+                else_=-Transaction.amount
+            ).label("amount")
+        ).where(
+            Transaction.user_id == user_id,
+            Transaction.account_id.in_(account_ids),
+            Transaction.date <= end_date
+        ),
+        select(
+            Transfer.from_account_id,
+            Transfer.date,
+            -(Transfer.amount + Transfer.fee)
+        ).where(
+            Transfer.user_id == user_id,
+            Transfer.from_account_id.in_(account_ids),
+            Transfer.date <= end_date
+        ),
+        select(
+            Transfer.to_account_id,
+            Transfer.date,
+            Transfer.amount * func.coalesce(Transfer.exchange_rate, 1)
+        ).where(
+            Transfer.user_id == user_id,
+            Transfer.to_account_id.in_(account_ids),
+            Transfer.date <= end_date
+        )
+    ).subquery("movements")
+
+    # Net per account and bucket; NULL bucket = everything before the period
+    bucket = case(
+        (movements.c.date < buckets[0], None),
+        else_=cast(func.date_trunc(granularity, movements.c.date), Date)
+    )
+    net = (
+        select(
+            movements.c.account_id,
+            bucket.label("bucket"),
+            func.sum(movements.c.amount).label("net")
+        )
+        .group_by(movements.c.account_id, bucket)
+        .subquery("net")
+    )
+    running = func.sum(net.c.net).over(
+        partition_by=net.c.account_id,
+        order_by=net.c.bucket.asc().nulls_first()
+    )
+    rows = (
+        db.query(net.c.account_id, net.c.bucket, (Account.initial_balance + running).label("balance"))
+        .join(Account, Account.id == net.c.account_id)
+        .order_by(net.c.account_id, net.c.bucket.asc().nulls_first())
+        .all()
+    )
+
+    # Opening balances, then balance at the end of each bucket with movements
+    balances = {account.id: account.initial_balance for account in accounts}
+    changes: Dict[date, Dict[UUID, Decimal]] = {}
+    for row in rows:
+        if row.bucket is None:
+            balances[row.account_id] = row.balance
+        else:
+            changes.setdefault(row.bucket, {})[row.account_id] = row.balance
+
+    data = []
+    for bucket_start in buckets:
+        balances.update(changes.get(bucket_start, {}))
+        bucket_end = min(_next_bucket(bucket_start, granularity) - timedelta(days=1), end_date)
+        data.append({
+            "date": bucket_end.isoformat(),
+            "period_start": bucket_start.isoformat(),
+            "net_worth": float(sum(balances.values(), Decimal("0.00"))),
+            "balances": {str(account_id): float(balance) for account_id, balance in balances.items()}
+        })
+
+    return {
+        "period": {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "granularity": granularity,
+            "points": len(data)
+        },
+        "accounts": [
+            {
+                "account_id": str(account.id),
+                "account_name": account.name,
+                "account_type": account.type,
+                "account_color": account.color,
+                "currency": account.currency,
+                "initial_balance": float(account.initial_balance),
+                "current_balance": float(account.current_balance)
+            }
+            for account in accounts
+        ],
+        "data": data
+    }
+
+
+# Upper bound on the number of years compared at once
+MAX_COMPARISON_YEARS = 10
+
+
+def _yoy_delta(current: Dict[str, Any], previous: Dict[str, Any]) -> Dict[str, Any]:
+    """Absolute and percentage change of income, expenses and net."""
+    delta = {}
+    for field in ("income", "expenses", "net"):
+        change = current[field] - previous[field]
+        delta[f"{field}_delta"] = round(change, 2)
+        delta[f"{field}_delta_pct"] = (
+            round(change / abs(previous[field]) * 100, 2) if previous[field] else None
+        )
+    return delta
+
+
+def calculate_multi_year_comparison(
+    db: Session,
+    user_id: Union[str, UUID],
+    years: List[int]
+) -> Dict[str, Any]:
+    """
+    Compare any number of years month by month, with year-over-year deltas.
+    
+    Month x year x type totals come from a single grouped query that reads
+    only the requested years (years=2005,2025 skips the years in between).
+    
+    Args:
+        db: Database session
+        user_id: User ID
+        years: Years to compare (order and duplicates are irrelevant)
+    
+    Returns:
+        Dict with per-month values and deltas keyed by year, plus yearly
+        totals. Deltas are against the previous year in the list.
+    
+    Raises:
+        ValueError: If no years or too many years are requested
+    """
+    years = sorted(set(years))
+    if not years:
+        raise ValueError("At least one year is required")
+    if len(years) > MAX_COMPARISON_YEARS:
+        raise ValueError(f"Cannot compare more than {MAX_COMPARISON_YEARS} years")
+    
+    rows = transaction_totals(
+        db, user_id,
+        group_by=("month", "type"),
+        years=years
+    )
+    by_month = pivot_by_type(rows, "month")
+    
+    def bucket(year: int, month: int) -> Dict[str, Any]:
+        return type_totals_as_float(by_month.get(date(year, month, 1), empty_type_totals()))
+    
+    comparison = []
+    for month in range(1, 13):
+        values = {str(year): bucket(year, month) for year in years}
+        comparison.append({
+            "month": month,
+            "month_name": date(2000, month, 1).strftime('%B'),
+            "values": values,
+            "yoy": {
+                str(year): _yoy_delta(values[str(year)], values[str(prev)])
+                for prev, year in zip(years, years[1:])
+            }
+        })
+    
+    totals = {}
+    for year in years:
+        key = str(year)
+        totals[key] = {
+            field: round(sum(m["values"][key][field] for m in comparison), 2)
+            for field in ("income", "expense_necessity", "expense_extra", "expenses", "net")
+        }
+        totals[key]["transaction_count"] = sum(
+            m["values"][key]["transaction_count"] for m in comparison
+        )
+    
+    return {
+        "years": years,
+        "comparison": comparison,
+        "totals": totals,
+        "totals_yoy": {
+            str(year): _yoy_delta(totals[str(year)], totals[str(prev)])
+            for prev, year in zip(years, years[1:])
+        }
+    }
+
+
 def calculate_year_comparison(
     db: Session,
     user_id: Union[str, UUID],
@@ -492,41 +825,25 @@ def calculate_year_comparison(
     Returns:
         Dict with monthly comparison and yearly totals
     """
-    user_id = _to_uuid(user_id)
+    multi = calculate_multi_year_comparison(db, user_id, [year1, year2])
+    
     result = {
         "year1": year1,
         "year2": year2,
         "comparison": []
     }
     
-    for month in range(1, 13):
-        month_data = {
-            "month": month,
-            "month_name": date(2000, month, 1).strftime('%B')
+    for month_data in multi["comparison"]:
+        item = {
+            "month": month_data["month"],
+            "month_name": month_data["month_name"]
         }
-        
-        for year in [year1, year2]:
-            month_start = date(year, month, 1)
-            if month == 12:
-                month_end = date(year + 1, 1, 1) - timedelta(days=1)
-            else:
-                month_end = date(year, month + 1, 1) - timedelta(days=1)
-            
-            transactions = db.query(Transaction).filter(
-                Transaction.user_id == user_id,
-                Transaction.date >= month_start,
-                Transaction.date <= month_end
-            ).all()
-            
-            income = sum(t.amount for t in transactions if t.type == "income")
-            expenses = sum(t.amount for t in transactions if t.type in ["expense_necessity", "expense_extra"])
-            
-            year_key = f"year{1 if year == year1 else 2}"
-            month_data[f"{year_key}_income"] = float(income)
-            month_data[f"{year_key}_expenses"] = float(expenses)
-            month_data[f"{year_key}_net"] = float(income - expenses)
-        
-        result["comparison"].append(month_data)
+        for year_key, year in [("year1", year1), ("year2", year2)]:
+            values = month_data["values"][str(year)]
+            item[f"{year_key}_income"] = values["income"]
+            item[f"{year_key}_expenses"] = values["expenses"]
+            item[f"{year_key}_net"] = values["net"]
+        result["comparison"].append(item)
     
     # Yearly totals
     for year_key, year in [("year1", year1), ("year2", year2)]:
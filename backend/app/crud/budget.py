@@ -2,18 +2,19 @@
 Budget CRUD Operations
 Database operations for Budget model with spending calculations.
 """
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from sqlalchemy import func
 from typing import List, Optional, Union
 from uuid import UUID
 from datetime import date, datetime
 from decimal import Decimal
-from calendar import monthrange
 
 from app.models.budget import Budget
-from app.models.transaction import Transaction
+from app.models.monthly_total import MonthlyTotal
 from app.models.category import Category
 from app.schemas.budget import BudgetCreate, BudgetUpdate
+from app.crud.aggregation import EXPENSE_TYPES
+from app.crud.user import bump_data_version
 
 
 def _to_uuid(value: Union[str, UUID, None]) -> Optional[UUID]:
@@ -115,6 +116,7 @@ def create_budget(
         user_id=user_id
     )
     db.add(db_budget)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_budget)
 
@@ -138,6 +140,7 @@ def update_budget(
     for field, value in update_data.items():
         setattr(db_budget, field, value)
 
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_budget)
 
@@ -156,11 +159,33 @@ def delete_budget(
         return False
 
     db.delete(db_budget)
+    bump_data_version(db, user_id)
     db.commit()
 
     return True
 
 
+def _spending_by_category_query(
+    db: Session,
+    user_id: UUID,
+    year: int,
+    month: int
+):
+    """
+    Expense totals of the month grouped by category_id (unexecuted).
+
+    Read from the monthly aggregate table: one row per account and type.
+    """
+    return db.query(
+        MonthlyTotal.category_id.label("category_id"),
+        func.sum(MonthlyTotal.total).label("spent")
+    ).filter(
+        MonthlyTotal.user_id == user_id,
+        MonthlyTotal.month == date(year, month, 1),
+        MonthlyTotal.type.in_(EXPENSE_TYPES)
+    ).group_by(MonthlyTotal.category_id)
+
+
 def calculate_spent_for_month(
     db: Session,
     user_id: Union[str, UUID],
@@ -176,19 +201,13 @@ def calculate_spent_for_month(
     user_id = _to_uuid(user_id)
     category_id = _to_uuid(category_id)
 
-    # Get first and last day of month
-    start_date = date(year, month, 1)
-    last_day = monthrange(year, month)[1]
-    end_date = date(year, month, last_day)
-
-    # Query transactions for this category in this month
+    # Monthly aggregate rows for this category in this month
     # Only expenses: filtro per tipo (le transazioni sono salvate con amount positivo)
-    result = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.user_id == user_id,
-        Transaction.category_id == category_id,
-        Transaction.date >= start_date,
-        Transaction.date <= end_date,
-        Transaction.type.in_(["expense_necessity", "expense_extra"])
+    result = db.query(func.sum(MonthlyTotal.total)).filter(
+        MonthlyTotal.user_id == user_id,
+        MonthlyTotal.category_id == category_id,
+        MonthlyTotal.month == date(year, month, 1),
+        MonthlyTotal.type.in_(EXPENSE_TYPES)
     ).scalar()
 
     if result is None:
@@ -228,16 +247,22 @@ def get_budget_with_spending(
     db: Session,
     budget: Budget,
     year: int,
-    month: int
+    month: int,
+    spent: Optional[Decimal] = None
 ) -> dict:
     """
     Get budget with current spending data.
 
+    Args:
+        spent: Amount already computed for the month (e.g. in a batch);
+            if None it is queried for this budget's category.
+
     Returns enriched budget dict with spending info and status.
     """
     # Calculate spent amount
-    spent = Decimal('0')
-    if budget.category_id:
+    if spent is not None or budget.category_id is None:
+        spent = spent or Decimal('0')
+    else:
         spent = calculate_spent_for_month(
             db,
             budget.user_id,
@@ -316,16 +341,28 @@ def get_budgets_summary(
     if month is None:
         month = now.month
 
-    # Get all active budgets
-    budgets = get_budgets(db, user_id, is_active=True, limit=500)
+    # All active budgets with their category and month spending, in one
+    # query: category joined eagerly, spending from a grouped subquery.
+    spending = _spending_by_category_query(db, user_id, year, month).subquery()
+    rows = (
+        db.query(Budget, spending.c.spent)
+        .outerjoin(Budget.category)
+        .outerjoin(spending, spending.c.category_id == Budget.category_id)
+        .options(contains_eager(Budget.category))
+        .filter(Budget.user_id == user_id, Budget.is_active == True)
+        .order_by(Budget.created_at.desc())
+        .limit(500)
+        .all()
+    )
 
     # Enrich each budget with spending data
     enriched_budgets = []
     total_budget = Decimal('0')
     total_spent = Decimal('0')
 
-    for budget in budgets:
-        budget_data = get_budget_with_spending(db, budget, year, month)
+    for budget, spent in rows:
+        spent = abs(Decimal(str(spent))) if spent is not None else Decimal('0')
+        budget_data = get_budget_with_spending(db, budget, year, month, spent=spent)
         enriched_budgets.append(budget_data)
 
         total_budget += budget.amount
@@ -2,12 +2,15 @@
 Category CRUD Operations
 Database operations for Category model with hierarchical structure
 """
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Union
+from typing import Any, List, Optional, Dict, Union
 from uuid import UUID
 
 from app.models.category import Category
+from app.models.transaction import Transaction
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.crud.user import bump_data_version
 
 def _to_uuid(value: Union[str, UUID, None]) -> Optional[UUID]:
     """Convert string to UUID if necessary."""
@@ -59,25 +62,108 @@ def get_categories(
     return query.order_by(Category.name).offset(skip).limit(limit).all()
 
 
+# Columns selected when assembling trees: never the ORM entity, so no
+# relationship (parent, subcategories, transactions) can be triggered.
+_TREE_COLUMNS = (
+    Category.id,
+    Category.user_id,
+    Category.parent_id,
+    Category.name,
+    Category.type,
+    Category.color,
+    Category.icon,
+    Category.is_active,
+    Category.created_at,
+    Category.updated_at,
+)
+
+
+def _category_rows(
+    db: Session,
+    user_id: UUID,
+    *criteria,
+    include_counts: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Flat query of category rows as dicts, optionally with transaction counts.
+
+    Counts come from one grouped subquery on transactions outer-joined to
+    the category rows; transactions themselves are never loaded.
+    """
+    columns = list(_TREE_COLUMNS)
+
+    if include_counts:
+        counts = (
+            db.query(
+                Transaction.category_id.label("category_id"),
+                func.count(Transaction.id).label("transaction_count")
+            )
+            .filter(Transaction.user_id == user_id)
+            .group_by(Transaction.category_id)
+            .subquery()
+        )
+        columns.append(func.coalesce(counts.c.transaction_count, 0).label("transaction_count"))
+
+    query = db.query(*columns)
+    if include_counts:
+        query = query.outerjoin(counts, counts.c.category_id == Category.id)
+
+    query = query.filter(Category.user_id == user_id, *criteria)
+    return [row._asdict() for row in query.order_by(Category.name).all()]
+
+
+def _attach_subcategories(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Turn flat category rows into main categories with nested subcategories.
+
+    Rows are expected in name order, which is preserved at both levels.
+    Subcategories whose parent is not among the rows are dropped.
+    """
+    mains: Dict[UUID, Dict[str, Any]] = {}
+    children: List[Dict[str, Any]] = []
+
+    for row in rows:
+        if row["parent_id"] is None:
+            row["subcategories"] = []
+            mains[row["id"]] = row
+        else:
+            children.append(row)
+
+    for child in children:
+        parent = mains.get(child["parent_id"])
+        if parent is not None:
+            parent["subcategories"].append(child)
+
+    return list(mains.values())
+
+
 def get_categories_tree(
     db: Session,
     user_id: Union[str, UUID],
-    is_active: Optional[bool] = True
-) -> Dict[str, List[Category]]:
+    is_active: Optional[bool] = True,
+    include_counts: bool = False
+) -> Dict[str, List[Dict[str, Any]]]:
     """
     Returns categories organized in a tree by type.
 
+    The tree is built from one flat query of category columns; no
+    transaction is loaded. The is_active filter applies to main categories,
+    subcategories of the selected mains are always included.
+
+    Args:
+    include_counts: If True, each node carries its transaction_count
+
     Returns:
     Dict with keys 'income', 'expense_necessity', 'expense_extra'
     Each value is a list of main categories with populated subcategories
     """
-    # Prendi tutte le categorie principali (senza parent)
-    main_categories = get_categories(
-        db, user_id, 
-        is_active=is_active, 
-        only_main=True,
-        limit=500
-    )
+    user_id = _to_uuid(user_id)
+
+    criteria = []
+    if is_active is not None:
+        criteria.append(or_(Category.parent_id.isnot(None), Category.is_active == is_active))
+
+    rows = _category_rows(db, user_id, *criteria, include_counts=include_counts)
     
     # Organizza per tipo
     tree = {
@@ -86,13 +172,80 @@ def get_categories_tree(
         "expense_extra": []
     }
     
-    for cat in main_categories:
-        if cat.type in tree:
-            tree[cat.type].append(cat)
+    for cat in _attach_subcategories(rows):
+        if cat["type"] in tree:
+            tree[cat["type"]].append(cat)
     
     return tree
 
 
+def get_category_with_subcategories(
+    db: Session,
+    category_id: Union[str, UUID],
+    user_id: Union[str, UUID],
+    include_counts: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve a category and its direct subcategories with one flat query.
+    """
+    category_id = _to_uuid(category_id)
+    user_id = _to_uuid(user_id)
+
+    rows = _category_rows(
+        db, user_id,
+        or_(Category.id == category_id, Category.parent_id == category_id),
+        include_counts=include_counts
+    )
+
+    category = next((row for row in rows if row["id"] == category_id), None)
+    if category is None:
+        return None
+
+    category["subcategories"] = [row for row in rows if row["id"] != category_id]
+    return category
+
+
+def category_has_transactions(
+    db: Session,
+    category_id: Union[str, UUID],
+    include_subcategories: bool = True
+) -> bool:
+    """
+    Check with an EXISTS query whether a category (and optionally its
+    subcategories) has any transaction.
+    """
+    category_id = _to_uuid(category_id)
+
+    target_ids = [category_id]
+    if include_subcategories:
+        target_ids = select(Category.id).where(
+            or_(Category.id == category_id, Category.parent_id == category_id)
+        )
+
+    return db.query(
+        db.query(Transaction.id).filter(Transaction.category_id.in_(target_ids)).exists()
+    ).scalar()
+
+
+def get_first_category_with_transactions(
+    db: Session,
+    user_id: Union[str, UUID]
+) -> Optional[Category]:
+    """
+    Returns one of the user's categories that has transactions, if any.
+    """
+    user_id = _to_uuid(user_id)
+    return (
+        db.query(Category)
+        .filter(
+            Category.user_id == user_id,
+            db.query(Transaction.id).filter(Transaction.category_id == Category.id).exists()
+        )
+        .order_by(Category.name)
+        .first()
+    )
+
+
 def get_category(
     db: Session,
     category_id: Union[str, UUID],
@@ -139,6 +292,7 @@ def create_category(
     )
     
     db.add(db_category)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_category)
     
@@ -167,6 +321,7 @@ def update_category(
     for field, value in update_data.items():
         setattr(db_category, field, value)
     
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_category)
     
@@ -188,6 +343,7 @@ def delete_category(
         return False
     
     db.delete(db_category)
+    bump_data_version(db, user_id)
     db.commit()
     
     return True
@@ -207,6 +363,7 @@ def deactivate_category(
         return None
     
     db_category.is_active = False
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_category)
     
@@ -435,6 +592,7 @@ def seed_default_categories(db: Session, user_id: Union[str, UUID]) -> List[Cate
             subcategories=data["subcategories"]
         )
     
+    bump_data_version(db, user_id)
     db.commit()
     
     # Refresh all categories
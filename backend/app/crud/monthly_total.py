@@ -0,0 +1,233 @@
+"""
+Monthly Total CRUD Operations
+Maintenance of the transaction_monthly_totals aggregate table.
+
+The transaction CRUD collects signed deltas per aggregation key and applies
+them with apply_monthly_deltas() before committing, so the aggregate is
+always consistent with `transactions` in the same DB transaction.
+rebuild_monthly_totals() recomputes it from scratch (backfill, drift repair).
+"""
+from sqlalchemy import Date, cast, delete, func, insert, literal, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import UUID
+from datetime import date
+from decimal import Decimal
+
+from app.models.monthly_total import MonthlyTotal
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.crud.user import bump_data_version
+
+# (user_id, month, account_id, category_id, type)
+MonthlyKey = Tuple[UUID, date, UUID, UUID, str]
+
+
+def _to_uuid(value: Union[str, UUID, None]) -> Optional[UUID]:
+    """Convert string to UUID if necessary."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return UUID(value)
+    return value
+
+
+def month_start(value: date) -> date:
+    """First day of the month of a date."""
+    return date(value.year, value.month, 1)
+
+
+def add_transaction_delta(
+    deltas: Dict[MonthlyKey, List[Any]],
+    transaction: Any,
+    sign: int
+) -> None:
+    """
+    Accumulate a transaction (+1 added, -1 removed) into a deltas dict.
+
+    `transaction` may be a Transaction or any object with user_id, date,
+    account_id, category_id, type and amount (e.g. a snapshot of the values
+    before an update).
+    """
+    key = (
+        _to_uuid(transaction.user_id),
+        month_start(transaction.date),
+        _to_uuid(transaction.account_id),
+        _to_uuid(transaction.category_id),
+        transaction.type
+    )
+    delta = deltas.setdefault(key, [Decimal("0.00"), 0])
+    delta[0] += sign * Decimal(transaction.amount)
+    delta[1] += sign
+
+
+def apply_monthly_deltas(db: Session, deltas: Dict[MonthlyKey, List[Any]]) -> None:
+    """
+    Add signed (total, count) deltas to the aggregate rows (no commit).
+
+    Rows are upserted with an additive ON CONFLICT update, so concurrent
+    writers on the same key serialize on the row lock instead of
+    overwriting each other. Rows left with no transactions are removed.
+    """
+    # Keys in a fixed order: concurrent multi-key writers lock rows in the
+    # same sequence and cannot deadlock
+    changes = [
+        {
+            "user_id": key[0],
+            "month": key[1],
+            "account_id": key[2],
+            "category_id": key[3],
+            "type": key[4],
+            "total": total,
+            "count": count
+        }
+        for key, (total, count) in sorted(deltas.items(), key=lambda item: tuple(map(str, item[0])))
+        if count != 0 or total != 0
+    ]
+    if not changes:
+        return
+
+    stmt = pg_insert(MonthlyTotal).values(changes)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            MonthlyTotal.user_id,
+            MonthlyTotal.month,
+            MonthlyTotal.account_id,
+            MonthlyTotal.category_id,
+            MonthlyTotal.type
+        ],
+        set_={
+            "total": MonthlyTotal.total + stmt.excluded.total,
+            "count": MonthlyTotal.count + stmt.excluded.count
+        }
+    )
+    db.execute(stmt)
+
+    emptied = [
+        (c["user_id"], c["month"], c["account_id"], c["category_id"], c["type"])
+        for c in changes if c["count"] < 0
+    ]
+    if emptied:
+        db.execute(
+            delete(MonthlyTotal).where(
+                tuple_(
+                    MonthlyTotal.user_id,
+                    MonthlyTotal.month,
+                    MonthlyTotal.account_id,
+                    MonthlyTotal.category_id,
+                    MonthlyTotal.type
+                ).in_(emptied),
+                MonthlyTotal.count <= 0
+            )
+        )
+
+
+def _aggregate_transactions(user_id: Optional[UUID] = None):
+    """SELECT of the monthly totals computed from `transactions`."""
+    month = cast(func.date_trunc("month", Transaction.date), Date)
+    query = select(
+        Transaction.user_id.label("user_id"),
+        month.label("month"),
+        Transaction.account_id.label("account_id"),
+        Transaction.category_id.label("category_id"),
+        Transaction.type.label("type"),
+        func.sum(Transaction.amount).label("total"),
+        func.count(Transaction.id).label("count")
+    ).group_by(
+        Transaction.user_id, month, Transaction.account_id,
+        Transaction.category_id, Transaction.type
+    )
+    if user_id is not None:
+        query = query.where(Transaction.user_id == user_id)
+    return query
+
+
+def rebuild_monthly_totals(
+    db: Session,
+    user_id: Optional[Union[str, UUID]] = None
+) -> int:
+    """
+    Recompute the aggregate rows from `transactions` (no commit).
+
+    The table is locked against concurrent writers until the caller
+    commits, so no delta applied meanwhile can be lost. The data version
+    of the rebuilt users is bumped.
+
+    Args:
+        db: Database session
+        user_id: Rebuild only this user (default: all users)
+
+    Returns:
+        Number of aggregate rows written
+    """
+    user_id = _to_uuid(user_id)
+    db.execute(text("LOCK TABLE transaction_monthly_totals IN SHARE ROW EXCLUSIVE MODE"))
+
+    clear = delete(MonthlyTotal)
+    if user_id is not None:
+        clear = clear.where(MonthlyTotal.user_id == user_id)
+    db.execute(clear)
+
+    result = db.execute(
+        insert(MonthlyTotal).from_select(
+            ["user_id", "month", "account_id", "category_id", "type", "total", "count"],
+            _aggregate_transactions(user_id)
+        )
+    )
+
+    # Cached analytics were computed from the old rows
+    if user_id is not None:
+        bump_data_version(db, user_id)
+    else:
+        db.execute(update(User).values(data_version=User.data_version + 1))
+    return result.rowcount
+
+
+def find_monthly_total_drift(
+    db: Session,
+    user_id: Optional[Union[str, UUID]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Compare the aggregate rows with `transactions` without changing them.
+
+    Returns:
+        One dict per mismatching key with stored and expected total/count
+        (0 when the row is missing on either side)
+    """
+    user_id = _to_uuid(user_id)
+    expected = _aggregate_transactions(user_id).subquery()
+    stored = select(MonthlyTotal)
+    if user_id is not None:
+        stored = stored.where(MonthlyTotal.user_id == user_id)
+    stored = stored.subquery()
+
+    zero = literal(0)
+    rows = db.execute(
+        select(
+            func.coalesce(stored.c.user_id, expected.c.user_id).label("user_id"),
+            func.coalesce(stored.c.month, expected.c.month).label("month"),
+            func.coalesce(stored.c.account_id, expected.c.account_id).label("account_id"),
+            func.coalesce(stored.c.category_id, expected.c.category_id).label("category_id"),
+            func.coalesce(stored.c.type, expected.c.type).label("type"),
+            func.coalesce(stored.c.total, zero).label("stored_total"),
+            func.coalesce(expected.c.total, zero).label("expected_total"),
+            func.coalesce(stored.c.count, zero).label("stored_count"),
+            func.coalesce(expected.c.count, zero).label("expected_count")
+        ).select_from(
+            stored.join(
+                expected,
+                (stored.c.user_id == expected.c.user_id)
+                & (stored.c.month == expected.c.month)
+                & (stored.c.account_id == expected.c.account_id)
+                & (stored.c.category_id == expected.c.category_id)
+                & (stored.c.type == expected.c.type),
+                full=True
+            )
+        ).where(
+            (func.coalesce(stored.c.total, zero) != func.coalesce(expected.c.total, zero))
+            | (func.coalesce(stored.c.count, zero) != func.coalesce(expected.c.count, zero))
+        )
+    ).all()
+
+    return [row._asdict() for row in rows]
@@ -11,17 +11,20 @@ Transfer types:
 - loan_given: Loan given (Checking → Loans to third parties)
 - loan_received: Loan received (Loans → Checking)
 """
-from sqlalchemy.orm import Session
-from typing import List, Optional, Union
+from sqlalchemy.orm import Session, aliased
+from typing import List, Optional, Sequence, Union
 from uuid import UUID 
 from decimal import Decimal
 from datetime import date
 
 from app.models.transfer import Transfer
 from app.models.account import Account
+from app.crud.account import add_balance_delta, apply_balance_deltas
+from app.crud.user import bump_data_version
 from app.schemas.transfer import (
     TransferCreate, 
     TransferUpdate, 
+    TransferResponse,
     VALID_TRANSFER_TYPES,
     TRANSFER_TYPE_DIRECTION_RULES,
     TRANSFER_TYPE_LABELS
@@ -73,21 +76,15 @@ def validate_transfer_direction(
         )
 
 
-def get_transfers(
-    db: Session,
-    user_id: Union[str, UUID],
-    skip: int = 0,
-    limit: int = 100,
+def _apply_transfer_filters(
+    query,
     transfer_type: Optional[str] = None,
     from_account_id: Optional[Union[str, UUID]] = None,
     to_account_id: Optional[Union[str, UUID]] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
-) -> List[Transfer]:
-    """List user transfers with optional filters."""
-    user_id = _to_uuid(user_id)
-    query = db.query(Transfer).filter(Transfer.user_id == user_id)
-    
+):
+    """Apply the transfer list filters shared by lists and exports."""
     if transfer_type is not None:
         query = query.filter(Transfer.type == transfer_type)
     
@@ -105,23 +102,132 @@ def get_transfers(
     if end_date is not None:
         query = query.filter(Transfer.date <= end_date)
     
+    return query
+
+
+def get_transfers(
+    db: Session,
+    user_id: Union[str, UUID],
+    skip: int = 0,
+    limit: int = 100,
+    transfer_type: Optional[str] = None,
+    from_account_id: Optional[Union[str, UUID]] = None,
+    to_account_id: Optional[Union[str, UUID]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> List[Transfer]:
+    """List user transfers with optional filters."""
+    user_id = _to_uuid(user_id)
+    query = db.query(Transfer).filter(Transfer.user_id == user_id)
+    
+    query = _apply_transfer_filters(
+        query,
+        transfer_type=transfer_type,
+        from_account_id=from_account_id,
+        to_account_id=to_account_id,
+        start_date=start_date,
+        end_date=end_date
+    )
+    
     query = query.order_by(Transfer.date.desc(), Transfer.created_at.desc())
     
     return query.offset(skip).limit(limit).all()
 
 
+# Fields of the list projection (?fields=); all of them are columns
+LIST_FIELDS = tuple(TransferResponse.model_fields)
+
+
+def get_transfer_rows(
+    db: Session,
+    user_id: Union[str, UUID],
+    fields: Sequence[str] = LIST_FIELDS,
+    skip: int = 0,
+    limit: int = 100,
+    **filters
+) -> List[tuple]:
+    """
+    Transfers as rows of the given columns, in get_transfers order.
+    
+    Only the selected columns are read and no ORM objects are built: the
+    list endpoint encodes the rows directly.
+    
+    Args:
+        fields: Columns to select, among LIST_FIELDS
+        **filters: Same filters as get_transfers
+    """
+    user_id = _to_uuid(user_id)
+    columns = [getattr(Transfer, name) for name in fields]
+    query = db.query(*columns).filter(Transfer.user_id == user_id)
+    query = _apply_transfer_filters(query, **filters)
+    query = query.order_by(Transfer.date.desc(), Transfer.created_at.desc())
+    return query.offset(skip).limit(limit).all()
+
+
+# Columns of the CSV/NDJSON export (accounts by name)
+EXPORT_COLUMNS = (
+    "id", "date", "type", "amount", "fee", "exchange_rate",
+    "from_account", "to_account", "description", "notes", "created_at",
+)
+
+
+def transfers_export_query(
+    db: Session,
+    user_id: Union[str, UUID],
+    **filters
+):
+    """
+    Column query for the transfer export, newest first.
+    
+    Args:
+        **filters: Same filters as get_transfers
+    """
+    user_id = _to_uuid(user_id)
+    from_account = aliased(Account)
+    to_account = aliased(Account)
+    query = db.query(
+        Transfer.id,
+        Transfer.date,
+        Transfer.type,
+        Transfer.amount,
+        Transfer.fee,
+        Transfer.exchange_rate,
+        from_account.name.label("from_account"),
+        to_account.name.label("to_account"),
+        Transfer.description,
+        Transfer.notes,
+        Transfer.created_at
+    ).join(
+        from_account, from_account.id == Transfer.from_account_id
+    ).join(
+        to_account, to_account.id == Transfer.to_account_id
+    ).filter(Transfer.user_id == user_id)
+    
+    query = _apply_transfer_filters(query, **filters)
+    return query.order_by(Transfer.date.desc(), Transfer.created_at.desc(), Transfer.id.desc())
+
+
 def get_transfer(
     db: Session,
     transfer_id: Union[str, UUID],
-    user_id: Union[str, UUID]
+    user_id: Union[str, UUID],
+    for_update: bool = False
 ) -> Optional[Transfer]:
-    """Get single transfer verifying ownership."""
+    """
+    Get single transfer verifying ownership.
+    
+    With for_update=True the row is locked and re-read from the database,
+    so concurrent writes to the same transfer are serialized.
+    """
     transfer_id = _to_uuid(transfer_id)
     user_id = _to_uuid(user_id)
-    return db.query(Transfer).filter(
+    query = db.query(Transfer).filter(
         Transfer.id == transfer_id,
         Transfer.user_id == user_id
-    ).first()
+    )
+    if for_update:
+        query = query.populate_existing().with_for_update()
+    return query.first()
 
 
 def get_transfer_by_id(
@@ -133,6 +239,20 @@ def get_transfer_by_id(
     return db.query(Transfer).filter(Transfer.id == transfer_id).first()
 
 
+def _add_transfer_balance_deltas(deltas: dict, transfer: Transfer, sign: int) -> None:
+    """
+    Accumulate the balance effect of a transfer into `deltas` (sign=1 to
+    apply it, sign=-1 to reverse it).
+    
+    - from_account: -(amount + fee)
+    - to_account: +amount (or amount * exchange_rate)
+    """
+    fee = transfer.fee or Decimal("0.00")
+    received = transfer.amount * transfer.exchange_rate if transfer.exchange_rate else transfer.amount
+    add_balance_delta(deltas, transfer.from_account_id, -sign * (transfer.amount + fee))
+    add_balance_delta(deltas, transfer.to_account_id, sign * received)
+
+
 def create_transfer(
     db: Session,
     transfer: TransferCreate,
@@ -176,9 +296,7 @@ def create_transfer(
     # Validate transfer direction based on type
     validate_transfer_direction(transfer.type, from_account, to_account)
     
-    # Calculate total deduction (amount + fee)
     fee = transfer.fee if transfer.fee else Decimal("0.00")
-    total_deduction = transfer.amount + fee
     
     # Create the transfer
     db_transfer = Transfer(
@@ -197,14 +315,11 @@ def create_transfer(
     db.add(db_transfer)
     
     # Update current_balance of both accounts (NOT initial_balance)
-    from_account.current_balance -= total_deduction
-    
-    if transfer.exchange_rate:
-        converted_amount = transfer.amount * transfer.exchange_rate
-        to_account.current_balance += converted_amount
-    else:
-        to_account.current_balance += transfer.amount
+    deltas = {}
+    _add_transfer_balance_deltas(deltas, db_transfer, 1)
+    apply_balance_deltas(db, deltas)
     
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_transfer)
     
@@ -234,17 +349,14 @@ def update_transfer(
     Returns:
         Updated transfer if found, None if transfer doesn't exist
     """
-    db_transfer = get_transfer(db, transfer_id, user_id)
+    db_transfer = get_transfer(db, transfer_id, user_id, for_update=True)
     
     if not db_transfer:
         return None
     
     # Save old values for balance recalculation
-    old_amount = db_transfer.amount
-    old_fee = db_transfer.fee
     old_from_account_id = db_transfer.from_account_id
     old_to_account_id = db_transfer.to_account_id
-    old_exchange_rate = db_transfer.exchange_rate
     
     # Prepare update data
     update_data = transfer_update.model_dump(exclude_unset=True)
@@ -296,18 +408,9 @@ def update_transfer(
         "type" in update_data):
         validate_transfer_direction(new_type, new_from_account, new_to_account)
     
-    # Restore old balances (reverse the original transfer effect)
-    old_from_account = db.query(Account).filter(Account.id == old_from_account_id).first()
-    old_to_account = db.query(Account).filter(Account.id == old_to_account_id).first()
-    
-    if old_from_account:
-        old_from_account.current_balance += (old_amount + old_fee)
-    
-    if old_to_account:
-        if old_exchange_rate:
-            old_to_account.current_balance -= (old_amount * old_exchange_rate)
-        else:
-            old_to_account.current_balance -= old_amount
+    # Reverse the original transfer effect
+    deltas = {}
+    _add_transfer_balance_deltas(deltas, db_transfer, -1)
     
     if "from_account_id" in update_data:
         update_data["from_account_id"] = new_from_account_id
@@ -318,20 +421,11 @@ def update_transfer(
     for field, value in update_data.items():
         setattr(db_transfer, field, value)
     
-    # Apply new balances
-    new_amount = db_transfer.amount
-    new_fee = db_transfer.fee
-    new_exchange_rate = db_transfer.exchange_rate
-    
-    # Deduct from source account (amount + fee)
-    new_from_account.current_balance -= (new_amount + new_fee)
-    
-    # Add to destination account (with exchange rate if applicable)
-    if new_exchange_rate:
-        new_to_account.current_balance += (new_amount * new_exchange_rate)
-    else:
-        new_to_account.current_balance += new_amount
+    # Apply the new transfer effect (unchanged fields net to zero)
+    _add_transfer_balance_deltas(deltas, db_transfer, 1)
+    apply_balance_deltas(db, deltas)
     
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_transfer)
     
@@ -346,24 +440,17 @@ def delete_transfer(
     """
     Delete transfer and restore current_balance of both accounts.
     """
-    db_transfer = get_transfer(db, transfer_id, user_id)
+    db_transfer = get_transfer(db, transfer_id, user_id, for_update=True)
     
     if not db_transfer:
         return False
     
-    from_account = db.query(Account).filter(Account.id == db_transfer.from_account_id).first()
-    to_account = db.query(Account).filter(Account.id == db_transfer.to_account_id).first()
-    
-    if from_account:
-        from_account.current_balance += (db_transfer.amount + db_transfer.fee)
-    
-    if to_account:
-        if db_transfer.exchange_rate:
-            to_account.current_balance -= (db_transfer.amount * db_transfer.exchange_rate)
-        else:
-            to_account.current_balance -= db_transfer.amount
+    deltas = {}
+    _add_transfer_balance_deltas(deltas, db_transfer, -1)
+    apply_balance_deltas(db, deltas)
     
     db.delete(db_transfer)
+    bump_data_version(db, user_id)
     db.commit()
     
     return True
@@ -2,9 +2,10 @@
 CRUD operations for User model.
 """
 
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.schemas.user import UserCreate
+from app.schemas.user import UserCreate, UserPrincipal
 from app.utils.security import hash_password, verify_password
 from typing import Optional
 from uuid import UUID
@@ -41,13 +42,84 @@ def get_user_by_id(db: Session, user_id: Union[str, UUID]) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
 
 
-def create_user(db: Session, user: UserCreate) -> User:
+def get_user_principal(db: Session, user_id: Union[str, UUID]) -> Optional[UserPrincipal]:
+    """
+    Retrieve only the columns needed to authenticate a request.
+    
+    Selects id, email, is_active and data_version as plain columns, so no
+    User instance is built and no relationship is loaded.
+    
+    Args:
+        db: Database session
+        user_id: User unique identifier
+        
+    Returns:
+        UserPrincipal if found, None otherwise
+    """
+    if isinstance(user_id, str):
+        user_id = UUID(user_id)
+    row = db.query(
+        User.id, User.email, User.is_active, User.data_version
+    ).filter(User.id == user_id).first()
+    
+    if row is None:
+        return None
+    
+    return UserPrincipal.model_validate(row)
+
+
+def bump_data_version(db: Session, *user_ids: Union[str, UUID]) -> None:
+    """
+    Increment the data version of the given users.
+    
+    Called by every write to accounts, categories, transactions, transfers,
+    budgets and vacation data, inside the same database transaction (the
+    caller commits), so cached responses and ETags computed on the old
+    version are never served again.
+    
+    Lock order: pending ORM changes are flushed first, so every write locks
+    its account/category/transaction rows before the user row. The user row
+    stays locked until commit: writes of the same user are serialized from
+    this point on (their earlier statements still run concurrently).
+    
+    Args:
+        db: Database session
+        user_ids: Users whose data changed
+    """
+    ids = sorted({UUID(str(user_id)) for user_id in user_ids})
+    if not ids:
+        return
+    # autoflush is off: without this, staged setattr/delete changes would
+    # lock their rows at commit, after the user row (deadlock with writers
+    # that update accounts first)
+    db.flush()
+    if len(ids) > 1:
+        # An UPDATE locks rows in scan order: take the locks in id order
+        # first so concurrent multi-user writers cannot deadlock
+        db.execute(
+            select(User.id)
+            .where(User.id.in_(ids))
+            .order_by(User.id)
+            .with_for_update(key_share=True)
+        )
+    # Atomic increment
+    db.execute(
+        update(User)
+        .where(User.id.in_(ids))
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def create_user(db: Session, user: UserCreate, password_hash: Optional[str] = None) -> User:
     """
     Create a new user with hashed password.
     
     Args:
         db: Database session
         user: UserCreate schema with user data
+        password_hash: Hash of user.password computed by the caller
+            (e.g. off the event loop); hashed here if None
         
     Returns:
         Created User object
@@ -61,7 +133,7 @@ def create_user(db: Session, user: UserCreate) -> User:
         raise ValueError(f"User with email {user.email} already exists")
     
     # Hash the password
-    hashed_password = hash_password(user.password)
+    hashed_password = password_hash or hash_password(user.password)
     
     # Create user instance
     db_user = User(
@@ -149,6 +221,22 @@ def update_user(db: Session, user_id: Union[str, UUID], **kwargs) -> Optional[Us
     return user
 
 
+def update_password_hash(db: Session, user_id: Union[str, UUID], password_hash: str) -> None:
+    """
+    Replace the stored password hash (e.g. rehash with a new cost factor).
+    
+    Args:
+        db: Database session
+        user_id: User unique identifier
+        password_hash: New hash of the same password
+    """
+    db.query(User).filter(User.id == user_id).update(
+        {User.password_hash: password_hash},
+        synchronize_session=False
+    )
+    db.commit()
+
+
 def delete_user(db: Session, user_id: Union[str, UUID]) -> bool:
     """
     Delete a user (hard delete).
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 
 from app.models.user_holiday import UserHoliday
 from app.schemas.vacation import UserHolidayCreate
+from app.crud.user import bump_data_version
 
 
 def _to_uuid(value: Union[str, UUID]) -> UUID:
@@ -83,6 +84,7 @@ def create(
         year=holiday_in.year,
     )
     db.add(holiday)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(holiday)
     return holiday
@@ -96,5 +98,6 @@ def delete(
     if holiday is None:
         return False
     db.delete(holiday)
+    bump_data_version(db, user_id)
     db.commit()
     return True
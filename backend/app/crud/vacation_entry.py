@@ -12,13 +12,14 @@ Logica ore:
 - ROL / Permesso: ore manuali obbligatorie (già validate dallo schema)
 """
 from datetime import date as date_type
-from typing import List, Optional, Union, Dict, Any
+from typing import List, Optional, Sequence, Union, Dict, Any
 from uuid import UUID
 
 from sqlalchemy.orm import Session
 
 from app.models.vacation_entry import VacationEntry, VacationEntryType, MANUAL_HOURS_TYPES
 from app.schemas.vacation import VacationEntryCreate, VacationEntryUpdate
+from app.crud.user import bump_data_version
 from app.utils.bridge_days import is_weekend
 
 
@@ -82,8 +83,36 @@ def get_all(
     entry_type: Optional[VacationEntryType] = None,
 ) -> List[VacationEntry]:
     """Return entries with optional filters, ordered by date descending."""
+    return _filter_entries(db.query(VacationEntry), user_id, year, month, entry_type).all()
+
+
+def get_rows(
+    db: Session,
+    user_id: Union[str, UUID],
+    columns: Sequence[str],
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    entry_type: Optional[VacationEntryType] = None,
+) -> List[tuple]:
+    """
+    Return entries as rows of the given columns, in get_all order.
+
+    No ORM objects are built: the list endpoint encodes the rows directly.
+    """
+    query = db.query(*(getattr(VacationEntry, name) for name in columns))
+    return _filter_entries(query, user_id, year, month, entry_type).all()
+
+
+def _filter_entries(
+    query,
+    user_id: Union[str, UUID],
+    year: Optional[int],
+    month: Optional[int],
+    entry_type: Optional[VacationEntryType],
+):
+    """Apply the list filters and the date descending order."""
     user_id = _to_uuid(user_id)
-    query = db.query(VacationEntry).filter(VacationEntry.user_id == user_id)
+    query = query.filter(VacationEntry.user_id == user_id)
 
     if year is not None:
         query = query.filter(
@@ -102,7 +131,7 @@ def get_all(
     if entry_type is not None:
         query = query.filter(VacationEntry.entry_type == entry_type)
 
-    return query.order_by(VacationEntry.date.desc()).all()
+    return query.order_by(VacationEntry.date.desc())
 
 
 # ── Validations ───────────────────────────────────────────────────────────────
@@ -178,6 +207,7 @@ def create(
         notes=entry.notes,
     )
     db.add(db_entry)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_entry)
     return db_entry
@@ -207,6 +237,7 @@ def create_bulk(
         db.add(db_entry)
         created.append(db_entry)
 
+    bump_data_version(db, user_id)
     db.commit()
     for entry in created:
         db.refresh(entry)
@@ -231,6 +262,7 @@ def update(
     for field, value in update_data.items():
         setattr(db_entry, field, value)
 
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_entry)
     return db_entry
@@ -244,5 +276,6 @@ def delete(
     if db_entry is None:
         return False
     db.delete(db_entry)
+    bump_data_version(db, user_id)
     db.commit()
     return True
@@ -11,6 +11,7 @@ from uuid import UUID
 
 from app.models.vacation_settings import VacationSettings
 from app.schemas.vacation import VacationSettingsCreate, VacationSettingsUpdate
+from app.crud.user import bump_data_version
 
 
 def _to_uuid(value: Union[str, UUID]) -> UUID:
@@ -78,6 +79,7 @@ def create(
         **settings_in.model_dump(),
     )
     db.add(settings)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(settings)
     return settings
@@ -98,6 +100,7 @@ def update(
     update_data = settings_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(settings, field, value)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(settings)
     return settings
@@ -112,5 +115,6 @@ def delete(db: Session, user_id: Union[str, UUID]) -> bool:
     if settings is None:
         return False
     db.delete(settings)
+    bump_data_version(db, user_id)
     db.commit()
     return True
@@ -1,6 +1,8 @@
 """
 SQLAlchemy database and session configuration
 """
+import anyio
+from fastapi import Depends
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -10,8 +12,9 @@ from .config import settings
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Check connection before using it
-    pool_size=10,  # Number of connections in the pool
-    max_overflow=20  # Extra connections if needed
+    pool_size=settings.DB_POOL_SIZE,  # Number of connections in the pool
+    max_overflow=settings.DB_MAX_OVERFLOW,  # Extra connections if needed
+    pool_timeout=settings.DB_POOL_TIMEOUT
 )
 
 # Session factory
@@ -21,11 +24,31 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+# Requests holding a session at once, per process: at most the connections
+# the pool can open, so a session never waits in pool checkout. A request
+# keeps its connection between the threadpool calls of its dependencies
+# and endpoint, so the bound must be per request, not per worker thread.
+db_slots = anyio.Semaphore(settings.db_session_slots)
+
+
+async def db_slot():
+    """
+    Dependency that waits (on the event loop, without holding a worker
+    thread) for one of the db_session_slots before a session is opened.
+    """
+    async with db_slots:
+        yield
+
+
 # Dependency to get database session
-def get_db():
+def get_db(_slot: None = Depends(db_slot)):
     """
     Dependency that provides database session
     Automatically closes after use
+
+    Sessions are synchronous: endpoints and dependencies that use them are
+    declared with plain `def` so FastAPI runs them in the worker thread
+    pool instead of blocking the event loop.
     """
     db = SessionLocal()
     try:
@@ -11,29 +11,29 @@ from jose import JWTError, jwt
 from app.database import get_db
 from app.config import settings
 from app.models.user import User
+from app.schemas.user import UserPrincipal
+from app.crud.user import get_user_principal
 
 # OAuth2PasswordBearer - points to the login endpoint
 # This allows Swagger to display the built-in login form
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Dependency to get the current authenticated user.
-    Verifies JWT token and returns User object.
-
-    Raises:
-    HTTPException 401 if invalid token or user not found
-    """
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def _decode_user_id(token: str) -> str:
+    """
+    Decode the JWT token and return the user id stored in 'sub'.
+
+    Raises:
+    HTTPException 401 if the token is invalid or has no subject
+    """
     try:
         # Decode token
         payload = jwt.decode(
@@ -44,16 +44,68 @@ async def get_current_user(
         user_id: str = payload.get("sub")
         
         if user_id is None:
-            raise credentials_exception
+            raise _credentials_exception()
             
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    
+    return user_id
+
+
+def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> UserPrincipal:
+    """
+    Dependency to get the current authenticated principal.
+    Verifies JWT token and returns only id, email, is_active and
+    data_version.
+
+    This is the dependency used by resource endpoints: it selects four
+    columns and never loads the user's relationships.
+
+    Raises:
+    HTTPException 401 if invalid token or user not found
+    HTTPException 403 if the user is inactive
+    """
+    user_id = _decode_user_id(token)
+    
+    # Retrieve principal from database (columns only)
+    principal = get_user_principal(db, user_id)
+    
+    if principal is None:
+        raise _credentials_exception()
+    
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+    
+    return principal
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to get the current authenticated user.
+    Verifies JWT token and returns User object.
+
+    Use only where the full profile is needed (e.g. /auth/me);
+    other endpoints should depend on get_current_principal.
+
+    Raises:
+    HTTPException 401 if invalid token or user not found
+    """
+    user_id = _decode_user_id(token)
     
     # Retrieve user from database
     user = db.query(User).filter(User.id == user_id).first()
     
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     if not user.is_active:
         raise HTTPException(
@@ -75,4 +127,4 @@ async def get_current_active_user(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail="Inactive user"
         )
-    return current_user
\ No newline at end of file
+    return current_user
@@ -5,9 +5,14 @@ Entry point of the Budget App API
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import anyio.to_thread
 
 from app.config import settings
 from app.database import engine, Base
+from app.utils.security import shutdown_hash_executor
+from app.utils.cache import cache_stats, get_cache
+from app.utils.compression import CompressionMiddleware, supported_encodings
+from app.utils.serialization import FastJSONResponse
 from app.routers.auth import router as auth_router
 from app.routers.accounts import router as accounts_router
 from app.routers.categories import router as categories_router
@@ -29,6 +34,20 @@ async def lifespan(app: FastAPI):
     print(f"🔒 Debug mode: {settings.DEBUG}")
     print(f"✅ CORS Origins: {settings.cors_origins}")
     
+    # Sync endpoints run in the AnyIO thread pool. DB requests are bounded
+    # separately, per request (app.database.db_slots), not by thread count
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = settings.threadpool_workers
+    print(
+        f"🧵 Worker threads: {limiter.total_tokens}, DB requests: {settings.db_session_slots} "
+        f"(DB pool: {settings.DB_POOL_SIZE}+{settings.DB_MAX_OVERFLOW})"
+    )
+    print(f"🗜️  Compression: {', '.join(supported_encodings())} (≥ {settings.COMPRESSION_MINIMUM_SIZE} bytes)")
+    
+    # Build the response cache now so a misconfigured backend fails at startup
+    if settings.CACHE_ENABLED:
+        print(f"🗄️  Response cache: {get_cache().name} (TTL {settings.CACHE_TTL_SECONDS}s)")
+    
     # In development, create tables if they don't exist
     if settings.DEBUG:
         print("⚠️  DEBUG MODE: Auto-creating tables if not exist...")
@@ -38,6 +57,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("👋 Shutting down Budget App API...")
+    shutdown_hash_executor()
 
 
 # Inizializza FastAPI app
@@ -61,7 +81,9 @@ app = FastAPI(
     Il token JWT verrà automaticamente incluso in tutte le richieste successive.
     """,
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson rendering with native Decimal/date/UUID handling
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -71,6 +93,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients read the validators of conditional GETs
+    expose_headers=["ETag", "X-Cache"],
+)
+
+# Negotiated brotli/gzip for large bodies (analytics, lists, exports)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
 )
 
 # Include routers
@@ -109,6 +141,15 @@ async def health_check():
     }
 
 
+@app.get("/health/cache", tags=["Health"])
+async def cache_health():
+    """
+    Response cache metrics of this worker: hit/miss counters per endpoint
+    and backend statistics (entries, bytes, evictions).
+    """
+    return cache_stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
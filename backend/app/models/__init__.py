@@ -6,6 +6,7 @@ from app.models.user import User
 from app.models.account import Account
 from app.models.category import Category
 from app.models.transaction import Transaction
+from app.models.monthly_total import MonthlyTotal
 from app.models.transfer import Transfer
 from app.models.custom_chart import CustomChart
 from app.models.vacation_settings import VacationSettings
@@ -19,6 +20,7 @@ __all__ = [
     "Account",
     "Category",
     "Transaction",
+    "MonthlyTotal",
     "Transfer",
     "CustomChart",
     "VacationSettings",
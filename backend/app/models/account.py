@@ -88,13 +88,17 @@ class Account(Base):
     )
     
     # Relationships
+    # Collections are never eager-loaded by default: callers pick a loader
+    # profile in app.crud.account (header / recent activity / full ledger).
+    # Deletes rely on the ON DELETE CASCADE foreign keys (passive_deletes).
     user: Mapped["User"] = relationship("User", back_populates="accounts")
     
     transactions: Mapped[List["Transaction"]] = relationship(
         "Transaction",
         back_populates="account",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy="select"
     )
     
     transfers_from: Mapped[List["Transfer"]] = relationship(
@@ -102,7 +106,8 @@ class Account(Base):
         foreign_keys="Transfer.from_account_id",
         back_populates="from_account",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy="select"
     )
     
     transfers_to: Mapped[List["Transfer"]] = relationship(
@@ -110,7 +115,8 @@ class Account(Base):
         foreign_keys="Transfer.to_account_id",
         back_populates="to_account",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy="select"
     )
     
     # Indexes
@@ -70,26 +70,29 @@ class Category(Base):
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="categories")
     
-    # Self-referential relationship for subcategories
+    # Self-referential relationship for subcategories.
+    # Loaded on access only: the tree endpoints are assembled from a flat
+    # column query (see crud.category.get_categories_tree), so loading a
+    # category must never pull its children or transactions implicitly.
     parent: Mapped[Optional["Category"]] = relationship(
         "Category",
         remote_side=[id],
         back_populates="subcategories",
-        lazy="selectin"
+        lazy="select"
     )
     
     subcategories: Mapped[List["Category"]] = relationship(
         "Category",
         back_populates="parent",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
     
     transactions: Mapped[List["Transaction"]] = relationship(
         "Transaction",
         back_populates="category",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
     
     # Indexes
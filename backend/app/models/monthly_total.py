@@ -0,0 +1,55 @@
+"""
+Monthly Total model - Pre-aggregated transaction totals.
+
+One row per (user, month, account, category, type) with the sum and count
+of the matching transactions. Maintained incrementally by the transaction
+CRUD in the same DB transaction as the write, and rebuilt from
+`transactions` by rebuild_monthly_totals.py for backfill and drift repair.
+"""
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import String, Date, Numeric, Integer, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+import uuid as uuid_lib
+
+
+class MonthlyTotal(Base):
+    """Sum and count of a user's transactions per month, account, category and type."""
+
+    __tablename__ = "transaction_monthly_totals"
+
+    # Aggregation key (composite primary key, target of the upserts).
+    # Deleting a user, account or category removes its rows together with
+    # its transactions.
+    user_id: Mapped[uuid_lib.UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # First day of the month
+    account_id: Mapped[uuid_lib.UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("accounts.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    category_id: Mapped[uuid_lib.UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    type: Mapped[str] = mapped_column(String(20), primary_key=True)  # income, expense_necessity or expense_extra
+
+    # Aggregates
+    total: Mapped[Decimal] = mapped_column(Numeric(15, 2), nullable=False, default=Decimal("0.00"))
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Indexes
+    __table_args__ = (
+        Index('ix_transaction_monthly_totals_account', 'account_id'),
+        Index('ix_transaction_monthly_totals_category', 'category_id'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<MonthlyTotal(month={self.month}, type={self.type}, total={self.total}, count={self.count})>"
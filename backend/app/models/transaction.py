@@ -5,7 +5,8 @@ Transaction database model.
 from datetime import datetime, date
 from decimal import Decimal
 from typing import Optional, TYPE_CHECKING
-from sqlalchemy import String, DateTime, Date, Numeric, Boolean, ForeignKey, Index, ARRAY
+from sqlalchemy import String, DateTime, Date, Numeric, Boolean, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
@@ -17,6 +18,16 @@ if TYPE_CHECKING:
     from app.models.category import Category
 
 
+# Text search configurations indexed in Transaction.search_vector
+SEARCH_CONFIGS = ("italian", "english")
+
+SEARCH_VECTOR_SQL = " || ".join(
+    f"setweight(to_tsvector('{config}', coalesce({column}, '')), '{weight}')"
+    for config in SEARCH_CONFIGS
+    for column, weight in (("description", "A"), ("notes", "B"))
+)
+
+
 class Transaction(Base):
     """Transaction model for income and expense tracking."""
     
@@ -65,6 +76,14 @@ class Transaction(Base):
     # Recurring Transaction Settings
     is_recurring: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     recurring_frequency: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # daily, weekly, monthly, yearly
+    # Recurring templates: first occurrence not materialized yet
+    next_occurrence_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    # Materialized occurrences: the template they were generated from
+    recurring_parent_id: Mapped[Optional[uuid_lib.UUID]] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("transactions.id", ondelete="SET NULL"),
+        nullable=True
+    )
     
     # Tags for filtering and organization
     tags: Mapped[Optional[list[str]]] = mapped_column(
@@ -72,6 +91,17 @@ class Transaction(Base):
         nullable=True
     )
     
+    # Full-text search document, maintained by Postgres (generated column).
+    # Description weighs more than notes; both Italian and English stems are
+    # indexed so either language's word forms match. Deferred: never loaded
+    # with the row, only used in WHERE/ORDER BY.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True,
+        deferred=True
+    )
+    
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
@@ -93,10 +123,25 @@ class Transaction(Base):
     # Indexes
     __table_args__ = (
         Index('ix_transactions_user_date', 'user_id', 'date'),
+        # Ledger order for keyset pagination (date DESC, created_at DESC, id DESC)
+        Index(
+            'ix_transactions_user_date_created_id',
+            'user_id', date.desc(), created_at.desc(), id.desc()
+        ),
         Index('ix_transactions_user_type', 'user_id', 'type'),
         Index('ix_transactions_account_date', 'account_id', 'date'),
         Index('ix_transactions_category', 'category_id'),
         Index('ix_transactions_user_recurring', 'user_id', 'is_recurring'),
+        # Occurrence key: one occurrence per template and date (idempotent materialization)
+        Index('uq_transactions_recurring_occurrence', 'recurring_parent_id', 'date', unique=True),
+        # Templates due for materialization
+        Index(
+            'ix_transactions_recurring_due',
+            'next_occurrence_date', 'id',
+            postgresql_where=next_occurrence_date.isnot(None)
+        ),
+        Index('ix_transactions_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_transactions_tags', 'tags', postgresql_using='gin'),
     )
     
     def __repr__(self) -> str:
@@ -4,7 +4,7 @@ User database model.
 
 from datetime import datetime
 from typing import List, Optional, TYPE_CHECKING
-from sqlalchemy import String, Boolean, DateTime, Index
+from sqlalchemy import BigInteger, String, Boolean, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
@@ -36,6 +36,16 @@ class User(Base):
     # Status
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     
+    # Incremented by every write to the user's accounts, categories,
+    # transactions, transfers, budgets and vacation data (response cache
+    # key and ETag validator)
+    data_version: Mapped[int] = mapped_column(
+        BigInteger,
+        default=0,
+        server_default="0",
+        nullable=False
+    )
+    
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
@@ -50,39 +60,42 @@ class User(Base):
     )
     
     # Relationships
+    # Collections are loaded on access only: authentication reads a slim
+    # principal (see app.dependencies.get_current_principal) and endpoints
+    # that need related rows query them explicitly through the CRUD layer.
     accounts: Mapped[List["Account"]] = relationship(
         "Account",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
     
     categories: Mapped[List["Category"]] = relationship(
         "Category",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
     
     transactions: Mapped[List["Transaction"]] = relationship(
         "Transaction",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
     
     transfers: Mapped[List["Transfer"]] = relationship(
         "Transfer",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
 
     custom_charts: Mapped[List["CustomChart"]] = relationship(
         "CustomChart",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
 
     # Vacation relationships
@@ -91,28 +104,28 @@ class User(Base):
         back_populates="user",
         uselist=False,  # one-to-one
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
 
     vacation_entries: Mapped[List["VacationEntry"]] = relationship(
         "VacationEntry",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
 
     user_holidays: Mapped[List["UserHoliday"]] = relationship(
         "UserHoliday",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
 
     budgets: Mapped[List["Budget"]] = relationship(
         "Budget",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
 
     # Indexes
@@ -6,22 +6,29 @@ Balance Strategy:
 - initial_balance: Set at creation, immutable
 - current_balance: Updated automatically by transactions/transfers
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.database import get_db
-from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse
+from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse, AccountWithActivity
 from app.crud import account as account_crud
-from app.dependencies import get_current_user
-from app.models.user import User
+from app.utils.cache import STATIC_CACHE_CONTROL, cached_endpoint, conditional_get
+from app.dependencies import get_current_principal
+from app.schemas.user import UserPrincipal
 
 router = APIRouter(prefix="/accounts", tags=["Accounts"])
 
 
+def _newest_first(items: list) -> list:
+    """Sort transactions/transfers by date, most recent first."""
+    return sorted(items, key=lambda i: (i.date, i.created_at), reverse=True)
+
+
 @router.get("/", response_model=List[AccountResponse])
-async def get_accounts(
-    current_user: User = Depends(get_current_user),
+@conditional_get("accounts.list")
+def get_accounts(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Maximum number of results"),
@@ -46,15 +53,16 @@ async def get_accounts(
         skip=skip, 
         limit=limit,
         is_active=is_active,
-        account_type=type
+        account_type=type,
+        profile=account_crud.ACCOUNT_PROFILE_HEADER
     )
     return accounts
 
 
 @router.post("/", response_model=AccountResponse, status_code=status.HTTP_201_CREATED)
-async def create_account(
+def create_account(
     account: AccountCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -79,8 +87,9 @@ async def create_account(
 
 
 @router.get("/summary")
-async def get_accounts_summary(
-    current_user: User = Depends(get_current_user),
+@cached_endpoint("accounts.summary")
+def get_accounts_summary(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -150,12 +159,13 @@ async def get_accounts_summary(
 
 
 @router.get("/types")
-async def get_account_types():
+async def get_account_types(response: Response):
     """
     Get all available account types.
     
     Useful for populating dropdowns in frontend.
     """
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
     return [
         {"value": "checking", "label": "Checking Account", "category": "liquid"},
         {"value": "savings", "label": "Savings Account", "category": "liquid"},
@@ -168,8 +178,8 @@ async def get_account_types():
 
 
 @router.get("/verify-balances")
-async def verify_account_balances(
-    current_user: User = Depends(get_current_user),
+def verify_account_balances(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -188,9 +198,9 @@ async def verify_account_balances(
 
 
 @router.post("/{account_id}/fix-balance", response_model=AccountResponse)
-async def fix_account_balance(
+def fix_account_balance(
     account_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -214,9 +224,9 @@ async def fix_account_balance(
 
 
 @router.get("/{account_id}", response_model=AccountResponse)
-async def get_account(
+def get_account(
     account_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -229,7 +239,8 @@ async def get_account(
     account = account_crud.get_account(
         db, 
         account_id=account_id, 
-        user_id=str(current_user.id)
+        user_id=str(current_user.id),
+        profile=account_crud.ACCOUNT_PROFILE_HEADER
     )
     
     if not account:
@@ -241,11 +252,46 @@ async def get_account(
     return account
 
 
+@router.get("/{account_id}/activity", response_model=AccountWithActivity)
+def get_account_activity(
+    account_id: str,
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    days: int = Query(account_crud.RECENT_ACTIVITY_DAYS, ge=1, le=366, description="Activity window in days")
+):
+    """
+    Get an account together with its recent transactions and transfers.
+    
+    Only movements dated within the last `days` days are loaded.
+    """
+    account = account_crud.get_account(
+        db,
+        account_id=account_id,
+        user_id=str(current_user.id),
+        profile=account_crud.ACCOUNT_PROFILE_RECENT,
+        recent_days=days
+    )
+    
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found"
+        )
+    
+    return {
+        **AccountResponse.model_validate(account).model_dump(),
+        "activity_days": days,
+        "transactions": _newest_first(account.transactions),
+        "transfers_from": _newest_first(account.transfers_from),
+        "transfers_to": _newest_first(account.transfers_to),
+    }
+
+
 @router.put("/{account_id}", response_model=AccountResponse)
-async def update_account(
+def update_account(
     account_id: str,
     account_update: AccountUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -272,9 +318,9 @@ async def update_account(
 
 
 @router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_account(
+def delete_account(
     account_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -298,9 +344,9 @@ async def delete_account(
 
 
 @router.post("/{account_id}/deactivate", response_model=AccountResponse)
-async def deactivate_account(
+def deactivate_account(
     account_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
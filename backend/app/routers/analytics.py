@@ -2,22 +2,24 @@
 Analytics Router
 Statistics and data dashboard for Budget App
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models.user import User
+from app.dependencies import get_current_principal
+from app.schemas.user import UserPrincipal
 from app.crud import analytics as analytics_crud
+from app.utils.cache import cached_endpoint
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
 @router.get("/summary")
-async def get_summary(
-    current_user: User = Depends(get_current_user),
+@cached_endpoint("analytics.summary")
+def get_summary(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     start_date: Optional[date] = Query(None, description="Data inizio periodo (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="Data fine periodo (YYYY-MM-DD)"),
@@ -50,8 +52,9 @@ async def get_summary(
 
 
 @router.get("/monthly-trend")
-async def get_monthly_trend(
-    current_user: User = Depends(get_current_user),
+@cached_endpoint("analytics.monthly_trend")
+def get_monthly_trend(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     months: int = Query(12, ge=1, le=24, description="Numero di mesi da analizzare"),
     account_id: Optional[str] = Query(None, description="Filtra per account specifico")
@@ -80,18 +83,24 @@ async def get_monthly_trend(
 
 
 @router.get("/by-category")
-async def get_totals_by_category(
-    current_user: User = Depends(get_current_user),
+@cached_endpoint("analytics.by_category")
+def get_totals_by_category(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     start_date: Optional[date] = Query(None, description="Data inizio periodo"),
     end_date: Optional[date] = Query(None, description="Data fine periodo"),
-    transaction_type: Optional[str] = Query(None, description="Filtra per tipo: income, expense_necessity, expense_extra")
+    transaction_type: Optional[str] = Query(None, description="Filtra per tipo: income, expense_necessity, expense_extra"),
+    rollup: bool = Query(False, description="Se true, le categorie padre includono i totali delle sottocategorie")
 ):
     """
     Returns totals grouped by category.
 
     Useful for pie charts and category analysis.
 
+    - **rollup**: If true, totals are aggregated up the category hierarchy.
+      Every category with activity is returned with `parent_id` and
+      `own_total`; filter on `parent_id = null` for a parent-level chart.
+
     **Answer:** List sorted by descending total with category details.
     """
     return analytics_crud.calculate_totals_by_category(
@@ -99,13 +108,15 @@ async def get_totals_by_category(
         user_id=str(current_user.id),
         start_date=start_date,
         end_date=end_date,
-        transaction_type=transaction_type
+        transaction_type=transaction_type,
+        rollup=rollup
     )
 
 
 @router.get("/by-account")
-async def get_totals_by_account(
-    current_user: User = Depends(get_current_user),
+@cached_endpoint("analytics.by_account")
+def get_totals_by_account(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     start_date: Optional[date] = Query(None, description="Data inizio periodo"),
     end_date: Optional[date] = Query(None, description="Data fine periodo")
@@ -128,8 +139,9 @@ async def get_totals_by_account(
 
 
 @router.get("/daily-breakdown")
-async def get_daily_breakdown(
-    current_user: User = Depends(get_current_user),
+@cached_endpoint("analytics.daily_breakdown")
+def get_daily_breakdown(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     start_date: Optional[date] = Query(None, description="Data inizio (default: 30 giorni fa)"),
     end_date: Optional[date] = Query(None, description="Data fine (default: oggi)"),
@@ -149,9 +161,48 @@ async def get_daily_breakdown(
     )
 
 
+@router.get("/balance-history")
+@cached_endpoint("analytics.balance_history")
+def get_balance_history(
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    start_date: Optional[date] = Query(None, description="Data inizio (default: un anno fa)"),
+    end_date: Optional[date] = Query(None, description="Data fine (default: oggi)"),
+    granularity: str = Query("day", description="Granularità: day, week (da lunedì) o month"),
+    account_id: Optional[str] = Query(None, description="Filtra per account"),
+    include_inactive: bool = Query(False, description="Includi gli account disattivati")
+):
+    """
+    Returns the balance of each account and the net worth over time.
+
+    Balances are rebuilt from `initial_balance`, transactions and transfers
+    (fees and exchange rates included). Each point is the balance at the
+    end of its day, week or month (`date`); `balances` is keyed by
+    account id and `net_worth` is their sum.
+
+    Useful for net worth / balance line charts.
+    """
+    try:
+        return analytics_crud.calculate_balance_history(
+            db=db,
+            user_id=str(current_user.id),
+            start_date=start_date,
+            end_date=end_date,
+            granularity=granularity,
+            account_id=account_id,
+            include_inactive=include_inactive
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.get("/year-comparison")
-async def get_year_comparison(
-    current_user: User = Depends(get_current_user),
+@cached_endpoint("analytics.year_comparison")
+def get_year_comparison(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     year1: int = Query(..., description="Primo anno da confrontare"),
     year2: int = Query(..., description="Secondo anno da confrontare")
@@ -166,4 +217,48 @@ async def get_year_comparison(
         user_id=str(current_user.id),
         year1=year1,
         year2=year2
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/multi-year-comparison")
+@cached_endpoint("analytics.multi_year_comparison")
+def get_multi_year_comparison(
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    years: Optional[List[int]] = Query(None, description="Anni da confrontare (ripetibile: ?years=2023&years=2024)"),
+    last_n: Optional[int] = Query(
+        None, ge=1, le=analytics_crud.MAX_COMPARISON_YEARS,
+        description="In alternativa: ultimi N anni fino all'anno corrente"
+    )
+):
+    """
+    Compare several years month by month.
+
+    - **years**: Explicit list of years
+    - **last_n**: Rolling window of the last N years (current year included)
+
+    Exactly one of the two must be provided. For each month and year the
+    response has income, expenses, net and counts, plus year-over-year
+    deltas against the previous year in the list.
+    """
+    if (years is None) == (last_n is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either years or last_n"
+        )
+    
+    if last_n is not None:
+        current_year = date.today().year
+        years = list(range(current_year - last_n + 1, current_year + 1))
+    
+    try:
+        return analytics_crud.calculate_multi_year_comparison(
+            db=db,
+            user_id=str(current_user.id),
+            years=years
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
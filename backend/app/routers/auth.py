@@ -3,20 +3,80 @@ Authentication Router
 Endpoints for registration, login and profile management
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
+from typing import Optional
 
 from app.database import get_db
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
-from app.crud.user import get_user_by_email, create_user, authenticate_user, get_user_by_id
-from app.utils.security import create_access_token
+from app.crud.user import get_user_by_email, create_user, update_password_hash
+from app.utils.security import (
+    create_access_token,
+    hash_password_async,
+    verify_and_update_password_async,
+    HashingBusyError,
+)
 from app.config import settings
 from app.dependencies import get_current_user
 from app.models.user import User
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Auth endpoints stay async: DB calls go to the worker thread pool and
+# bcrypt runs on the dedicated hashing executor (app.utils.security), so a
+# login burst queues there instead of starving the other endpoints.
+
+
+def _hashing_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _authenticate(db: Session, email: str, password: str) -> Optional[User]:
+    """
+    Authenticate by email and password, rehashing the stored password if
+    its cost factor differs from PASSWORD_HASH_ROUNDS.
+
+    Raises:
+    HTTPException 503 if the hashing queue is full
+    """
+    user = await run_in_threadpool(get_user_by_email, db, email)
+    
+    if not user or not user.is_active:
+        return None
+    
+    try:
+        valid, new_hash = await verify_and_update_password_async(password, user.password_hash)
+    except HashingBusyError:
+        raise _hashing_busy_exception()
+    
+    if not valid:
+        return None
+    
+    if new_hash:
+        await run_in_threadpool(update_password_hash, db, user.id, new_hash)
+    
+    return user
+
+
+def _token_response(user: User) -> dict:
+    """Build the bearer token payload for an authenticated user."""
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": str(user.id)},
+        expires_delta=access_token_expires
+    )
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer"
+    }
+
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
@@ -31,16 +91,21 @@ async def register(
     - **full_name**: Full name
     """
     # Check if user already exists
-    existing_user = get_user_by_email(db, user_data.email)
+    existing_user = await run_in_threadpool(get_user_by_email, db, user_data.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
+    try:
+        password_hash = await hash_password_async(user_data.password)
+    except HashingBusyError:
+        raise _hashing_busy_exception()
+    
     # Create user
     try:
-        user = create_user(db, user_data)
+        user = await run_in_threadpool(create_user, db, user_data, password_hash)
         return user
     except ValueError as e:
         raise HTTPException(
@@ -68,7 +133,7 @@ async def login(
     After logging in, the token will be automatically used for subsequent requests.
     """
     # Authenticate user (form_data.username contiene l'email)
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await _authenticate(db, form_data.username, form_data.password)
     
     if not user:
         raise HTTPException(
@@ -77,17 +142,7 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=access_token_expires
-    )
-    
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    return _token_response(user)
 
 
 @router.post("/login/json", response_model=Token)
@@ -101,7 +156,7 @@ async def login_json(
     Use this endpoint if you prefer to send JSON instead of form data.
     """
     # Authenticate user
-    user = authenticate_user(db, user_data.email, user_data.password)
+    user = await _authenticate(db, user_data.email, user_data.password)
     
     if not user:
         raise HTTPException(
@@ -110,21 +165,11 @@ async def login_json(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=access_token_expires
-    )
-    
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    return _token_response(user)
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
+def get_current_user_info(
     current_user: User = Depends(get_current_user)
 ):
     """
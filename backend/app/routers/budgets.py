@@ -14,15 +14,16 @@ from app.schemas.budget import (
     BudgetSummaryResponse
 )
 from app.crud import budget as budget_crud
-from app.dependencies import get_current_user
-from app.models.user import User
+from app.utils.cache import cached_endpoint, conditional_get
+from app.dependencies import get_current_principal
+from app.schemas.user import UserPrincipal
 
 router = APIRouter(prefix="/budgets", tags=["Budgets"])
 
 
 @router.get("/", response_model=List[BudgetResponse])
-async def get_budgets(
-    current_user: User = Depends(get_current_user),
+def get_budgets(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=500, description="Maximum results"),
@@ -48,8 +49,10 @@ async def get_budgets(
 
 
 @router.get("/summary", response_model=BudgetSummaryResponse)
-async def get_budgets_summary(
-    current_user: User = Depends(get_current_user),
+@conditional_get("budgets.summary")
+@cached_endpoint("budgets.summary", response_model=BudgetSummaryResponse)
+def get_budgets_summary(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     year: Optional[int] = Query(None, description="Target year (default: current)"),
     month: Optional[int] = Query(None, ge=1, le=12, description="Target month (default: current)")
@@ -73,9 +76,9 @@ async def get_budgets_summary(
 
 
 @router.get("/{budget_id}", response_model=BudgetResponse)
-async def get_budget(
+def get_budget(
     budget_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -96,9 +99,9 @@ async def get_budget(
 
 
 @router.post("/", response_model=BudgetResponse, status_code=status.HTTP_201_CREATED)
-async def create_budget(
+def create_budget(
     budget: BudgetCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -128,10 +131,10 @@ async def create_budget(
 
 
 @router.put("/{budget_id}", response_model=BudgetResponse)
-async def update_budget(
+def update_budget(
     budget_id: str,
     budget_update: BudgetUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -158,9 +161,9 @@ async def update_budget(
 
 
 @router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_budget(
+def delete_budget(
     budget_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -16,15 +16,17 @@ from app.schemas.category import (
     VALID_CATEGORY_TYPES
 )
 from app.crud import category as category_crud
-from app.dependencies import get_current_user
-from app.models.user import User
+from app.crud import user as user_crud
+from app.utils.cache import conditional_get
+from app.dependencies import get_current_principal
+from app.schemas.user import UserPrincipal
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
 
 @router.get("/", response_model=List[CategoryResponse])
-async def get_categories(
-    current_user: User = Depends(get_current_user),
+def get_categories(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0, description="Numero di record da saltare"),
     limit: int = Query(100, ge=1, le=500, description="Numero massimo di risultati"),
@@ -64,13 +66,17 @@ async def get_categories(
 
 
 @router.get("/tree", response_model=CategoryTreeResponse)
-async def get_categories_tree(
-    current_user: User = Depends(get_current_user),
+@conditional_get("categories.tree")
+def get_categories_tree(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
-    is_active: Optional[bool] = Query(True, description="Filtra per stato attivo/inattivo")
+    is_active: Optional[bool] = Query(True, description="Filtra per stato attivo/inattivo"),
+    include_counts: bool = Query(False, description="Se true, include il numero di transazioni per categoria")
 ):
     """
     Returns categories organized in a tree by macro category.    
+
+    - **include_counts**: If true, each category carries its `transaction_count`
     
     Response structure:
     ```json
@@ -93,14 +99,15 @@ async def get_categories_tree(
     tree = category_crud.get_categories_tree(
         db,
         user_id=str(current_user.id),
-        is_active=is_active
+        is_active=is_active,
+        include_counts=include_counts
     )
     return tree
 
 
 @router.get("/statistics")
-async def get_categories_statistics(
-    current_user: User = Depends(get_current_user),
+def get_categories_statistics(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -120,9 +127,9 @@ async def get_categories_statistics(
 
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
-async def create_category(
+def create_category(
     category: CategoryCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -172,18 +179,22 @@ async def create_category(
 
 
 @router.get("/{category_id}", response_model=CategoryWithSubcategories)
-async def get_category(
+def get_category(
     category_id: str,
-    current_user: User = Depends(get_current_user),
+    include_counts: bool = Query(False, description="Se true, include il numero di transazioni per categoria"),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve details of a single category with its subcategories.
+
+    - **include_counts**: If true, the category and its subcategories carry `transaction_count`
     """
-    category = category_crud.get_category(
+    category = category_crud.get_category_with_subcategories(
         db,
         category_id=category_id,
-        user_id=str(current_user.id)
+        user_id=str(current_user.id),
+        include_counts=include_counts
     )
     
     if not category:
@@ -196,10 +207,10 @@ async def get_category(
 
 
 @router.put("/{category_id}", response_model=CategoryResponse)
-async def update_category(
+def update_category(
     category_id: str,
     category_update: CategoryUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -256,10 +267,10 @@ async def update_category(
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_category(
+def delete_category(
     category_id: str,
     force: bool = Query(False, description="Se true, elimina anche se ha transazioni associate"),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -281,11 +292,7 @@ async def delete_category(
         )
     
     # Check if there are associated transactions (including subcategories)
-    has_transactions = len(category.transactions) > 0
-    for sub in category.subcategories:
-        if len(sub.transactions) > 0:
-            has_transactions = True
-            break
+    has_transactions = category_crud.category_has_transactions(db, category.id)
     
     if has_transactions and not force:
         raise HTTPException(
@@ -309,10 +316,10 @@ async def delete_category(
 
 
 @router.post("/{category_id}/deactivate", response_model=CategoryResponse)
-async def deactivate_category(
+def deactivate_category(
     category_id: str,
     include_subcategories: bool = Query(True, description="Se true, disattiva anche le sottocategorie"),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -345,8 +352,8 @@ async def deactivate_category(
 
 
 @router.post("/seed-defaults", response_model=List[CategoryResponse])
-async def seed_default_categories(
-    current_user: User = Depends(get_current_user),
+def seed_default_categories(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -374,9 +381,9 @@ async def seed_default_categories(
 
 
 @router.delete("/all", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_all_categories(
+def delete_all_categories(
     confirm: bool = Query(..., description="Conferma eliminazione (deve essere true)"),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -401,18 +408,19 @@ async def delete_all_categories(
     )
     
     # Check if any category has transactions
-    for cat in all_categories:
-        if len(cat.transactions) > 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot delete all categories: '{cat.name}' has transactions associated. Delete transactions first."
-            )
+    cat = category_crud.get_first_category_with_transactions(db, str(current_user.id))
+    if cat is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot delete all categories: '{cat.name}' has transactions associated. Delete transactions first."
+        )
     
     # Delete all (subcategories are automatically deleted by cascade)
     for cat in all_categories:
         if cat.parent_id is None:  # Main categories only
             db.delete(cat)
     
+    user_crud.bump_data_version(db, current_user.id)
     db.commit()
     
     return None
\ No newline at end of file
@@ -9,15 +9,15 @@ from typing import List
 from app.database import get_db
 from app.schemas.custom_chart import CustomChartCreate, CustomChartUpdate, CustomChartResponse
 from app.crud import custom_chart as custom_chart_crud
-from app.dependencies import get_current_user
-from app.models.user import User
+from app.dependencies import get_current_principal
+from app.schemas.user import UserPrincipal
 
 router = APIRouter(prefix="/custom-charts", tags=["Custom Charts"])
 
 
 @router.get("/", response_model=List[CustomChartResponse])
-async def get_custom_charts(
-    current_user: User = Depends(get_current_user),
+def get_custom_charts(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0, description="Numero di record da saltare"),
     limit: int = Query(100, ge=1, le=100, description="Numero massimo di risultati")
@@ -38,9 +38,9 @@ async def get_custom_charts(
 
 
 @router.post("/", response_model=CustomChartResponse, status_code=status.HTTP_201_CREATED)
-async def create_custom_chart(
+def create_custom_chart(
     chart: CustomChartCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -78,9 +78,9 @@ async def create_custom_chart(
 
 
 @router.get("/{chart_id}", response_model=CustomChartResponse)
-async def get_custom_chart(
+def get_custom_chart(
     chart_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -102,10 +102,10 @@ async def get_custom_chart(
 
 
 @router.put("/{chart_id}", response_model=CustomChartResponse)
-async def update_custom_chart(
+def update_custom_chart(
     chart_id: str,
     chart_update: CustomChartUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -130,9 +130,9 @@ async def update_custom_chart(
 
 
 @router.delete("/{chart_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_custom_chart(
+def delete_custom_chart(
     chart_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -2,7 +2,8 @@
 Transactions Router
 User transaction management (income and expenditure)
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from decimal import Decimal
@@ -15,20 +16,30 @@ from app.schemas.transaction import (
     TransactionResponse,
     TransactionWithDetails,
     TransactionSummary,
+    TransactionPage,
+    TagFacet,
+    TransactionImportResult,
+    TransactionBatch,
+    TransactionBatchResult,
     VALID_TRANSACTION_TYPES
 )
 from app.crud import transaction as transaction_crud
 from app.crud import account as account_crud
 from app.crud import category as category_crud
-from app.dependencies import get_current_user
-from app.models.user import User
+from app.utils.transaction_import import detect_import_format, iter_import_rows
+from app.utils import export as export_utils
+from app.utils.cache import conditional_get
+from app.utils.projection import parse_fields, projection_response, rows_as_dicts
+from app.dependencies import get_current_principal
+from app.schemas.user import UserPrincipal
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
 
 @router.get("/", response_model=List[TransactionResponse])
-async def get_transactions(
-    current_user: User = Depends(get_current_user),
+@conditional_get("transactions.list")
+def get_transactions(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0, description="Numero di record da saltare"),
     limit: int = Query(100, ge=1, le=500, description="Numero massimo di risultati"),
@@ -39,7 +50,17 @@ async def get_transactions(
     end_date: Optional[date] = Query(None, description="Data fine periodo (YYYY-MM-DD)"),
     min_amount: Optional[Decimal] = Query(None, ge=0, description="Importo minimo"),
     max_amount: Optional[Decimal] = Query(None, ge=0, description="Importo massimo"),
-    search: Optional[str] = Query(None, description="Cerca in descrizione e note")
+    search: Optional[str] = Query(None, description="Cerca in descrizione e note"),
+    search_mode: str = Query(
+        transaction_crud.SEARCH_MODE_SUBSTRING,
+        description="Modalità di ricerca: substring (contiene) o fulltext (indicizzata, ordinata per rilevanza)"
+    ),
+    tags: Optional[List[str]] = Query(None, description="Filtra per tag (ripetibile: ?tags=a&tags=b)"),
+    tag_match: str = Query(
+        transaction_crud.TAG_MATCH_ANY,
+        description="Corrispondenza tag: any (almeno uno) o all (tutti)"
+    ),
+    fields: Optional[str] = Query(None, description="Campi da restituire, separati da virgola (es. id,date,amount)")
 ):
     """
     List all user transactions with optional filters.
@@ -51,8 +72,16 @@ async def get_transactions(
     - **start_date / end_date**: Filter by period
     - **min_amount / max_amount**: Filter by amount range
     - **search**: Search for text in descriptions and notes
+    - **search_mode**: `substring` (default, matches any part of the text) or
+      `fulltext` (indexed word/prefix match with Italian and English stemming)
+    - **tags**: Filter by tags (repeat the parameter for several tags)
+    - **tag_match**: `any` (default, at least one tag) or `all` (every tag)
 
-    **Sort:** By date descending (newest first)
+    **Sparse fieldsets:** `fields=id,date,amount` returns only those fields
+    (and reads only those columns)
+
+    **Sort:** By date descending (newest first); with `fulltext` search,
+    by relevance first
     """
     # Validate type if provided
     if type is not None and type not in VALID_TRANSACTION_TYPES:
@@ -61,27 +90,255 @@ async def get_transactions(
             detail=f"Invalid type. Must be one of: {', '.join(VALID_TRANSACTION_TYPES)}"
         )
     
-    transactions = transaction_crud.get_transactions(
-        db,
-        user_id=str(current_user.id),
-        skip=skip,
-        limit=limit,
-        account_id=account_id,
-        category_id=category_id,
-        transaction_type=type,
-        start_date=start_date,
-        end_date=end_date,
-        min_amount=min_amount,
-        max_amount=max_amount,
-        search=search
+    try:
+        selected = parse_fields(fields, transaction_crud.LIST_FIELDS)
+        rows = transaction_crud.get_transaction_rows(
+            db,
+            user_id=str(current_user.id),
+            fields=selected,
+            skip=skip,
+            limit=limit,
+            account_id=account_id,
+            category_id=category_id,
+            transaction_type=type,
+            start_date=start_date,
+            end_date=end_date,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            tags=tags,
+            search=search,
+            search_mode=search_mode,
+            tag_match=tag_match
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return projection_response(rows_as_dicts(rows, selected))
+
+
+@router.get("/page", response_model=TransactionPage)
+def get_transactions_page(
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursore restituito dalla pagina precedente (next_cursor)"),
+    limit: int = Query(100, ge=1, le=500, description="Numero massimo di risultati"),
+    account_id: Optional[str] = Query(None, description="Filtra per account"),
+    category_id: Optional[str] = Query(None, description="Filtra per categoria"),
+    type: Optional[str] = Query(None, description="Filtra per tipo: income, expense_necessity, expense_extra"),
+    start_date: Optional[date] = Query(None, description="Data inizio periodo (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Data fine periodo (YYYY-MM-DD)"),
+    min_amount: Optional[Decimal] = Query(None, ge=0, description="Importo minimo"),
+    max_amount: Optional[Decimal] = Query(None, ge=0, description="Importo massimo"),
+    search: Optional[str] = Query(None, description="Cerca in descrizione e note"),
+    search_mode: str = Query(
+        transaction_crud.SEARCH_MODE_SUBSTRING,
+        description="Modalità di ricerca: substring (contiene) o fulltext (indicizzata, ordinata per rilevanza)"
+    ),
+    tags: Optional[List[str]] = Query(None, description="Filtra per tag (ripetibile: ?tags=a&tags=b)"),
+    tag_match: str = Query(
+        transaction_crud.TAG_MATCH_ANY,
+        description="Corrispondenza tag: any (almeno uno) o all (tutti)"
+    )
+):
+    """
+    List transactions with cursor (keyset) pagination.
+
+    Same filters and order as `GET /transactions`. Pass the `next_cursor`
+    of a page as `cursor` to get the following one; it is null on the last
+    page. Page cost does not grow with depth and rows do not shift between
+    pages when new transactions are added.
+    """
+    if type is not None and type not in VALID_TRANSACTION_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid type. Must be one of: {', '.join(VALID_TRANSACTION_TYPES)}"
+        )
+    
+    try:
+        items, next_cursor = transaction_crud.get_transactions_page(
+            db,
+            user_id=str(current_user.id),
+            limit=limit,
+            cursor=cursor,
+            account_id=account_id,
+            category_id=category_id,
+            transaction_type=type,
+            start_date=start_date,
+            end_date=end_date,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            tags=tags,
+            search=search,
+            search_mode=search_mode,
+            tag_match=tag_match
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
+    }
+
+
+@router.get("/tags", response_model=List[TagFacet])
+def get_tag_facets(
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    account_id: Optional[str] = Query(None, description="Filtra per account"),
+    category_id: Optional[str] = Query(None, description="Filtra per categoria"),
+    type: Optional[str] = Query(None, description="Filtra per tipo: income, expense_necessity, expense_extra"),
+    start_date: Optional[date] = Query(None, description="Data inizio periodo (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Data fine periodo (YYYY-MM-DD)"),
+    min_amount: Optional[Decimal] = Query(None, ge=0, description="Importo minimo"),
+    max_amount: Optional[Decimal] = Query(None, ge=0, description="Importo massimo"),
+    search: Optional[str] = Query(None, description="Cerca in descrizione e note"),
+    search_mode: str = Query(
+        transaction_crud.SEARCH_MODE_SUBSTRING,
+        description="Modalità di ricerca: substring (contiene) o fulltext (indicizzata, ordinata per rilevanza)"
+    ),
+    tags: Optional[List[str]] = Query(None, description="Filtra per tag (ripetibile: ?tags=a&tags=b)"),
+    tag_match: str = Query(
+        transaction_crud.TAG_MATCH_ANY,
+        description="Corrispondenza tag: any (almeno uno) o all (tutti)"
+    )
+):
+    """
+    Tag facets for the tag sidebar.
+
+    Takes the same filters as `GET /transactions` and returns, for every
+    tag found on the matching transactions, how many there are and their
+    totals by type. Most used tags first. A transaction with several tags
+    is counted under each of them.
+
+    **Example response:**
+    ```json
+    [
+        {
+            "tag": "vacanze-2025",
+            "total_income": 0.00,
+            "total_expense_necessity": 320.00,
+            "total_expense_extra": 1140.50,
+            "total_expenses": 1460.50,
+            "net": -1460.50,
+            "transaction_count": 23
+        }
+    ]
+    ```
+    """
+    if type is not None and type not in VALID_TRANSACTION_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid type. Must be one of: {', '.join(VALID_TRANSACTION_TYPES)}"
+        )
+    
+    try:
+        facets = transaction_crud.get_tag_facets(
+            db,
+            user_id=str(current_user.id),
+            account_id=account_id,
+            category_id=category_id,
+            transaction_type=type,
+            start_date=start_date,
+            end_date=end_date,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            tags=tags,
+            search=search,
+            search_mode=search_mode,
+            tag_match=tag_match
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return facets
+
+
+@router.get("/export")
+def export_transactions(
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    format: str = Query(export_utils.EXPORT_FORMAT_CSV, description="Formato: csv o ndjson"),
+    account_id: Optional[str] = Query(None, description="Filtra per account"),
+    category_id: Optional[str] = Query(None, description="Filtra per categoria"),
+    type: Optional[str] = Query(None, description="Filtra per tipo: income, expense_necessity, expense_extra"),
+    start_date: Optional[date] = Query(None, description="Data inizio periodo (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Data fine periodo (YYYY-MM-DD)"),
+    min_amount: Optional[Decimal] = Query(None, ge=0, description="Importo minimo"),
+    max_amount: Optional[Decimal] = Query(None, ge=0, description="Importo massimo"),
+    search: Optional[str] = Query(None, description="Cerca in descrizione e note"),
+    search_mode: str = Query(
+        transaction_crud.SEARCH_MODE_SUBSTRING,
+        description="Modalità di ricerca: substring (contiene) o fulltext (indicizzata)"
+    ),
+    tags: Optional[List[str]] = Query(None, description="Filtra per tag (ripetibile: ?tags=a&tags=b)"),
+    tag_match: str = Query(
+        transaction_crud.TAG_MATCH_ANY,
+        description="Corrispondenza tag: any (almeno uno) o all (tutti)"
     )
+):
+    """
+    Download all matching transactions as CSV or NDJSON.
+
+    Takes the same filters as `GET /transactions`, without a limit. Rows
+    are streamed from a server-side cursor, newest first, so full-history
+    exports use constant memory.
+
+    **Columns:** id, date, type, amount, account, category, description,
+    notes, tags (`;`-separated in CSV), created_at. Accounts and
+    categories are exported by name; the CSV can be re-imported with
+    `POST /transactions/import`.
+    """
+    if type is not None and type not in VALID_TRANSACTION_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid type. Must be one of: {', '.join(VALID_TRANSACTION_TYPES)}"
+        )
+    
+    try:
+        export_utils.validate_export_format(format)
+        query = transaction_crud.transactions_export_query(
+            db,
+            user_id=str(current_user.id),
+            account_id=account_id,
+            category_id=category_id,
+            transaction_type=type,
+            start_date=start_date,
+            end_date=end_date,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            tags=tags,
+            search=search,
+            search_mode=search_mode,
+            tag_match=tag_match
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    return transactions
+    filename = export_utils.export_filename("transactions", format)
+    return StreamingResponse(
+        export_utils.stream_query(query, transaction_crud.EXPORT_COLUMNS, format),
+        media_type=export_utils.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 @router.get("/summary", response_model=TransactionSummary)
-async def get_transactions_summary(
-    current_user: User = Depends(get_current_user),
+def get_transactions_summary(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     start_date: Optional[date] = Query(None, description="Data inizio periodo"),
     end_date: Optional[date] = Query(None, description="Data fine periodo"),
@@ -122,10 +379,10 @@ async def get_transactions_summary(
 
 
 @router.get("/monthly/{year}/{month}", response_model=TransactionSummary)
-async def get_monthly_summary(
+def get_monthly_summary(
     year: int,
     month: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -157,9 +414,9 @@ async def get_monthly_summary(
 
 
 @router.post("/", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
-async def create_transaction(
+def create_transaction(
     transaction: TransactionCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -175,10 +432,17 @@ async def create_transaction(
     - **description**: Short description
     - **notes**: Additional notes
     - **tags**: List of tags for filtering
+    - **is_recurring** / **recurring_frequency**: Make it a recurring
+      template (daily, weekly, monthly, yearly)
 
     ⚠️ **Note:** The transaction type (income/expense_necessity/expense_extra)
     is automatically determined by the selected category.
 
+    🔁 **Recurring:** occurrences are generated from the template's date,
+    starting with today's if it is due; occurrences before today are never
+    backfilled, also when the template is dated in the past. The same rule
+    applies when an update changes the recurrence or the date.
+
     ✅ The account balance is updated automatically.
 
     **Example:**
@@ -229,10 +493,105 @@ async def create_transaction(
         )
 
 
+@router.post("/batch", response_model=TransactionBatchResult)
+def apply_transaction_batch(
+    batch: TransactionBatch,
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Create, update and delete many transactions in one call.
+
+    - **create**: transactions to create (same fields as `POST /transactions`)
+    - **update**: `id` plus the fields to change (same as `PUT /transactions/{id}`)
+    - **delete**: IDs of transactions to delete
+
+    The batch is all-or-nothing: if any operation is invalid nothing is
+    saved and the error names it (e.g. `update[3]: Category not found`).
+    Up to 1000 operations per batch; a transaction may be updated or
+    deleted only once.
+
+    ✅ Account balances are updated once per account with the net change.
+
+    **Example (recategorize two rows and delete one):**
+    ```json
+    {
+        "update": [
+            {"id": "uuid-1", "category_id": "uuid-categoria-spesa"},
+            {"id": "uuid-2", "category_id": "uuid-categoria-spesa"}
+        ],
+        "delete": ["uuid-3"]
+    }
+    ```
+    """
+    try:
+        return transaction_crud.apply_transaction_batch(
+            db,
+            batch=batch,
+            user_id=str(current_user.id)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post("/import", response_model=TransactionImportResult)
+def import_transactions(
+    file: UploadFile = File(..., description="File CSV, JSON/NDJSON o OFX"),
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    format: Optional[str] = Query(None, description="Formato: csv, json, ofx (default: dall'estensione del file)"),
+    account_id: Optional[str] = Query(None, description="Account per le righe senza account"),
+    category_id: Optional[str] = Query(None, description="Categoria per le righe senza categoria"),
+    atomic: bool = Query(False, description="Se true, una riga non valida annulla l'intero import"),
+    dry_run: bool = Query(False, description="Valida il file senza salvare nulla")
+):
+    """
+    Bulk import transactions from a bank export.
+
+    **Formats:**
+    - **csv**: header row required; `,` `;` tab or `|` separated
+    - **json**: array of objects, or NDJSON (one object per line, streamed)
+    - **ofx**: OFX/QFX statements (`STMTTRN` records)
+
+    **Columns / keys** (Italian names accepted too):
+    `date`, `amount`, `description`, `notes`, `tags`, `account`, `category`.
+    Accounts and categories are matched by id or by name; rows without
+    them use `account_id` / `category_id`. Dates may be `YYYY-MM-DD` or
+    `DD/MM/YYYY`; amounts accept `1.234,56` or `1,234.56`. Negative amounts
+    (bank debits) are stored as positive and need an expense category.
+
+    Invalid rows are skipped and listed in `errors` with their row number;
+    with `atomic=true` nothing is imported if any row is invalid.
+
+    ✅ Account balances and monthly totals are updated once per import.
+    """
+    try:
+        import_format = format or detect_import_format(file.filename, file.content_type)
+        rows = iter_import_rows(file.file, import_format)
+        result = transaction_crud.import_transactions(
+            db,
+            user_id=str(current_user.id),
+            rows=rows,
+            default_account_id=account_id,
+            default_category_id=category_id,
+            atomic=atomic,
+            dry_run=dry_run
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return {"format": import_format, **result}
+
+
 @router.get("/{transaction_id}", response_model=TransactionWithDetails)
-async def get_transaction(
+def get_transaction(
     transaction_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -266,6 +625,8 @@ async def get_transaction(
         tags=transaction.tags,
         is_recurring=transaction.is_recurring,
         recurring_frequency=transaction.recurring_frequency,
+        next_occurrence_date=transaction.next_occurrence_date,
+        recurring_parent_id=transaction.recurring_parent_id,
         created_at=transaction.created_at,
         updated_at=transaction.updated_at,
         account_name=transaction.account.name if transaction.account else None,
@@ -280,10 +641,10 @@ async def get_transaction(
 
 
 @router.put("/{transaction_id}", response_model=TransactionResponse)
-async def update_transaction(
+def update_transaction(
     transaction_id: str,
     transaction_update: TransactionUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -294,6 +655,9 @@ async def update_transaction(
     ⚠️ **Note:** If you change the category, the transaction type will be automatically updated
     to match the new category type.
 
+    🔁 Changing the recurrence or the date reschedules a recurring template
+    from today (or its last occurrence): past occurrences are not backfilled.
+
     ✅ Account balances are automatically recalculated.
     """
     # Verify that the transaction exists
@@ -334,18 +698,25 @@ async def update_transaction(
             transaction_update=transaction_update,
             user_id=str(current_user.id)
         )
-        return updated_transaction
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    
+    # Deleted by a concurrent request after the check above
+    if not updated_transaction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found"
+        )
+    return updated_transaction
 
 
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_transaction(
+def delete_transaction(
     transaction_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -369,8 +740,8 @@ async def delete_transaction(
 
 
 @router.get("/by-category/totals")
-async def get_totals_by_category(
-    current_user: User = Depends(get_current_user),
+def get_totals_by_category(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     start_date: Optional[date] = Query(None, description="Data inizio periodo"),
     end_date: Optional[date] = Query(None, description="Data fine periodo")
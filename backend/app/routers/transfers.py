@@ -3,6 +3,7 @@ Transfers Router
 Managing transfers between user accounts
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
@@ -21,8 +22,11 @@ from app.schemas.transfer import (
 )
 from app.crud import transfer as transfer_crud
 from app.crud import account as account_crud
-from app.dependencies import get_current_user
-from app.models.user import User
+from app.utils import export as export_utils
+from app.utils.cache import cached_endpoint
+from app.utils.projection import parse_fields, projection_response, rows_as_dicts
+from app.dependencies import get_current_principal
+from app.schemas.user import UserPrincipal
 
 router = APIRouter(prefix="/transfers", tags=["Transfers"])
 
@@ -75,8 +79,8 @@ async def get_transfer_type_rules():
     return rules
 
 @router.get("/", response_model=List[TransferResponse])
-async def get_transfers(
-    current_user: User = Depends(get_current_user),
+def get_transfers(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0, description="Numero di record da saltare"),
     limit: int = Query(100, ge=1, le=500, description="Numero massimo di risultati"),
@@ -84,7 +88,8 @@ async def get_transfers(
     from_account_id: Optional[str] = Query(None, description="Filtra per account origine"),
     to_account_id: Optional[str] = Query(None, description="Filtra per account destinazione"),
     start_date: Optional[date] = Query(None, description="Data inizio periodo (YYYY-MM-DD)"),
-    end_date: Optional[date] = Query(None, description="Data fine periodo (YYYY-MM-DD)")
+    end_date: Optional[date] = Query(None, description="Data fine periodo (YYYY-MM-DD)"),
+    fields: Optional[str] = Query(None, description="Campi da restituire, separati da virgola (es. id,date,amount)")
 ):
     """
     List all user transfers with optional filters.
@@ -95,6 +100,9 @@ async def get_transfers(
     - **to_account_id**: Filter by destination account
     - **start_date / end_date**: Filter by period
 
+    **Sparse fieldsets:** `fields=id,date,amount` returns only those fields
+    (and reads only those columns)
+
     **Sort:** By date descending (newest first)
     """
     # Valida il tipo se fornito
@@ -104,9 +112,18 @@ async def get_transfers(
             detail=f"Invalid type. Must be one of: {', '.join(VALID_TRANSFER_TYPES)}"
         )
     
-    transfers = transfer_crud.get_transfers(
+    try:
+        selected = parse_fields(fields, transfer_crud.LIST_FIELDS)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    rows = transfer_crud.get_transfer_rows(
         db,
         user_id=str(current_user.id),
+        fields=selected,
         skip=skip,
         limit=limit,
         transfer_type=type,
@@ -116,12 +133,64 @@ async def get_transfers(
         end_date=end_date
     )
     
-    return transfers
+    return projection_response(rows_as_dicts(rows, selected))
+
+
+@router.get("/export")
+def export_transfers(
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    format: str = Query(export_utils.EXPORT_FORMAT_CSV, description="Formato: csv o ndjson"),
+    type: Optional[str] = Query(None, description="Filtra per tipo di trasferimento"),
+    from_account_id: Optional[str] = Query(None, description="Filtra per account origine"),
+    to_account_id: Optional[str] = Query(None, description="Filtra per account destinazione"),
+    start_date: Optional[date] = Query(None, description="Data inizio periodo (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Data fine periodo (YYYY-MM-DD)")
+):
+    """
+    Download all matching transfers as CSV or NDJSON.
+
+    Takes the same filters as `GET /transfers`, without a limit. Rows are
+    streamed from a server-side cursor, newest first.
+
+    **Columns:** id, date, type, amount, fee, exchange_rate, from_account,
+    to_account (by name), description, notes, created_at.
+    """
+    if type is not None and type not in VALID_TRANSFER_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid type. Must be one of: {', '.join(VALID_TRANSFER_TYPES)}"
+        )
+    
+    try:
+        export_utils.validate_export_format(format)
+        query = transfer_crud.transfers_export_query(
+            db,
+            user_id=str(current_user.id),
+            transfer_type=type,
+            from_account_id=from_account_id,
+            to_account_id=to_account_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    filename = export_utils.export_filename("transfers", format)
+    return StreamingResponse(
+        export_utils.stream_query(query, transfer_crud.EXPORT_COLUMNS, format),
+        media_type=export_utils.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 @router.get("/statistics")
-async def get_transfer_statistics(
-    current_user: User = Depends(get_current_user),
+@cached_endpoint("transfers.statistics")
+def get_transfer_statistics(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     start_date: Optional[date] = Query(None, description="Data inizio periodo"),
     end_date: Optional[date] = Query(None, description="Data fine periodo")
@@ -165,8 +234,8 @@ async def get_transfer_statistics(
 
 
 @router.get("/loans")
-async def get_loans_summary(
-    current_user: User = Depends(get_current_user),
+def get_loans_summary(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -216,9 +285,9 @@ async def get_loans_summary(
 
 
 @router.post("/", response_model=TransferResponse, status_code=status.HTTP_201_CREATED)
-async def create_transfer(
+def create_transfer(
     transfer: TransferCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -303,9 +372,9 @@ async def create_transfer(
 
 
 @router.get("/{transfer_id}", response_model=TransferWithDetails)
-async def get_transfer(
+def get_transfer(
     transfer_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -353,10 +422,10 @@ async def get_transfer(
 
 
 @router.put("/{transfer_id}", response_model=TransferResponse)
-async def update_transfer(
+def update_transfer(
     transfer_id: str,
     transfer_update: TransferUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -405,18 +474,25 @@ async def update_transfer(
             transfer_update=transfer_update,
             user_id=str(current_user.id)
         )
-        return updated_transfer
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    
+    # Deleted by a concurrent request after the check above
+    if not updated_transfer:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transfer not found"
+        )
+    return updated_transfer
 
 
 @router.delete("/{transfer_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_transfer(
+def delete_transfer(
     transfer_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
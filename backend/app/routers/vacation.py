@@ -18,12 +18,12 @@ from datetime import date, timedelta
 from typing import List, Optional
 import calendar as cal_module
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models.user import User
+from app.dependencies import get_current_principal
+from app.schemas.user import UserPrincipal
 from app.models.vacation_entry import MANUAL_HOURS_TYPES, VACATION_ENTRY_TYPE_LABELS, VacationEntryType
 
 from app.crud import vacation_settings as vacation_settings_crud
@@ -47,6 +47,8 @@ from app.schemas.vacation import (
     UserHolidayResponse,
 )
 from app.utils.vacation_balance import calculate_balance
+from app.utils.cache import IMMUTABLE_CACHE_CONTROL, conditional_get
+from app.utils.projection import parse_fields, projection_response, rows_as_dicts
 from app.utils.bridge_days import (
     find_bridge_opportunities,
     get_italian_weekday,
@@ -67,11 +69,31 @@ def _enrich_entry(entry) -> VacationEntryResponse:
     return resp
 
 
+# Fields of the entry list (?fields=); computed ones map to their source column
+ENTRY_FIELDS = tuple(VacationEntryResponse.model_fields)
+_COMPUTED_ENTRY_FIELDS = {"day_name": "date", "type_label": "entry_type"}
+
+
+def _entry_items(rows, columns: List[str], fields) -> List[dict]:
+    """Entry rows as response dicts, with the computed fields filled in."""
+    # Source columns read only for a computed field are not returned
+    extra = [name for name in columns if name not in fields]
+    items = rows_as_dicts(rows, columns)
+    for item in items:
+        if "day_name" in fields:
+            item["day_name"] = get_italian_weekday(item["date"])
+        if "type_label" in fields:
+            item["type_label"] = VACATION_ENTRY_TYPE_LABELS.get(item["entry_type"].value)
+        for name in extra:
+            del item[name]
+    return items
+
+
 # ── Settings ──────────────────────────────────────────────────────────────────
 
 @router.get("/settings", response_model=VacationSettingsResponse)
-async def get_settings(
-    current_user: User = Depends(get_current_user),
+def get_settings(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Get vacation settings for the current user, creating defaults on first access."""
@@ -80,9 +102,9 @@ async def get_settings(
 
 
 @router.put("/settings", response_model=VacationSettingsResponse)
-async def update_settings(
+def update_settings(
     settings_update: VacationSettingsUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Update vacation settings (partial update)."""
@@ -93,28 +115,45 @@ async def update_settings(
 # ── Entries ───────────────────────────────────────────────────────────────────
 
 @router.get("/entries", response_model=List[VacationEntryResponse])
-async def get_entries(
+def get_entries(
     year: Optional[int] = Query(None, description="Filter by year"),
     month: Optional[int] = Query(None, ge=1, le=12, description="Filter by month (requires year)"),
     entry_type: Optional[VacationEntryType] = Query(None, description="Filter by type"),
-    current_user: User = Depends(get_current_user),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (e.g. date,hours)"),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
-    """List vacation entries with optional filters."""
-    entries = vacation_entry_crud.get_all(
+    """
+    List vacation entries with optional filters.
+
+    `fields=date,hours` returns only those fields (and reads only the
+    columns they need).
+    """
+    try:
+        selected = parse_fields(fields, ENTRY_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    columns = [name for name in selected if name not in _COMPUTED_ENTRY_FIELDS]
+    for name, source in _COMPUTED_ENTRY_FIELDS.items():
+        if name in selected and source not in columns:
+            columns.append(source)
+
+    rows = vacation_entry_crud.get_rows(
         db,
         user_id=current_user.id,
+        columns=columns,
         year=year,
         month=month,
         entry_type=entry_type,
     )
-    return [_enrich_entry(e) for e in entries]
+    return projection_response(_entry_items(rows, columns, selected))
 
 
 @router.post("/entries", response_model=VacationEntryResponse, status_code=status.HTTP_201_CREATED)
-async def create_entry(
+def create_entry(
     entry: VacationEntryCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """
@@ -138,10 +177,10 @@ async def create_entry(
 
 
 @router.put("/entries/{entry_id}", response_model=VacationEntryResponse)
-async def update_entry(
+def update_entry(
     entry_id: str,
     entry_update: VacationEntryUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Update an existing vacation entry (partial update)."""
@@ -152,9 +191,9 @@ async def update_entry(
 
 
 @router.delete("/entries/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_entry(
+def delete_entry(
     entry_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Delete a vacation entry."""
@@ -170,9 +209,9 @@ async def delete_entry(
     response_model=List[VacationEntryResponse],
     status_code=status.HTTP_201_CREATED,
 )
-async def create_bulk_entries(
+def create_bulk_entries(
     bulk: VacationEntryBulkCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Create multiple entries for a date range (e.g., a full week of vacation)."""
@@ -235,10 +274,10 @@ async def create_bulk_entries(
 # ── Balance ───────────────────────────────────────────────────────────────────
 
 @router.get("/balance", response_model=VacationBalanceResponse)
-async def get_balance(
+def get_balance(
     year: Optional[int] = Query(None, description="Year (default: current year)"),
     month: Optional[int] = Query(None, ge=1, le=12, description="Month (default: current month)"),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """
@@ -254,10 +293,11 @@ async def get_balance(
 # ── Calendar ──────────────────────────────────────────────────────────────────
 
 @router.get("/calendar/{year}/{month}", response_model=CalendarMonthResponse)
-async def get_calendar_month(
+@conditional_get("vacation.calendar")
+def get_calendar_month(
     year: int,
     month: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Get calendar view for a specific month with holidays, bridge opportunities, and entries."""
@@ -346,12 +386,15 @@ async def get_calendar_month(
 # ── Holidays ──────────────────────────────────────────────────────────────────
 
 @router.get("/holidays/{year}", response_model=List[ItalianHolidayResponse])
-async def get_holidays(
+def get_holidays(
     year: int,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Get all Italian national holidays for a given year (fixed + Easter Monday)."""
+    # Same for every user and fixed once the year is known
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
     holidays = italian_holiday_crud.ensure_holidays_exist(db, year)
     result = []
     for h in holidays:
@@ -364,9 +407,9 @@ async def get_holidays(
 # ── Bridge Opportunities ──────────────────────────────────────────────────────
 
 @router.get("/bridges/{year}", response_model=List[BridgeOpportunityResponse])
-async def get_bridges(
+def get_bridges(
     year: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Get bridge day opportunities for a year, sorted by efficiency."""
@@ -379,8 +422,8 @@ async def get_bridges(
 # ── User Holidays ─────────────────────────────────────────────────────────────
 
 @router.get("/user-holidays", response_model=List[UserHolidayResponse])
-async def get_user_holidays(
-    current_user: User = Depends(get_current_user),
+def get_user_holidays(
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """List all custom holidays for the current user."""
@@ -392,9 +435,9 @@ async def get_user_holidays(
     response_model=UserHolidayResponse,
     status_code=status.HTTP_201_CREATED,
 )
-async def create_user_holiday(
+def create_user_holiday(
     holiday: UserHolidayCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Create a custom holiday (patron saint, company closure, etc.)."""
@@ -408,9 +451,9 @@ async def create_user_holiday(
 
 
 @router.delete("/user-holidays/{holiday_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user_holiday(
+def delete_user_holiday(
     holiday_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Delete a custom holiday."""
@@ -7,6 +7,7 @@ from app.schemas.user import (
     UserCreate,
     UserLogin,
     UserResponse,
+    UserPrincipal,
     UserUpdate,
     Token,
     TokenData
@@ -17,7 +18,8 @@ from app.schemas.account import (
     AccountCreate,
     AccountUpdate,
     AccountResponse,
-    AccountWithStats
+    AccountWithStats,
+    AccountWithActivity
 )
 
 from app.schemas.category import (
@@ -32,7 +34,14 @@ from app.schemas.transaction import (
     TransactionCreate,
     TransactionUpdate,
     TransactionResponse,
-    TransactionWithDetails
+    TransactionWithDetails,
+    TransactionPage,
+    TagFacet,
+    TransactionBatchUpdate,
+    TransactionBatch,
+    TransactionBatchResult,
+    TransactionImportError,
+    TransactionImportResult
 )
 
 from app.schemas.transfer import (
@@ -80,6 +89,7 @@ __all__ = [
     "UserCreate",
     "UserLogin",
     "UserResponse",
+    "UserPrincipal",
     "UserUpdate",
     "Token",
     "TokenData",
@@ -90,6 +100,7 @@ __all__ = [
     "AccountUpdate",
     "AccountResponse",
     "AccountWithStats",
+    "AccountWithActivity",
     
     # Category schemas
     "CategoryBase",
@@ -103,6 +114,13 @@ __all__ = [
     "TransactionUpdate",
     "TransactionResponse",
     "TransactionWithDetails",
+    "TransactionPage",
+    "TagFacet",
+    "TransactionBatchUpdate",
+    "TransactionBatch",
+    "TransactionBatchResult",
+    "TransactionImportError",
+    "TransactionImportResult",
     
     # Transfer schemas
     "TransferBase",
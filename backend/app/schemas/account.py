@@ -8,11 +8,14 @@ Balance Strategy:
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.schemas.transaction import TransactionResponse
+from app.schemas.transfer import TransferResponse
+
 
 # Valid account types
 VALID_ACCOUNT_TYPES = ['checking', 'savings', 'credit_card', 'cash', 'investment', 'loan', 'other']
@@ -165,6 +168,14 @@ class AccountWithStats(AccountResponse):
         return Decimal("0.00")
 
 
+class AccountWithActivity(AccountResponse):
+    """Schema for account response with its recent transactions and transfers."""
+    activity_days: int = Field(..., description="Size of the activity window in days")
+    transactions: List[TransactionResponse] = Field(default=[], description="Transactions in the window")
+    transfers_from: List[TransferResponse] = Field(default=[], description="Outgoing transfers in the window")
+    transfers_to: List[TransferResponse] = Field(default=[], description="Incoming transfers in the window")
+
+
 class AccountSummary(BaseModel):
     """Schema for account summary in lists/dashboards."""
     id: UUID
@@ -127,6 +127,10 @@ class CategoryResponse(BaseModel):
     is_active: bool = Field(default=True, description="Category active status")
     created_at: datetime = Field(..., description="Category creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
+    transaction_count: Optional[int] = Field(
+        None,
+        description="Number of transactions directly in this category (only when requested)"
+    )
     
     class Config:
         from_attributes = True
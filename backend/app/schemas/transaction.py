@@ -5,18 +5,34 @@ Transaction types (derived from the category):
 - income: Income
 - expense_necessity: Necessity Expenses
 - expense_extra: Extra Expenses
+
+Recurring transactions: a transaction created with is_recurring is a
+template; its later occurrences are materialized as separate transactions
+(recurring_parent_id) by materialize_recurring.py.
 """
 
 from datetime import datetime, date as date_type
 from decimal import Decimal
 from typing import Optional, List
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from uuid import UUID
 
+from app.utils.recurrence import RECURRING_FREQUENCIES
+
 # Valid types for transactions (same as categories)
 VALID_TRANSACTION_TYPES = ["income", "expense_necessity", "expense_extra"]
 
 
+def _check_recurring_frequency(v: Optional[str]) -> Optional[str]:
+    """Normalize and validate a recurring frequency."""
+    if v is None:
+        return v
+    v = v.strip().lower()
+    if v not in RECURRING_FREQUENCIES:
+        raise ValueError(f"Invalid recurring frequency. Must be one of: {', '.join(RECURRING_FREQUENCIES)}")
+    return v
+
+
 class TransactionBase(BaseModel):
     """Base transaction schema with common fields."""
     account_id: UUID = Field(..., description="Account ID for this transaction")
@@ -55,7 +71,23 @@ class TransactionBase(BaseModel):
 
 class TransactionCreate(TransactionBase):
     """Schema for creating a new transaction."""
-    pass
+    is_recurring: bool = Field(default=False, description="Repeat this transaction (template of its occurrences)")
+    recurring_frequency: Optional[str] = Field(None, description="Recurring frequency: daily, weekly, monthly, yearly")
+    
+    @field_validator('recurring_frequency')
+    @classmethod
+    def validate_recurring_frequency(cls, v: Optional[str]) -> Optional[str]:
+        """Validate recurring frequency if provided."""
+        return _check_recurring_frequency(v)
+    
+    @model_validator(mode='after')
+    def validate_recurrence(self):
+        # model_validator: field validators do not run on defaults
+        if self.is_recurring and self.recurring_frequency is None:
+            raise ValueError('recurring_frequency is required for recurring transactions')
+        if not self.is_recurring and self.recurring_frequency is not None:
+            raise ValueError('recurring_frequency requires is_recurring')
+        return self
 
 
 class TransactionUpdate(BaseModel):
@@ -67,6 +99,14 @@ class TransactionUpdate(BaseModel):
     description: Optional[str] = Field(None, max_length=500, description="Transaction description")
     notes: Optional[str] = Field(None, max_length=1000, description="Additional notes")
     tags: Optional[List[str]] = Field(None, description="Transaction tags")
+    is_recurring: Optional[bool] = Field(None, description="Repeat this transaction (template of its occurrences)")
+    recurring_frequency: Optional[str] = Field(None, description="Recurring frequency: daily, weekly, monthly, yearly")
+    
+    @field_validator('recurring_frequency')
+    @classmethod
+    def validate_recurring_frequency(cls, v: Optional[str]) -> Optional[str]:
+        """Validate recurring frequency if provided."""
+        return _check_recurring_frequency(v)
     
     @field_validator('amount')
     @classmethod
@@ -110,6 +150,8 @@ class TransactionResponse(BaseModel):
     tags: Optional[List[str]] = Field(None, description="Transaction tags")
     is_recurring: bool = Field(default=False, description="Is recurring transaction")
     recurring_frequency: Optional[str] = Field(None, description="Recurring frequency")
+    next_occurrence_date: Optional[date_type] = Field(None, description="Next occurrence to materialize (recurring templates)")
+    recurring_parent_id: Optional[UUID] = Field(None, description="Recurring template this occurrence was generated from")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
     
@@ -127,6 +169,13 @@ class TransactionWithDetails(TransactionResponse):
     category_icon: Optional[str] = Field(None, description="Category icon")
 
 
+class TransactionPage(BaseModel):
+    """Schema for a cursor-paginated page of transactions."""
+    items: List[TransactionResponse] = Field(default=[], description="Transactions, newest first")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (null on the last page)")
+    has_more: bool = Field(default=False, description="Whether more transactions follow")
+
+
 class TransactionSummary(BaseModel):
     """Schema for transaction summary/statistics."""
     total_income: Decimal = Field(default=Decimal("0.00"), description="Total income")
@@ -137,6 +186,47 @@ class TransactionSummary(BaseModel):
     transaction_count: int = Field(default=0, description="Number of transactions")
 
 
+class TagFacet(TransactionSummary):
+    """Schema for a tag facet: totals of the filtered transactions with a tag."""
+    tag: str = Field(..., description="Tag")
+
+
+class TransactionBatchUpdate(TransactionUpdate):
+    """Schema for one update of a batch: the transaction ID plus the fields to change."""
+    id: UUID = Field(..., description="Transaction ID")
+
+
+class TransactionBatch(BaseModel):
+    """Schema for a batch of transaction changes, applied all-or-nothing."""
+    create: List[TransactionCreate] = Field(default=[], description="Transactions to create")
+    update: List[TransactionBatchUpdate] = Field(default=[], description="Transactions to update")
+    delete: List[UUID] = Field(default=[], description="IDs of transactions to delete")
+
+
+class TransactionBatchResult(BaseModel):
+    """Schema for the outcome of a batch."""
+    created: List[TransactionResponse] = Field(default=[], description="Created transactions, in request order")
+    updated: List[TransactionResponse] = Field(default=[], description="Updated transactions, in request order")
+    deleted: List[UUID] = Field(default=[], description="Deleted transaction IDs")
+
+
+class TransactionImportError(BaseModel):
+    """Schema for a row rejected by a bulk import."""
+    row: int = Field(..., description="Row number in the file (CSV: line, JSON/OFX: record)")
+    error: str = Field(..., description="Reason the row was rejected")
+
+
+class TransactionImportResult(BaseModel):
+    """Schema for the outcome of a bulk import."""
+    format: str = Field(..., description="File format (csv, json, ofx)")
+    total_rows: int = Field(default=0, description="Rows read from the file")
+    imported: int = Field(default=0, description="Transactions created")
+    failed: int = Field(default=0, description="Rows rejected")
+    errors: List[TransactionImportError] = Field(default=[], description="Rejected rows (first ones only)")
+    errors_truncated: bool = Field(default=False, description="Whether more rows were rejected than listed")
+    dry_run: bool = Field(default=False, description="Validation only, nothing was written")
+
+
 class TransactionFilters(BaseModel):
     """Schema for transaction filter parameters."""
     account_id: Optional[UUID] = None
@@ -66,6 +66,22 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class UserPrincipal(BaseModel):
+    """
+    Lightweight authenticated principal.
+
+    Carries only the columns needed to authorize a request, so resolving the
+    current user never hydrates the User relationships.
+    """
+    id: UUID = Field(..., description="User unique identifier")
+    email: str = Field(..., description="User email address")
+    is_active: bool = Field(default=True, description="User account status")
+    data_version: int = Field(default=0, description="Version of the user's financial data")
+
+    class Config:
+        from_attributes = True
+
+
 class UserUpdate(BaseModel):
     """Schema for updating user information."""
     email: Optional[EmailStr] = Field(None, description="New email address")
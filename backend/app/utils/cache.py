@@ -0,0 +1,425 @@
+"""
+Response cache
+Per-user versioned caching of read endpoints: server-side response cache
+(analytics, summaries) and HTTP validators (ETag / If-None-Match)
+
+Entries and ETags are derived from (endpoint, user, user data_version,
+normalized query parameters). Every write to a user's accounts,
+categories, transactions, transfers, budgets or vacation data bumps
+data_version (app.crud.user.bump_data_version) in the same DB transaction,
+so an entry computed before the write is never read again: nothing has to
+be invalidated explicitly, stale entries just age out through LRU eviction
+or TTL, and a backend shared by several workers stays correct. The version
+comes with the authenticated principal, so a conditional GET is answered
+with 304 before any query runs.
+
+Cost: the bump is an UPDATE of the users row, held until commit, so the
+writes of one user are serialized from the bump to the commit (balance
+deltas themselves are still atomic increments). Writes of different users
+are not affected.
+
+Backends:
+- MemoryCache: in-process LRU bounded by entry count and bytes (default)
+- RedisCache: shared by all workers (CACHE_BACKEND=redis, needs `redis`)
+
+Any object implementing CacheBackend can be plugged in with
+set_cache_backend().
+"""
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.config import settings
+from app.utils.serialization import JSON_MEDIA_TYPE, dumps
+
+try:
+    import redis
+except ImportError:  # optional: only needed for CACHE_BACKEND=redis
+    redis = None
+
+CACHE_BACKEND_MEMORY = "memory"
+CACHE_BACKEND_REDIS = "redis"
+CACHE_BACKENDS = (CACHE_BACKEND_MEMORY, CACHE_BACKEND_REDIS)
+
+# Response header telling whether the body came from the cache
+CACHE_HEADER = "X-Cache"
+
+# Cache-Control of per-user data: clients may store it but must revalidate
+# (If-None-Match) every time; shared caches must not store it
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+# Data that only changes with a deploy (e.g. enum lists)
+STATIC_CACHE_CONTROL = "public, max-age=86400"
+# Data that never changes once published (e.g. a year's national holidays)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=2592000, immutable"
+
+# Arguments the decorators below have FastAPI inject (shared when they are
+# stacked: an endpoint gets a single Response object)
+_REQUEST_PARAM = "http_request"
+_RESPONSE_PARAM = "http_response"
+_INJECTED_PARAMS = {_REQUEST_PARAM, _RESPONSE_PARAM}
+# Endpoint arguments that are not part of the key (the user is keyed
+# separately through the principal)
+_EXCLUDED_PARAMS = {"db", "current_user"} | _INJECTED_PARAMS
+
+
+class CacheBackend:
+    """Storage interface: opaque bytes values with a TTL."""
+
+    name = "custom"
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryCache(CacheBackend):
+    """
+    Thread-safe in-process LRU.
+
+    Bounded by number of entries and by total size (keys + values);
+    the least recently used entries are evicted first. Expired entries
+    are dropped when read.
+    """
+
+    name = CACHE_BACKEND_MEMORY
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= len(key) + len(value)
+
+
+class RedisCache(CacheBackend):
+    """
+    Redis backend shared by all workers.
+
+    Redis errors are counted and treated as misses: a cache outage slows
+    requests down but never fails them.
+    """
+
+    name = CACHE_BACKEND_REDIS
+
+    def __init__(self, url: str, prefix: str = "budgetapp:cache:"):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._client.get(self.prefix + key)
+        except redis.RedisError:
+            self.errors += 1
+            return None
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        try:
+            self._client.setex(self.prefix + key, ttl, value)
+        except redis.RedisError:
+            self.errors += 1
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=self.prefix + "*", count=1000):
+            self._client.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"errors": self.errors}
+
+
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+# Per-endpoint hit/miss counters of this worker
+_metrics: Dict[str, Dict[str, int]] = {}
+_metrics_lock = threading.Lock()
+
+
+def _create_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == CACHE_BACKEND_REDIS:
+        if not settings.CACHE_REDIS_URL:
+            raise RuntimeError("CACHE_BACKEND=redis requires CACHE_REDIS_URL")
+        return RedisCache(settings.CACHE_REDIS_URL)
+    if settings.CACHE_BACKEND != CACHE_BACKEND_MEMORY:
+        raise RuntimeError(f"Invalid CACHE_BACKEND. Must be one of: {', '.join(CACHE_BACKENDS)}")
+    return MemoryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_MAX_BYTES)
+
+
+def get_cache() -> CacheBackend:
+    """Return the configured backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_backend()
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """Replace the configured backend (custom shared stores, tests)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def cache_key(namespace: str, user_id: Any, version: int, params: Mapping[str, Any]) -> str:
+    """
+    Build the key of a cached response.
+
+    Parameters left to their None default are dropped and the rest are
+    sorted by name, so equivalent requests share an entry whatever the
+    order of the query string.
+    """
+    normalized = json.dumps(
+        {name: value for name, value in params.items() if value is not None},
+        sort_keys=True,
+        default=str,
+        separators=(",", ":")
+    )
+    digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+    return f"{namespace}:{user_id}:{version}:{digest}"
+
+
+def _record(namespace: str, hit: bool) -> None:
+    with _metrics_lock:
+        counters = _metrics.setdefault(namespace, {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters per endpoint and backend statistics (this worker)."""
+    with _metrics_lock:
+        endpoints = {namespace: dict(counters) for namespace, counters in sorted(_metrics.items())}
+    hits = sum(counters["hits"] for counters in endpoints.values())
+    misses = sum(counters["misses"] for counters in endpoints.values())
+    backend = get_cache() if settings.CACHE_ENABLED else None
+    return {
+        "enabled": settings.CACHE_ENABLED,
+        "backend": backend.name if backend else None,
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        "endpoints": endpoints,
+        "store": backend.stats() if backend else {},
+    }
+
+
+def _request_key(namespace: str, principal: Any, kwargs: Mapping[str, Any]) -> str:
+    """Cache key of an endpoint call, from its keyword arguments."""
+    params = {name: value for name, value in kwargs.items() if name not in _EXCLUDED_PARAMS}
+    # Endpoints default their periods to the current month or day
+    params["_today"] = date.today()
+    return cache_key(namespace, principal.id, principal.data_version, params)
+
+
+def _extend_signature(func: Callable, wrapper: Callable, **injected: Any) -> Tuple[str, ...]:
+    """
+    Expose the endpoint's own parameters plus the ones FastAPI must inject
+    for the wrapper (Request/Response) as keyword-only arguments.
+
+    Returns the names added here, which the wrapper must remove before
+    calling func (the others already belong to func, e.g. a decorator
+    applied below).
+    """
+    signature = inspect.signature(func)
+    added = {name: annotation for name, annotation in injected.items() if name not in signature.parameters}
+    wrapper.__signature__ = signature.replace(parameters=[
+        *signature.parameters.values(),
+        *(
+            inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation)
+            for name, annotation in added.items()
+        ),
+    ])
+    return tuple(added)
+
+
+def _encode_result(result: Any, adapter: Optional[TypeAdapter]) -> bytes:
+    """JSON body of a result, with the values FastAPI would send."""
+    if adapter is not None:
+        return adapter.dump_json(adapter.validate_python(result, from_attributes=True), by_alias=True)
+    return dumps(result)
+
+
+def _json_response(body: bytes, response: Response) -> Response:
+    """Response for an encoded body, with the headers set on the injected one."""
+    encoded = Response(body, media_type=JSON_MEDIA_TYPE)
+    for name, value in response.headers.items():
+        if name != "content-length":
+            encoded.headers[name] = value
+    return encoded
+
+
+def cached_endpoint(namespace: str, response_model: Any = None) -> Callable:
+    """
+    Cache the result of a read endpoint per user and data version.
+
+    The endpoint must take the principal as `current_user`; every other
+    argument except `db` is part of the key, together with today's date.
+
+    The result is encoded once (orjson, or pydantic-core for routes with
+    a response_model, which must be passed here too) and the bytes are
+    both stored and sent: neither a miss nor a hit goes through
+    jsonable_encoder, and a hit is sent without decoding. Responses carry
+    `X-Cache: HIT` or `MISS`.
+    """
+    def decorator(func: Callable) -> Callable:
+        adapter = TypeAdapter(response_model) if response_model is not None else None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            response: Response = kwargs[_RESPONSE_PARAM]
+            for name in added:
+                del kwargs[name]
+            principal = kwargs.get("current_user")
+            if not settings.CACHE_ENABLED or principal is None:
+                return _json_response(_encode_result(func(*args, **kwargs), adapter), response)
+
+            key = _request_key(namespace, principal, kwargs)
+            backend = get_cache()
+
+            cached = backend.get(key)
+            if cached is not None:
+                _record(namespace, hit=True)
+                response.headers[CACHE_HEADER] = "HIT"
+                return _json_response(cached, response)
+
+            _record(namespace, hit=False)
+            response.headers[CACHE_HEADER] = "MISS"
+            body = _encode_result(func(*args, **kwargs), adapter)
+            backend.set(key, body, settings.CACHE_TTL_SECONDS)
+            return _json_response(body, response)
+
+        added = _extend_signature(func, wrapper, **{_RESPONSE_PARAM: Response})
+        return wrapper
+
+    return decorator
+
+
+def make_etag(key: str) -> str:
+    """
+    Weak ETag of a cache key: the representation is equivalent, not
+    byte-identical, once compressed.
+    """
+    return f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_get(namespace: str) -> Callable:
+    """
+    Add an ETag to a per-user read endpoint and answer If-None-Match.
+
+    The ETag is derived from the same key as cached_endpoint (user, data
+    version, parameters, today's date), so it is known as soon as the
+    principal is: a matching request gets 304 Not Modified without running
+    the endpoint, i.e. no query and no serialization. Responses carry
+    `Cache-Control: private, no-cache` so clients always revalidate.
+
+    Apply it above cached_endpoint when both are used.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            request: Request = kwargs[_REQUEST_PARAM]
+            response: Response = kwargs[_RESPONSE_PARAM]
+            for name in added:
+                del kwargs[name]
+            principal = kwargs.get("current_user")
+            if principal is None:
+                return func(*args, **kwargs)
+
+            etag = make_etag(_request_key(namespace, principal, kwargs))
+            headers = {"ETag": etag, "Cache-Control": PRIVATE_CACHE_CONTROL}
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=headers)
+
+            response.headers.update(headers)
+            result = func(*args, **kwargs)
+            if isinstance(result, Response):
+                # FastAPI only merges the injected response's headers into
+                # responses it builds itself
+                result.headers.update(headers)
+            return result
+
+        added = _extend_signature(func, wrapper, **{_REQUEST_PARAM: Request, _RESPONSE_PARAM: Response})
+        return wrapper
+
+    return decorator
@@ -0,0 +1,184 @@
+"""
+Response compression
+Negotiated brotli/gzip compression of responses above a size threshold
+
+Starlette's GZipMiddleware only offers gzip. CompressionMiddleware picks
+the best encoding the client accepts (q-values honoured): brotli when the
+optional `brotli` package is installed, then gzip. Bodies below the
+threshold, responses that already have a Content-Encoding and 304s are
+sent as they are; streamed responses (exports) are compressed chunk by
+chunk.
+"""
+import re
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+ENCODING_BROTLI = "br"
+ENCODING_GZIP = "gzip"
+
+_QUALITY = re.compile(r"q\s*=\s*([0-9.]+)")
+
+
+def supported_encodings() -> tuple:
+    """Encodings this server can produce, in order of preference."""
+    if brotli is not None:
+        return (ENCODING_BROTLI, ENCODING_GZIP)
+    return (ENCODING_GZIP,)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Best supported encoding for an Accept-Encoding header.
+
+    Returns None when the client accepts none of them (identity).
+    """
+    accepted = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        match = _QUALITY.search(params)
+        try:
+            accepted[name] = float(match.group(1)) if match else 1.0
+        except ValueError:
+            accepted[name] = 0.0
+
+    best, best_quality = None, 0.0
+    for encoding in supported_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits 31: deflate stream in a gzip container
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with the negotiated encoding.
+
+    Args:
+        minimum_size: Smaller bodies are sent uncompressed
+        gzip_level: zlib level (1-9)
+        brotli_quality: brotli quality (0-11); 4-5 suits dynamic content
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+            if encoding is not None:
+                encoder = (
+                    _BrotliEncoder(self.brotli_quality)
+                    if encoding == ENCODING_BROTLI
+                    else _GzipEncoder(self.gzip_level)
+                )
+                responder = _CompressionResponder(self.app, encoding, encoder, self.minimum_size)
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Compresses the body of a single response (same flow as GZipResponder)."""
+
+    def __init__(self, app: ASGIApp, encoding: str, encoder, minimum_size: int) -> None:
+        self.app = app
+        self.encoding = encoding
+        self.encoder = encoder
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Held back until the first body chunk tells whether to compress
+            self.initial_message = message
+            self.passthrough = "content-encoding" in Headers(raw=message["headers"])
+            return
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if self.passthrough or (len(body) < self.minimum_size and not more_body):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            compressed = self.encoder.compress(body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                compressed += self.encoder.finish()
+                headers["Content-Length"] = str(len(compressed))
+            message["body"] = compressed
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        compressed = self.encoder.compress(body)
+        if not more_body:
+            compressed += self.encoder.finish()
+        message["body"] = compressed
+        await self.send(message)
@@ -0,0 +1,129 @@
+"""
+Export utilities
+Streaming CSV/NDJSON encoding of query results
+
+Exports are read with a server-side cursor (yield_per) on a dedicated
+session and encoded in fixed-size chunks, so memory stays constant
+whatever the number of rows.
+"""
+import csv
+import io
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Iterable, Iterator, Mapping, Sequence
+
+import orjson
+from starlette.concurrency import iterate_in_threadpool
+
+from app.database import SessionLocal, db_slots
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_NDJSON = "ndjson"  # one JSON object per line
+EXPORT_FORMATS = (EXPORT_FORMAT_CSV, EXPORT_FORMAT_NDJSON)
+
+EXPORT_MEDIA_TYPES = {
+    EXPORT_FORMAT_CSV: "text/csv; charset=utf-8",
+    EXPORT_FORMAT_NDJSON: "application/x-ndjson",
+}
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 2000
+# Bytes buffered before a chunk is sent to the client
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def validate_export_format(export_format: str) -> None:
+    """
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid format. Must be one of: {', '.join(EXPORT_FORMATS)}")
+
+
+def export_filename(name: str, export_format: str) -> str:
+    """Download filename, e.g. transactions_20250131.csv."""
+    return f"{name}_{date.today().strftime('%Y%m%d')}.{export_format}"
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        # Same separator accepted by the transaction import
+        return ";".join(str(item) for item in value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    # orjson handles dates and UUIDs natively; amounts keep their exact
+    # decimal representation as strings
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_rows(
+    rows: Iterable[Mapping[str, Any]],
+    columns: Sequence[str],
+    export_format: str
+) -> Iterator[bytes]:
+    """
+    Encode rows as CSV (with header) or NDJSON, yielding chunks of about
+    EXPORT_CHUNK_SIZE bytes.
+    """
+    if export_format == EXPORT_FORMAT_NDJSON:
+        yield from _encode_ndjson(rows, columns)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(rows: Iterable[Mapping[str, Any]], columns: Sequence[str]) -> Iterator[bytes]:
+    # orjson writes UTF-8 bytes directly: no text buffer to encode
+    chunk = bytearray()
+    for row in rows:
+        chunk += orjson.dumps({column: row[column] for column in columns}, default=_json_default)
+        chunk += b"\n"
+        if len(chunk) >= EXPORT_CHUNK_SIZE:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+
+async def stream_query(query, columns: Sequence[str], export_format: str) -> AsyncIterator[bytes]:
+    """
+    Run a column query on its own session with a server-side cursor and
+    stream it encoded.
+
+    The request's session (get_db) is closed before a StreamingResponse
+    body is sent, so the export opens and closes its own, holding one of
+    the DB slots (app.database.db_slots) until the last chunk.
+    """
+    async with db_slots:
+        async for chunk in iterate_in_threadpool(_stream_rows(query, columns, export_format)):
+            yield chunk
+
+
+def _stream_rows(query, columns: Sequence[str], export_format: str) -> Iterator[bytes]:
+    db = SessionLocal()
+    try:
+        rows = query.with_session(db).yield_per(EXPORT_BATCH_SIZE)
+        yield from encode_rows((row._mapping for row in rows), columns, export_format)
+    finally:
+        db.close()
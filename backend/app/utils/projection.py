@@ -0,0 +1,55 @@
+"""
+List projections
+Column rows and sparse fieldsets (?fields=id,date,amount) for list endpoints
+
+Hydrating an ORM object per row and validating it again through the
+response schema dominates the cost of long lists. The list endpoints
+select only the response columns as plain rows instead; rows come from
+the database with the schema's types already, so they are encoded as
+they are, with the same JSON the response model would give.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+from app.utils.serialization import JSON_MEDIA_TYPE, dumps
+
+
+def parse_fields(fields: Optional[str], available: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Fields requested with ?fields=, in the order of `available`.
+
+    Args:
+        fields: Comma-separated field names; None or empty for all of them
+        available: Fields of the response schema
+
+    Raises:
+        ValueError: If a name is not one of `available`
+    """
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if not requested:
+        return tuple(available)
+
+    unknown = requested.difference(available)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Must be among: {', '.join(available)}"
+        )
+    return tuple(name for name in available if name in requested)
+
+
+def rows_as_dicts(rows: Iterable[Sequence[Any]], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """Map column rows to dicts keyed by the selected fields."""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def projection_response(items: List[Dict[str, Any]]) -> Response:
+    """
+    JSON response for projected rows.
+
+    Returned as a Response, so FastAPI does not validate it against the
+    route's response_model (kept for the OpenAPI schema). Decimals are
+    written as strings, like the response models write them.
+    """
+    return Response(dumps(items, decimal_as_str=True), media_type=JSON_MEDIA_TYPE)
@@ -0,0 +1,87 @@
+"""
+Recurrence utilities
+Occurrence dates of recurring transactions
+
+Occurrences are computed from the template's own date rather than from the
+previous occurrence, so monthly/yearly schedules anchored at the end of a
+month do not drift: Jan 31 → Feb 28 → Mar 31.
+"""
+import calendar
+from datetime import date, timedelta
+from typing import List
+
+FREQUENCY_DAILY = "daily"
+FREQUENCY_WEEKLY = "weekly"
+FREQUENCY_MONTHLY = "monthly"
+FREQUENCY_YEARLY = "yearly"
+RECURRING_FREQUENCIES = (FREQUENCY_DAILY, FREQUENCY_WEEKLY, FREQUENCY_MONTHLY, FREQUENCY_YEARLY)
+
+# Months per step of the month-based frequencies
+_MONTH_STEPS = {FREQUENCY_MONTHLY: 1, FREQUENCY_YEARLY: 12}
+
+
+def add_months(anchor: date, months: int) -> date:
+    """Same day `months` later, clamped to the end of a shorter month."""
+    index = anchor.month - 1 + months
+    year, month = anchor.year + index // 12, index % 12 + 1
+    return date(year, month, min(anchor.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence_date(anchor: date, frequency: str, n: int) -> date:
+    """
+    The n-th occurrence of a schedule starting at `anchor` (n=0 is anchor).
+
+    Raises:
+        ValueError: If the frequency is not supported
+    """
+    if frequency == FREQUENCY_DAILY:
+        return anchor + timedelta(days=n)
+    if frequency == FREQUENCY_WEEKLY:
+        return anchor + timedelta(weeks=n)
+    if frequency in _MONTH_STEPS:
+        return add_months(anchor, n * _MONTH_STEPS[frequency])
+    raise ValueError(f"Invalid recurring frequency. Must be one of: {', '.join(RECURRING_FREQUENCIES)}")
+
+
+def _index_after(anchor: date, frequency: str, after: date) -> int:
+    """Smallest n ≥ 1 whose occurrence falls strictly after `after`."""
+    if after < anchor:
+        return 1
+    days = (after - anchor).days
+    if frequency == FREQUENCY_DAILY:
+        return days + 1
+    if frequency == FREQUENCY_WEEKLY:
+        return days // 7 + 1
+    # Month-based: start from the whole steps elapsed, at most one more
+    months = (after.year - anchor.year) * 12 + after.month - anchor.month
+    n = max(months // _MONTH_STEPS.get(frequency, 1), 1)
+    while occurrence_date(anchor, frequency, n) <= after:
+        n += 1
+    return n
+
+
+def next_occurrence(anchor: date, frequency: str, after: date) -> date:
+    """
+    First occurrence of the schedule strictly after `after`.
+
+    Raises:
+        ValueError: If the frequency is not supported
+    """
+    return occurrence_date(anchor, frequency, _index_after(anchor, frequency, after))
+
+
+def occurrences_between(anchor: date, frequency: str, start: date, end: date) -> List[date]:
+    """
+    Occurrences from `start` to `end` (inclusive), the anchor excluded.
+
+    Raises:
+        ValueError: If the frequency is not supported
+    """
+    n = _index_after(anchor, frequency, start - timedelta(days=1))
+    dates = []
+    current = occurrence_date(anchor, frequency, n)
+    while current <= end:
+        dates.append(current)
+        n += 1
+        current = occurrence_date(anchor, frequency, n)
+    return dates
@@ -2,14 +2,61 @@
 Security utilities
 Password hashing e JWT token management
 """
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Tuple
 from ..config import settings
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS
+)
+
+# Dedicated executor for bcrypt: hashing never runs on the event loop nor
+# competes with DB-bound endpoints for the shared worker threads.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+# Running + queued hashes; beyond this requests are rejected immediately
+_hash_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE
+)
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when the password hashing queue is full."""
+
+
+async def _run_hashing(func: Callable, *args):
+    """
+    Run a hashing function on the dedicated executor.
+
+    Raises:
+        HashingBusyError: If all workers are busy and the queue is full
+    """
+    if not _hash_slots.acquire(blocking=False):
+        raise HashingBusyError("Password hashing queue is full")
+    
+    try:
+        future = _hash_executor.submit(func, *args)
+    except Exception:
+        _hash_slots.release()
+        raise
+    # Released when the hash completes, even if the request is cancelled
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return await asyncio.wrap_future(future)
+
+
+def shutdown_hash_executor() -> None:
+    """Stop the hashing executor (application shutdown)."""
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
 
 
 def hash_password(password: str) -> str:
@@ -39,6 +86,33 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """
+    Come hash_password, eseguito sull'executor dedicato
+    
+    Raises:
+        HashingBusyError: Se la coda di hashing è piena
+    """
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica password sull'executor dedicato e, se l'hash usa un costo
+    diverso da PASSWORD_HASH_ROUNDS, ne calcola uno nuovo
+    
+    Returns:
+        (valid, new_hash): new_hash è None se non serve aggiornarlo
+    
+    Raises:
+        HashingBusyError: Se la coda di hashing è piena
+    """
+    return await _run_hashing(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Crea JWT access token
@@ -0,0 +1,248 @@
+"""
+Transaction import parsers
+Streaming readers for bank exports (CSV, JSON/NDJSON, OFX)
+
+Every reader consumes a binary file object incrementally and yields
+`(row_number, fields, error)` tuples:
+- fields: dict of raw string values with the normalized keys date, amount,
+  description, notes, tags, account, category (missing keys are absent)
+- error: message when the row could not be read at all (fields is None)
+
+Values are converted with parse_import_date/parse_import_amount/
+parse_import_tags by the caller, so conversion errors are reported per row.
+"""
+import csv
+import io
+import json
+import re
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+IMPORT_FORMAT_CSV = "csv"
+IMPORT_FORMAT_JSON = "json"      # JSON array or NDJSON (one object per line)
+IMPORT_FORMAT_OFX = "ofx"
+IMPORT_FORMATS = (IMPORT_FORMAT_CSV, IMPORT_FORMAT_JSON, IMPORT_FORMAT_OFX)
+
+ImportRow = Tuple[int, Optional[Dict[str, str]], Optional[str]]
+
+# Accepted header names (lowercase) for each normalized field
+FIELD_ALIASES = {
+    "date": ("date", "data", "booking_date", "value_date", "data_operazione", "data_valuta"),
+    "amount": ("amount", "importo", "value"),
+    "description": ("description", "descrizione", "causale", "payee", "name"),
+    "notes": ("notes", "note", "memo"),
+    "tags": ("tags", "tag"),
+    "account": ("account", "account_id", "conto"),
+    "category": ("category", "category_id", "categoria"),
+}
+_ALIAS_TO_FIELD = {alias: field for field, aliases in FIELD_ALIASES.items() for alias in aliases}
+
+CSV_DELIMITERS = (",", ";", "\t", "|")
+_ISO_DATE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})$")
+_ITALIAN_DATE = re.compile(r"(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})$")
+_COMPACT_DATE = re.compile(r"(\d{4})(\d{2})(\d{2})$")
+TAG_SEPARATORS = re.compile(r"[;,|]")
+
+_OFX_TOKEN = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+_OFX_FIELDS = {"DTPOSTED": "date", "TRNAMT": "amount", "NAME": "description", "MEMO": "notes"}
+
+
+def detect_import_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    """
+    Guess the import format from the upload's filename or content type.
+
+    Raises:
+        ValueError: If the format cannot be determined
+    """
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if name.endswith((".csv", ".tsv", ".txt")) or "csv" in content_type:
+        return IMPORT_FORMAT_CSV
+    if name.endswith((".json", ".ndjson", ".jsonl")) or "json" in content_type:
+        return IMPORT_FORMAT_JSON
+    if name.endswith((".ofx", ".qfx")) or "ofx" in content_type:
+        return IMPORT_FORMAT_OFX
+    raise ValueError(f"Cannot detect import format, specify one of: {', '.join(IMPORT_FORMATS)}")
+
+
+def iter_import_rows(stream: BinaryIO, import_format: str) -> Iterator[ImportRow]:
+    """
+    Read an uploaded file row by row.
+
+    Raises:
+        ValueError: If the format is unknown or the file is unreadable
+    """
+    if import_format not in IMPORT_FORMATS:
+        raise ValueError(f"Invalid format. Must be one of: {', '.join(IMPORT_FORMATS)}")
+
+    # utf-8-sig drops the BOM that spreadsheet exports often add
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    if import_format == IMPORT_FORMAT_CSV:
+        return _iter_csv(text)
+    if import_format == IMPORT_FORMAT_JSON:
+        return _iter_json(text)
+    return _iter_ofx(text)
+
+
+def _normalize_fields(record: Dict[str, object]) -> Dict[str, str]:
+    """Map known header aliases to the normalized field names."""
+    fields = {}
+    for key, value in record.items():
+        field = _ALIAS_TO_FIELD.get(str(key).strip().lower())
+        if field is None or value is None:
+            continue
+        if isinstance(value, list):
+            value = ",".join(str(item) for item in value)
+        value = str(value).strip()
+        if value:
+            fields[field] = value
+    return fields
+
+
+def _iter_csv(text: io.TextIOBase) -> Iterator[ImportRow]:
+    header_line = text.readline()
+    if not header_line.strip():
+        raise ValueError("Empty file")
+
+    # Delimiter: the candidate that splits the header the most (Italian
+    # spreadsheet exports use ';')
+    delimiter = max(CSV_DELIMITERS, key=header_line.count)
+    header = next(csv.reader([header_line], delimiter=delimiter))
+    if not any(name.strip().lower() in _ALIAS_TO_FIELD for name in header):
+        raise ValueError("CSV header has no recognized columns")
+
+    reader = csv.reader(text, delimiter=delimiter)
+    for line_number, values in enumerate(reader, start=2):
+        if not any(value.strip() for value in values):
+            continue
+        if len(values) > len(header):
+            yield line_number, None, f"Expected {len(header)} columns, found {len(values)}"
+            continue
+        yield line_number, _normalize_fields(dict(zip(header, values))), None
+
+
+def _iter_json(text: io.TextIOBase) -> Iterator[ImportRow]:
+    # Peek at the first non-blank character: '[' is a JSON array (loaded at
+    # once), anything else is NDJSON (streamed line by line)
+    first = ""
+    while True:
+        char = text.read(1)
+        if not char or not char.isspace():
+            first = char
+            break
+    if not first:
+        raise ValueError("Empty file")
+
+    if first == "[":
+        try:
+            records = json.loads(first + text.read())
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e.msg} (line {e.lineno})")
+        for index, record in enumerate(records, start=1):
+            if not isinstance(record, dict):
+                yield index, None, "Expected a JSON object"
+                continue
+            yield index, _normalize_fields(record), None
+        return
+
+    lines = _prepend(first, text)
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, _normalize_fields(record), None
+
+
+def _prepend(first: str, text: io.TextIOBase) -> Iterator[str]:
+    """Lines of `text`, with `first` (already consumed) put back in front."""
+    yield first + text.readline()
+    yield from text
+
+
+def _iter_ofx(text: io.TextIOBase) -> Iterator[ImportRow]:
+    # Handles both SGML (OFX 1.x, unclosed leaf tags) and XML (OFX 2.x):
+    # leaf values are read up to the next tag or end of line
+    index = 0
+    current: Optional[Dict[str, str]] = None
+    for line in text:
+        for closing, tag, value in _OFX_TOKEN.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    index += 1
+                    yield index, current, None
+                    current = None
+                elif not closing:
+                    current = {}
+                continue
+            if current is None or closing:
+                continue
+            field = _OFX_FIELDS.get(tag)
+            value = value.strip()
+            if field and value:
+                if field == "date":
+                    value = value[:8]  # YYYYMMDD[HHMMSS[.XXX][TZ]]
+                current[field] = value
+
+
+def parse_import_date(value: str) -> date:
+    """
+    Parse a date in ISO (YYYY-MM-DD), Italian (DD/MM/YYYY, DD-MM-YYYY,
+    DD.MM.YYYY) or OFX (YYYYMMDD) format.
+
+    Raises:
+        ValueError: If the date is not in a supported format
+    """
+    value = value.strip()
+    # Regexes instead of strptime: this runs once per imported row
+    for pattern, order in ((_ISO_DATE, (1, 2, 3)), (_ITALIAN_DATE, (3, 2, 1)), (_COMPACT_DATE, (1, 2, 3))):
+        match = pattern.match(value)
+        if match:
+            year, month, day = (int(match.group(index)) for index in order)
+            try:
+                return date(year, month, day)
+            except ValueError:
+                break
+    raise ValueError(f"Invalid date: {value!r}")
+
+
+def parse_import_amount(value: str) -> Decimal:
+    """
+    Parse a signed amount, accepting both "1,234.56" and "1.234,56" styles
+    and an optional currency symbol.
+
+    Raises:
+        ValueError: If the amount is not a number
+    """
+    cleaned = re.sub(r"[^\d,.\-+]", "", value)
+    if "," in cleaned and "." in cleaned:
+        # The last separator is the decimal one
+        if cleaned.rfind(",") > cleaned.rfind("."):
+            cleaned = cleaned.replace(".", "").replace(",", ".")
+        else:
+            cleaned = cleaned.replace(",", "")
+    elif "," in cleaned:
+        cleaned = cleaned.replace(",", ".")
+    try:
+        amount = Decimal(cleaned)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {value!r}")
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    return amount
+
+
+def parse_import_tags(value: Optional[str]) -> Optional[List[str]]:
+    """Split a tag list ("a;b", "a,b" or "a|b") into clean lowercase tags."""
+    if not value:
+        return None
+    tags = sorted(set(tag.strip().lower() for tag in TAG_SEPARATORS.split(value) if tag.strip()))
+    return tags or None
@@ -0,0 +1,160 @@
+"""
+Concurrency Benchmark
+=====================
+Misura il throughput per worker con richieste concorrenti.
+
+Lancia in parallelo richieste "lente" (analytics su più anni) e, nello
+stesso momento, richieste "veloci" (/health). Se le query bloccano
+l'event loop, la latenza di /health cresce fino alla durata delle query
+lente; con gli endpoint sync eseguiti nel thread pool resta bassa.
+
+Avviare il server con un solo worker per misurare il throughput per worker:
+    uvicorn app.main:app --workers 1 --port 8000
+
+Uso:
+    python bench_concurrency.py --email me@test.com --password secret
+    python bench_concurrency.py --concurrency 32 --requests 400
+    python bench_concurrency.py --slow-path "/api/v1/analytics/by-category?rollup=true"
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+
+DEFAULT_SLOW_PATH = "/api/v1/analytics/multi-year-comparison?last_n=5"
+DEFAULT_FAST_PATH = "/health"
+
+
+def percentile(values, pct):
+    """Percentile (nearest-rank) of a list of floats."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def get_token(client: httpx.AsyncClient, email: str, password: str) -> str:
+    """Login, registering the user first if it does not exist."""
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": email, "password": password}
+    )
+    if response.status_code == 401:
+        await client.post("/api/v1/auth/register", json={
+            "email": email,
+            "password": password,
+            "full_name": "Benchmark User"
+        })
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": email, "password": password}
+        )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    path: str,
+    total: int,
+    concurrency: int,
+    headers: dict
+) -> dict:
+    """Send `total` GET requests to `path` with at most `concurrency` in flight."""
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "path": path,
+        "requests": total,
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": total / elapsed if elapsed > 0 else 0.0,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "max": max(latencies) * 1000 if latencies else 0.0,
+        "mean": statistics.mean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def report(title: str, stats: dict) -> None:
+    print(f"\n── {title} {'─' * (54 - len(title))}")
+    print(f"  path        : {stats['path']}")
+    print(f"  requests    : {stats['requests']} ({stats['errors']} errori)")
+    print(f"  durata      : {stats['elapsed']:.2f} s")
+    print(f"  throughput  : {stats['throughput']:.1f} req/s")
+    print(f"  latenza ms  : p50 {stats['p50']:.1f} | p95 {stats['p95']:.1f} | "
+          f"max {stats['max']:.1f} | media {stats['mean']:.1f}")
+
+
+async def main(args) -> int:
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+        token = await get_token(client, args.email, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        # Warm-up (connessioni, cache del piano delle query)
+        await run_load(client, args.slow_path, min(10, args.requests), args.concurrency, headers)
+
+        # 1. Solo richieste lente: throughput del worker
+        slow_only = await run_load(client, args.slow_path, args.requests, args.concurrency, headers)
+        report("Richieste lente (da sole)", slow_only)
+
+        # 2. Baseline richieste veloci senza carico
+        fast_idle = await run_load(client, args.fast_path, args.fast_requests, 4, {})
+        report("Richieste veloci (senza carico)", fast_idle)
+
+        # 3. Veloci durante il carico lento: misura il blocco dell'event loop
+        slow_task = asyncio.create_task(
+            run_load(client, args.slow_path, args.requests, args.concurrency, headers)
+        )
+        await asyncio.sleep(0.2)
+        fast_loaded = await run_load(client, args.fast_path, args.fast_requests, 4, {})
+        slow_loaded = await slow_task
+        report("Richieste lente (con veloci in parallelo)", slow_loaded)
+        report("Richieste veloci (durante il carico)", fast_loaded)
+
+        ratio = fast_loaded["p95"] / fast_idle["p95"] if fast_idle["p95"] else 0.0
+        print(f"\n  p95 /health sotto carico: {ratio:.1f}x rispetto a riposo")
+
+        failed = slow_only["errors"] + slow_loaded["errors"] + fast_loaded["errors"]
+        return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrency benchmark per worker")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL del server")
+    parser.add_argument("--email", default=f"bench_{uuid.uuid4().hex[:8]}@example.com")
+    parser.add_argument("--password", default="BenchPassword123!")
+    parser.add_argument("--concurrency", type=int, default=16, help="Richieste lente in parallelo")
+    parser.add_argument("--requests", type=int, default=200, help="Numero di richieste lente")
+    parser.add_argument("--fast-requests", type=int, default=100, help="Numero di richieste veloci")
+    parser.add_argument("--slow-path", default=DEFAULT_SLOW_PATH)
+    parser.add_argument("--fast-path", default=DEFAULT_FAST_PATH)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout per richiesta (s)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
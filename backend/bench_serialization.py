@@ -0,0 +1,170 @@
+"""
+Serialization Benchmark
+=======================
+Misura il costo della serializzazione JSON e l'effetto della compressione.
+
+1. In-process (senza server): codifica di payload sintetici con la forma
+   di /analytics/daily-breakdown su un anno e di una lista di 500
+   transazioni, confrontando jsonable_encoder + json della stdlib (il
+   percorso di default di FastAPI) con l'encoder orjson dell'app.
+2. HTTP: latenza p50/p95 e byte trasferiti degli endpoint analytics e
+   lista con Accept-Encoding identity, gzip e br.
+
+Gli endpoint analytics sono in cache (X-Cache): per misurare il percorso
+completo a ogni richiesta avviare il server con CACHE_ENABLED=false.
+    CACHE_ENABLED=false uvicorn app.main:app --workers 1 --port 8000
+
+Uso:
+    python bench_serialization.py --email me@test.com --password secret
+    python bench_serialization.py --local-only
+    python bench_serialization.py --requests 100 --path "/api/v1/transactions/?limit=500"
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+
+from app.utils.serialization import dumps
+from bench_concurrency import get_token, percentile
+
+DEFAULT_PATHS = [
+    "/api/v1/analytics/daily-breakdown?start_date={year}-01-01&end_date={year}-12-31",
+    "/api/v1/analytics/balance-history?start_date={year}-01-01",
+    "/api/v1/analytics/by-category?rollup=true",
+    "/api/v1/transactions/?limit=500",
+    "/api/v1/categories/tree?include_counts=true",
+]
+ENCODINGS = ["identity", "gzip", "br"]
+
+
+def sample_payloads(seed: int) -> dict:
+    """Synthetic payloads shaped like the real responses, with Decimal amounts."""
+    rng = random.Random(seed)
+
+    def amount() -> Decimal:
+        return Decimal(rng.randint(0, 500000)) / 100
+
+    start = date(date.today().year, 1, 1)
+    daily = {
+        "start_date": start,
+        "end_date": start + timedelta(days=364),
+        "days": [
+            {
+                "date": start + timedelta(days=offset),
+                "income": amount(),
+                "expense_necessity": amount(),
+                "expense_extra": amount(),
+                "net": amount() - amount(),
+                "transaction_count": rng.randint(0, 40),
+            }
+            for offset in range(365)
+        ],
+    }
+    transactions = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": uuid.uuid4(),
+            "account_id": uuid.uuid4(),
+            "category_id": uuid.uuid4(),
+            "amount": amount(),
+            "type": rng.choice(["income", "expense_necessity", "expense_extra"]),
+            "date": start + timedelta(days=rng.randint(0, 364)),
+            "description": f"Transazione {index}",
+            "notes": None,
+            "tags": ["spesa", "casa"],
+            "is_recurring": False,
+            "recurring_frequency": None,
+            "created_at": datetime.now(),
+            "updated_at": datetime.now(),
+        }
+        for index in range(500)
+    ]
+    return {"daily-breakdown (365 giorni)": daily, "transactions (500)": transactions}
+
+
+def time_encoder(encode, payload, rounds: int) -> float:
+    """Median time in ms of `encode(payload)`."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        encode(payload)
+        timings.append(time.perf_counter() - start)
+    return percentile(timings, 50) * 1000
+
+
+def bench_local(args) -> None:
+    print("\nEncoder (in-process, mediana):")
+    stdlib = lambda payload: json.dumps(jsonable_encoder(payload)).encode("utf-8")
+    for name, payload in sample_payloads(args.seed).items():
+        assert json.loads(stdlib(payload)) == json.loads(dumps(payload))
+        before = time_encoder(stdlib, payload, args.rounds)
+        after = time_encoder(dumps, payload, args.rounds)
+        print(f"  {name:<28} stdlib {before:7.2f} ms | orjson {after:6.2f} ms | x{before / after:5.1f}")
+
+
+async def measure(client: httpx.AsyncClient, path: str, encoding: str, total: int, headers: dict) -> dict:
+    """Sequential GETs: latency and bytes on the wire (before decompression)."""
+    latencies = []
+    size = 0
+    for _ in range(total):
+        start = time.perf_counter()
+        async with client.stream("GET", path, headers={**headers, "Accept-Encoding": encoding}) as response:
+            response.raise_for_status()
+            size = 0
+            async for raw in response.aiter_raw():
+                size += len(raw)
+        latencies.append(time.perf_counter() - start)
+    return {
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "bytes": size,
+    }
+
+
+async def bench_http(args) -> int:
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(base_url=args.url, timeout=timeout) as client:
+        token = await get_token(client, args.email, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+        year = date.today().year
+
+        for path in args.path or DEFAULT_PATHS:
+            path = path.format(year=year)
+            print(f"\n{path}")
+            for encoding in ENCODINGS:
+                stats = await measure(client, path, encoding, args.requests, headers)
+                print(
+                    f"  {encoding:<9} {stats['bytes']:>9,} byte | "
+                    f"p50 {stats['p50']:7.1f} ms | p95 {stats['p95']:7.1f} ms"
+                )
+    return 0
+
+
+def main(args) -> int:
+    bench_local(args)
+    if args.local_only:
+        return 0
+    return asyncio.run(bench_http(args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark di serializzazione e compressione")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL del server")
+    parser.add_argument("--email", default=f"bench_{uuid.uuid4().hex[:8]}@example.com")
+    parser.add_argument("--password", default="BenchPassword123!")
+    parser.add_argument("--requests", type=int, default=30, help="Richieste per endpoint e encoding")
+    parser.add_argument("--rounds", type=int, default=50, help="Ripetizioni del benchmark in-process")
+    parser.add_argument("--path", action="append", help="Endpoint da misurare (ripetibile)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed dei payload sintetici")
+    parser.add_argument("--local-only", action="store_true", help="Solo il benchmark in-process")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout per richiesta (s)")
+    sys.exit(main(parser.parse_args()))
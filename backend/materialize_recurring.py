@@ -0,0 +1,102 @@
+"""
+Materialize Recurring Transactions
+==================================
+Genera le occorrenze dovute delle transazioni ricorrenti (is_recurring),
+per tutti gli utenti, a lotti.
+
+Ogni occorrenza è una transazione normale con recurring_parent_id = id del
+modello. La chiave (recurring_parent_id, date) è unica: rieseguire lo
+script non crea duplicati. Dopo un periodo di inattività recupera tutte le
+occorrenze arretrate. Più processi possono girare in parallelo (--workers o
+più istanze): i modelli sono presi con FOR UPDATE SKIP LOCKED.
+
+Da eseguire periodicamente, ad esempio da cron ogni notte:
+    5 0 * * *  cd /app && python materialize_recurring.py
+
+Uso:
+    python materialize_recurring.py                        # fino a oggi
+    python materialize_recurring.py --until 2026-12-31     # fino a una data
+    python materialize_recurring.py --user me@test.com     # solo un utente
+    python materialize_recurring.py --workers 4            # 4 processi in parallelo
+    python materialize_recurring.py --interval 3600        # in loop, ogni ora
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from app.database import SessionLocal
+from app.crud import user as user_crud
+from app.crud.transaction import MATERIALIZE_BATCH_SIZE, materialize_recurring_transactions
+
+
+def materialize(until, batch_size: int, user_id) -> dict:
+    """One worker: materialize batches until none is due."""
+    db = SessionLocal()
+    try:
+        return materialize_recurring_transactions(
+            db,
+            until=until,
+            batch_size=batch_size,
+            user_id=user_id
+        )
+    finally:
+        db.close()
+
+
+def run_once(args) -> int:
+    user_id = None
+    if args.user:
+        db = SessionLocal()
+        try:
+            user = user_crud.get_user_by_email(db, args.user)
+        finally:
+            db.close()
+        if not user:
+            print(f"❌ Utente non trovato: {args.user}")
+            return 2
+        user_id = user.id
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        # spawn: each worker opens its own connections
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(args.workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(materialize, args.until, args.batch_size, user_id)
+                for _ in range(args.workers)
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = [materialize(args.until, args.batch_size, user_id)]
+    elapsed = time.perf_counter() - start
+
+    total = {key: sum(result[key] for result in results) for key in results[0]}
+    print(
+        f"✅ {total['occurrences']} occorrenze create da {total['templates']} "
+        f"modelli in {total['batches']} lotti ({elapsed:.1f}s)"
+    )
+    return 0
+
+
+def main(args) -> int:
+    if not args.interval:
+        return run_once(args)
+    while True:
+        status = run_once(args)
+        if status:
+            return status
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera le occorrenze delle transazioni ricorrenti")
+    parser.add_argument("--until", type=date.fromisoformat, help="Ultima data da generare (default: oggi)")
+    parser.add_argument("--user", help="Email dell'utente (default: tutti)")
+    parser.add_argument("--batch-size", type=int, default=MATERIALIZE_BATCH_SIZE, help="Modelli per lotto")
+    parser.add_argument("--workers", type=int, default=1, help="Processi in parallelo")
+    parser.add_argument("--interval", type=int, default=0, help="Ripete ogni N secondi (default: una volta)")
+    sys.exit(main(parser.parse_args()))
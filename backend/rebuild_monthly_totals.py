@@ -0,0 +1,64 @@
+"""
+Rebuild Monthly Totals
+======================
+Ricostruisce la tabella aggregata transaction_monthly_totals a partire da
+`transactions` (backfill e riparazione di eventuali disallineamenti).
+
+La tabella è mantenuta in modo incrementale dalle CRUD delle transazioni;
+questo script serve dopo import/modifiche manuali al DB o per verificare
+che l'aggregato sia allineato.
+
+Uso:
+    python rebuild_monthly_totals.py                    # ricostruisce tutto
+    python rebuild_monthly_totals.py --user me@test.com # solo un utente
+    python rebuild_monthly_totals.py --check            # solo verifica, exit 1 se disallineato
+"""
+
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.crud import user as user_crud
+from app.crud.monthly_total import find_monthly_total_drift, rebuild_monthly_totals
+
+
+def main(args) -> int:
+    db = SessionLocal()
+    try:
+        user_id = None
+        if args.user:
+            user = user_crud.get_user_by_email(db, args.user)
+            if not user:
+                print(f"❌ Utente non trovato: {args.user}")
+                return 2
+            user_id = user.id
+
+        drift = find_monthly_total_drift(db, user_id)
+        if args.check:
+            for row in drift[:args.limit]:
+                print(
+                    f"  {row['user_id']} {row['month']:%Y-%m} {row['type']:<17} "
+                    f"account {row['account_id']} category {row['category_id']}: "
+                    f"salvato {row['stored_total']} ({row['stored_count']}) "
+                    f"≠ atteso {row['expected_total']} ({row['expected_count']})"
+                )
+            if drift:
+                print(f"❌ {len(drift)} righe disallineate")
+                return 1
+            print("✅ Aggregati mensili allineati")
+            return 0
+
+        rows = rebuild_monthly_totals(db, user_id)
+        db.commit()
+        print(f"✅ Ricostruite {rows} righe ({len(drift)} erano disallineate)")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ricostruisce transaction_monthly_totals")
+    parser.add_argument("--user", help="Email dell'utente da ricostruire (default: tutti)")
+    parser.add_argument("--check", action="store_true", help="Solo verifica, non modifica nulla")
+    parser.add_argument("--limit", type=int, default=20, help="Righe disallineate da mostrare con --check")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,74 @@
+"""
+Reconcile Balances
+==================
+Confronta current_balance di tutti gli account con il saldo ricalcolato
+da initial_balance, transazioni e trasferimenti (commissioni e tassi di
+cambio inclusi). Il calcolo è una sola query SQL: nessun oggetto ORM viene
+caricato, anche con centinaia di migliaia di account.
+
+Pensato per un controllo notturno (cron), ad esempio:
+    0 3 * * *  cd /app && python reconcile_balances.py || notify-drift
+
+Uso:
+    python reconcile_balances.py                    # solo verifica, exit 1 se ci sono differenze
+    python reconcile_balances.py --user me@test.com # solo un utente
+    python reconcile_balances.py --fix              # corregge i saldi disallineati
+"""
+
+import argparse
+import sys
+import time
+
+from app.database import SessionLocal
+from app.crud import user as user_crud
+from app.crud.account import find_balance_discrepancies, fix_balances
+
+
+def main(args) -> int:
+    db = SessionLocal()
+    try:
+        user_id = None
+        if args.user:
+            user = user_crud.get_user_by_email(db, args.user)
+            if not user:
+                print(f"❌ Utente non trovato: {args.user}")
+                return 2
+            user_id = user.id
+
+        start = time.perf_counter()
+        discrepancies = find_balance_discrepancies(db, user_id)
+        elapsed = time.perf_counter() - start
+
+        for item in discrepancies[:args.limit]:
+            print(
+                f"  {item['user_id']} {item['account_name']!r} ({item['account_id']}): "
+                f"attuale {item['current_balance']} ≠ calcolato {item['calculated_balance']} "
+                f"(diff {item['difference']})"
+            )
+        if len(discrepancies) > args.limit:
+            print(f"  … e altri {len(discrepancies) - args.limit}")
+
+        if not discrepancies:
+            print(f"✅ Tutti i saldi sono allineati ({elapsed:.2f} s)")
+            return 0
+
+        print(f"⚠️  {len(discrepancies)} account disallineati ({elapsed:.2f} s)")
+        if not args.fix:
+            return 1
+
+        fixed = fix_balances(db, user_id)
+        db.commit()
+        print(f"✅ Corretti {len(fixed)} saldi")
+        if len(fixed) < len(discrepancies):
+            print("   (gli account modificati durante la correzione sono stati saltati: rilanciare)")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verifica e correzione dei saldi degli account")
+    parser.add_argument("--user", help="Email dell'utente da verificare (default: tutti)")
+    parser.add_argument("--fix", action="store_true", help="Corregge i saldi disallineati")
+    parser.add_argument("--limit", type=int, default=20, help="Account disallineati da mostrare")
+    sys.exit(main(parser.parse_args()))
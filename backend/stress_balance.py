@@ -0,0 +1,277 @@
+"""
+Balance Stress Test
+===================
+Verifica che current_balance resti corretto sotto scritture concorrenti.
+
+Crea due account e due categorie per un utente di test, poi lancia in
+parallelo transazioni (entrate/uscite), trasferimenti fra i due account
+(con commissione) e cancellazioni, tutti sugli stessi due account.
+Segue una fase di corse sulla stessa riga: più DELETE e più PUT simultanei
+della stessa transazione o dello stesso trasferimento, che devono essere
+applicati una volta sola (un solo 204, gli altri 404) e lasciare il saldo
+coerente con l'ultimo importo scritto. A fine carico confronta:
+- il saldo restituito da /accounts/{id} con quello atteso calcolato dal
+  client sulle sole richieste andate a buon fine;
+- il saldo con /accounts/verify-balances (ricalcolo da transazioni e
+  trasferimenti).
+
+Con aggiornamenti read-modify-write in Python le scritture concorrenti si
+sovrascrivono e il saldo finale non torna; con gli incrementi atomici in
+SQL deve tornare sempre al centesimo.
+
+Avviare il server con più worker per avere vera concorrenza sul DB:
+    uvicorn app.main:app --workers 4 --port 8000
+
+Uso:
+    python stress_balance.py
+    python stress_balance.py --concurrency 64 --requests 2000
+    python stress_balance.py --races 100 --duplicates 8
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import httpx
+
+from bench_concurrency import get_token, percentile
+
+
+async def post(client: httpx.AsyncClient, path: str, payload: dict, headers: dict) -> dict:
+    response = await client.post(path, json=payload, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+async def setup(client: httpx.AsyncClient, headers: dict) -> dict:
+    """Create the two accounts and the income/expense categories."""
+    suffix = uuid.uuid4().hex[:6]
+    checking = await post(client, "/api/v1/accounts/", {
+        "name": f"Stress conto {suffix}", "type": "checking", "initial_balance": "1000.00"
+    }, headers)
+    savings = await post(client, "/api/v1/accounts/", {
+        "name": f"Stress risparmi {suffix}", "type": "savings", "initial_balance": "0.00"
+    }, headers)
+    income = await post(client, "/api/v1/categories/", {
+        "name": f"Stress entrate {suffix}", "type": "income"
+    }, headers)
+    expense = await post(client, "/api/v1/categories/", {
+        "name": f"Stress uscite {suffix}", "type": "expense_extra"
+    }, headers)
+    return {
+        "checking": checking["id"],
+        "savings": savings["id"],
+        "income": income["id"],
+        "expense": expense["id"],
+        "initial": {checking["id"]: Decimal("1000.00"), savings["id"]: Decimal("0.00")},
+    }
+
+
+async def run_stress(client: httpx.AsyncClient, ids: dict, args, headers: dict) -> dict:
+    """Fire the mixed write load and track the expected balance of each account."""
+    expected = dict(ids["initial"])
+    created = []  # (kind, id, {account_id: delta}) of successful creations
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+    rng = random.Random(args.seed)
+    today = date.today().isoformat()
+
+    def apply(effect: dict, sign: int) -> None:
+        for account_id, delta in effect.items():
+            expected[account_id] += sign * delta
+
+    async def one(op: str) -> None:
+        nonlocal errors
+        amount = Decimal(rng.randint(1, 10000)) / 100
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if op == "delete" and created:
+                    kind, item_id, effect = created.pop(rng.randrange(len(created)))
+                    response = await client.delete(f"/api/v1/{kind}/{item_id}", headers=headers)
+                    if response.status_code == 204:
+                        apply(effect, -1)
+                    else:
+                        errors += 1
+                elif op == "transfer":
+                    source, target = (ids["checking"], ids["savings"])
+                    if rng.random() < 0.5:
+                        source, target = target, source
+                    fee = Decimal("0.50")
+                    response = await client.post("/api/v1/transfers/", json={
+                        "from_account_id": source, "to_account_id": target, "type": "generic",
+                        "amount": str(amount), "fee": str(fee), "date": today,
+                        "description": "stress"
+                    }, headers=headers)
+                    if response.status_code == 201:
+                        effect = {source: -(amount + fee), target: amount}
+                        apply(effect, 1)
+                        created.append(("transfers", response.json()["id"], effect))
+                    else:
+                        errors += 1
+                else:
+                    is_income = rng.random() < 0.5
+                    response = await client.post("/api/v1/transactions/", json={
+                        "account_id": ids["checking"],
+                        "category_id": ids["income"] if is_income else ids["expense"],
+                        "amount": str(amount), "date": today, "description": "stress"
+                    }, headers=headers)
+                    if response.status_code == 201:
+                        effect = {ids["checking"]: amount if is_income else -amount}
+                        apply(effect, 1)
+                        created.append(("transactions", response.json()["id"], effect))
+                    else:
+                        errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    operations = rng.choices(["transaction", "transfer", "delete"], weights=[5, 3, 2], k=args.requests)
+    start = time.perf_counter()
+    await asyncio.gather(*(one(op) for op in operations))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "expected": expected,
+        "created": created,
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": args.requests / elapsed if elapsed > 0 else 0.0,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+    }
+
+
+def effect_of(kind: str, item: dict) -> dict:
+    """Balance effect of a transaction or transfer as returned by the API."""
+    amount = Decimal(str(item["amount"]))
+    if kind == "transactions":
+        return {item["account_id"]: amount if item["type"] == "income" else -amount}
+    fee = Decimal(str(item["fee"]))
+    return {item["from_account_id"]: -(amount + fee), item["to_account_id"]: amount}
+
+
+async def run_races(client: httpx.AsyncClient, stats: dict, args, headers: dict) -> dict:
+    """
+    Fire duplicate concurrent DELETEs and PUTs at the same rows.
+
+    Each delete target must be removed exactly once; each update target
+    must end with its balance effect matching the amount finally stored.
+    """
+    expected = stats["expected"]
+    created = stats["created"]
+    rng = random.Random(args.seed + 1)
+    rng.shuffle(created)
+    deletes, updates = created[:args.races], created[args.races:2 * args.races]
+    del created[:2 * args.races]
+    result = {"deleted": 0, "double_deletes": 0, "updated": 0, "errors": 0}
+
+    def apply(effect: dict, sign: int) -> None:
+        for account_id, delta in effect.items():
+            expected[account_id] += sign * delta
+
+    async def delete_race(kind: str, item_id: str, effect: dict) -> None:
+        responses = await asyncio.gather(*(
+            client.delete(f"/api/v1/{kind}/{item_id}", headers=headers)
+            for _ in range(args.duplicates)
+        ), return_exceptions=True)
+        codes = [getattr(response, "status_code", None) for response in responses]
+        wins = codes.count(204)
+        result["errors"] += sum(code not in (204, 404) for code in codes)
+        if wins:
+            apply(effect, -1)
+            result["deleted"] += 1
+        result["double_deletes"] += max(wins - 1, 0)
+
+    async def update_race(kind: str, item_id: str, effect: dict) -> None:
+        responses = await asyncio.gather(*(
+            client.put(f"/api/v1/{kind}/{item_id}", json={
+                "amount": str(Decimal(rng.randint(1, 10000)) / 100)
+            }, headers=headers)
+            for _ in range(args.duplicates)
+        ), return_exceptions=True)
+        result["errors"] += sum(getattr(response, "status_code", None) != 200 for response in responses)
+        response = await client.get(f"/api/v1/{kind}/{item_id}", headers=headers)
+        response.raise_for_status()
+        apply(effect, -1)
+        apply(effect_of(kind, response.json()), 1)
+        result["updated"] += 1
+
+    semaphore = asyncio.Semaphore(max(args.concurrency // args.duplicates, 1))
+
+    async def bounded(race, entry) -> None:
+        async with semaphore:
+            await race(*entry)
+
+    await asyncio.gather(
+        *(bounded(delete_race, entry) for entry in deletes),
+        *(bounded(update_race, entry) for entry in updates)
+    )
+    return result
+
+
+async def main(args) -> int:
+    timeout = httpx.Timeout(args.timeout)
+    # Keep-alive più breve di quello di uvicorn (5 s): evita di riusare
+    # connessioni già chiuse dal server, che farebbero fallire una POST
+    # senza sapere se è stata eseguita
+    limits = httpx.Limits(max_connections=args.concurrency * 2, keepalive_expiry=2.0)
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+        token = await get_token(client, args.email, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+        ids = await setup(client, headers)
+
+        stats = await run_stress(client, ids, args, headers)
+        print(f"  requests    : {args.requests} ({stats['errors']} errori)")
+        print(f"  durata      : {stats['elapsed']:.2f} s")
+        print(f"  throughput  : {stats['throughput']:.1f} req/s")
+        print(f"  latenza ms  : p50 {stats['p50']:.1f} | p95 {stats['p95']:.1f}")
+
+        races = await run_races(client, stats, args, headers)
+        print(
+            f"  corse       : {races['deleted']} righe cancellate, {races['updated']} aggiornate "
+            f"da {args.duplicates} richieste simultanee ({races['errors']} errori)"
+        )
+        if races["double_deletes"]:
+            print(f"  ❌ cancellazioni doppie: {races['double_deletes']}")
+
+        ok = True
+        for name in ("checking", "savings"):
+            account_id = ids[name]
+            response = await client.get(f"/api/v1/accounts/{account_id}", headers=headers)
+            response.raise_for_status()
+            actual = Decimal(str(response.json()["current_balance"]))
+            expected = stats["expected"][account_id]
+            mark = "✅" if actual == expected else "❌"
+            ok = ok and actual == expected
+            print(f"  {mark} {name:<9}: saldo {actual} (atteso {expected})")
+
+        response = await client.get("/api/v1/accounts/verify-balances", headers=headers)
+        response.raise_for_status()
+        drift = response.json()["discrepancies_count"]
+        print(f"  {'✅' if drift == 0 else '❌'} verify-balances: {drift} discrepanze")
+
+        if stats["errors"] and not ok:
+            print("  (con errori di rete il saldo atteso può non tenere conto di richieste eseguite)")
+        return 0 if ok and drift == 0 and not races["double_deletes"] else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stress test dei saldi sotto scritture concorrenti")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL del server")
+    parser.add_argument("--email", default=f"stress_{uuid.uuid4().hex[:8]}@example.com")
+    parser.add_argument("--password", default="StressPassword123!")
+    parser.add_argument("--concurrency", type=int, default=32, help="Richieste in parallelo")
+    parser.add_argument("--requests", type=int, default=1000, help="Numero di scritture")
+    parser.add_argument("--races", type=int, default=50, help="Righe per le corse di DELETE e di PUT")
+    parser.add_argument("--duplicates", type=int, default=4, help="Richieste simultanee sulla stessa riga")
+    parser.add_argument("--seed", type=int, default=42, help="Seed per importi e operazioni")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout per richiesta (s)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -26,6 +26,7 @@ Uso:
 
 import argparse
 import sys
+import uuid
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
@@ -263,6 +264,13 @@ class Suite:
             status, body = self.req("GET", f"/api/v1/accounts/{self.account_id}")
             self.check(status == 200, f"GET /accounts/{{id}} → 200")
 
+        # CONDITIONAL GET: stesso ETag → 304 senza corpo
+        url = f"{self.base}/api/v1/accounts"
+        etag = requests.get(url, headers=self.headers, timeout=10).headers.get("ETag")
+        self.check(bool(etag), "GET /accounts → header ETag presente")
+        resp = requests.get(url, headers={**self.headers, "If-None-Match": etag or ""}, timeout=10)
+        self.check(resp.status_code == 304 and not resp.content, "If-None-Match con ETag attuale → 304")
+
         # UPDATE
         if self.account_id:
             status, body = self.req("PUT", f"/api/v1/accounts/{self.account_id}", {
@@ -272,6 +280,10 @@ class Suite:
             self.check(status == 200, "PUT /accounts/{id} → 200")
             self.check(body.get("name") == "Conto Corrente Aggiornato", "nome aggiornato")
 
+            resp = requests.get(url, headers={**self.headers, "If-None-Match": etag or ""}, timeout=10)
+            self.check(resp.status_code == 200 and resp.headers.get("ETag") != etag,
+                       "dopo una modifica, If-None-Match con ETag vecchio → 200 con nuovo ETag")
+
         # SUMMARY
         status, body = self.req("GET", "/api/v1/accounts/summary")
         self.check(status == 200, "GET /accounts/summary → 200")
@@ -334,6 +346,24 @@ class Suite:
         # TREE
         status, body = self.req("GET", "/api/v1/categories/tree")
         self.check(status == 200, "GET /categories/tree → 200")
+        if status == 200:
+            income_ids = [c["id"] for c in body.get("income", [])]
+            self.check(self.cat_income_id in income_ids, "tree contiene la categoria income creata")
+
+        status, body = self.req("GET", "/api/v1/categories/tree", params={"include_counts": "true"})
+        self.check(status == 200, "GET /categories/tree?include_counts=true → 200")
+        if status == 200:
+            nodes = [c for group in body.values() for c in group]
+            self.check(
+                all(isinstance(c.get("transaction_count"), int) for c in nodes),
+                "transaction_count presente su ogni categoria"
+            )
+
+        # DETAIL con sottocategorie
+        if self.cat_income_id:
+            status, body = self.req("GET", f"/api/v1/categories/{self.cat_income_id}")
+            self.check(status == 200, "GET /categories/{id} → 200")
+            self.check(len(body.get("subcategories", [])) >= 1, "sottocategorie presenti nel dettaglio")
 
         # UPDATE
         if self.cat_expense_id:
@@ -396,6 +426,85 @@ class Suite:
         status, body = self.req("GET", "/api/v1/transactions")
         self.check(status == 200, "GET /transactions → 200")
         self.check(isinstance(body, list), "Risposta è lista")
+        all_ids = [t["id"] for t in body] if isinstance(body, list) else []
+
+        # PAGE (cursor): stesse transazioni della lista, una per pagina
+        paged_ids, cursor = [], None
+        for _ in range(len(all_ids) + 1):
+            params = {"limit": 1, **({"cursor": cursor} if cursor else {})}
+            status, body = self.req("GET", "/api/v1/transactions/page", params=params)
+            if status != 200:
+                break
+            paged_ids += [t["id"] for t in body.get("items", [])]
+            cursor = body.get("next_cursor")
+            if not cursor:
+                break
+        self.check(status == 200, "GET /transactions/page → 200")
+        self.check(paged_ids == all_ids, "pagine con cursore = lista completa, stesso ordine")
+
+        status, _ = self.req("GET", "/api/v1/transactions/page", params={"cursor": "non-valido"})
+        self.check(status == 400, "GET /transactions/page con cursore non valido → 400")
+
+        # SEARCH full-text (prefisso sull'ultima parola)
+        status, body = self.req("GET", "/api/v1/transactions",
+                                params={"search": "stipen", "search_mode": "fulltext"})
+        self.check(status == 200, "GET /transactions?search_mode=fulltext → 200")
+        if isinstance(body, list):
+            self.check(self.transaction_id in [t["id"] for t in body],
+                       "fulltext 'stipen' trova 'Stipendio test'")
+
+        status, _ = self.req("GET", "/api/v1/transactions",
+                             params={"search": "x", "search_mode": "regex"})
+        self.check(status == 400, "GET /transactions con search_mode non valido → 400")
+
+        # SPARSE FIELDSET
+        status, body = self.req("GET", "/api/v1/transactions", params={"fields": "id,amount"})
+        self.check(status == 200, "GET /transactions?fields=id,amount → 200")
+        if isinstance(body, list) and body:
+            self.check(all(set(t) == {"id", "amount"} for t in body),
+                       "fields=id,amount restituisce solo id e amount")
+
+        status, _ = self.req("GET", "/api/v1/transactions", params={"fields": "id,inesistente"})
+        self.check(status == 400, "GET /transactions con campo sconosciuto → 400")
+
+        # RICORRENTE: modello con prossima occorrenza programmata
+        status, body = self.req("POST", "/api/v1/transactions", {
+            "account_id": self.account_id,
+            "category_id": self.cat_income_id,
+            "amount": 10.0,
+            "date": today,
+            "description": "Ricorrente test",
+            "is_recurring": True,
+            "recurring_frequency": "monthly",
+        })
+        if self.check(status == 201, "POST /transactions (ricorrente) → 201"):
+            self.check((body.get("next_occurrence_date") or "") > today,
+                       f"next_occurrence_date futura ({body.get('next_occurrence_date')})")
+            self.req("DELETE", f"/api/v1/transactions/{body['id']}")
+
+        # Modello con data passata: nessun recupero delle occorrenze precedenti a oggi
+        status, body = self.req("POST", "/api/v1/transactions", {
+            "account_id": self.account_id,
+            "category_id": self.cat_income_id,
+            "amount": 10.0,
+            "date": (date.today() - timedelta(days=90)).isoformat(),
+            "description": "Ricorrente passata test",
+            "is_recurring": True,
+            "recurring_frequency": "weekly",
+        })
+        if self.check(status == 201, "POST /transactions (ricorrente con data passata) → 201"):
+            self.check((body.get("next_occurrence_date") or "") >= today,
+                       f"data passata: next_occurrence_date da oggi ({body.get('next_occurrence_date')})")
+            self.req("DELETE", f"/api/v1/transactions/{body['id']}")
+
+        status, _ = self.req("POST", "/api/v1/transactions", {
+            "account_id": self.account_id,
+            "category_id": self.cat_income_id,
+            "amount": 10.0,
+            "date": today,
+            "recurring_frequency": "monthly",
+        })
+        self.check(status == 422, "POST /transactions con frequenza ma non ricorrente → 422")
 
         # SUMMARY
         status, body = self.req("GET", "/api/v1/transactions/summary")
@@ -421,6 +530,87 @@ class Suite:
             self.check(status == 200, "PUT /transactions/{id} → 200")
             self.check(body.get("description") == "Stipendio test aggiornato", "descrizione aggiornata")
 
+            # TAG: filtro any/all e facet
+            status, _ = self.req("PUT", f"/api/v1/transactions/{self.transaction_id}", {
+                "tags": ["Test-Tag", "stipendio"],
+            })
+            self.check(status == 200, "PUT /transactions/{id} con tag → 200")
+
+            status, body = self.req("GET", "/api/v1/transactions",
+                                    params={"tags": ["test-tag", "assente"], "tag_match": "all"})
+            self.check(status == 200 and body == [], "tags=test-tag,assente (all) → nessun risultato")
+            status, body = self.req("GET", "/api/v1/transactions",
+                                    params={"tags": ["test-tag", "assente"], "tag_match": "any"})
+            self.check(status == 200 and [t["id"] for t in body] == [self.transaction_id],
+                       "tags=test-tag,assente (any) → la transazione taggata")
+
+            status, body = self.req("GET", "/api/v1/transactions/tags")
+            self.check(status == 200, "GET /transactions/tags → 200")
+            facets = {f["tag"]: f for f in body} if isinstance(body, list) else {}
+            facet = facets.get("test-tag", {})
+            self.check(facet.get("transaction_count") == 1, "facet test-tag: 1 transazione")
+            self.check(float(facet.get("total_income", 0)) == 1500.0, "facet test-tag: income 1500")
+
+            status, _ = self.req("GET", "/api/v1/transactions/tags", params={"tag_match": "qualcuno"})
+            self.check(status == 400, "GET /transactions/tags con tag_match non valido → 400")
+
+        # IMPORT (dry run: i saldi verificati nei test successivi non cambiano)
+        if self.cat_expense_id:
+            csv_data = (
+                "data;importo;descrizione;categoria\n"
+                f"15/01/2025;-12,50;Import test;{self.cat_expense_id}\n"
+                f"2025-01-16;abc;Importo non valido;{self.cat_expense_id}\n"
+                f"2025-01-17;-10000000000000;Importo fuori scala;{self.cat_expense_id}\n"
+                f"2025-01-18;-1,00;Byte \x00 nullo;{self.cat_expense_id}\n"
+            )
+            try:
+                resp = requests.post(
+                    f"{self.base}/api/v1/transactions/import",
+                    params={"account_id": self.account_id, "dry_run": "true"},
+                    files={"file": ("export.csv", csv_data.encode(), "text/csv")},
+                    headers=self.headers,
+                    timeout=10,
+                )
+                status, body = resp.status_code, resp.json()
+            except Exception as e:
+                status, body = 0, {"error": str(e)}
+            self.check(status == 200, "POST /transactions/import (dry run) → 200")
+            if status == 200:
+                self.check(body.get("imported") == 1 and body.get("failed") == 3,
+                           f"import: 1 valida, 3 scartate (= {body.get('imported')}/{body.get('failed')})")
+                self.check([e.get("row") for e in body.get("errors", [])] == [3, 4, 5],
+                           "import: errori riportati sulle righe 3, 4 (importo fuori scala) e 5 (NUL)")
+
+        # BATCH (crea e poi elimina: i saldi restano invariati)
+        if self.cat_income_id and self.cat_expense_id:
+            rows = [
+                {"account_id": self.account_id, "category_id": cat, "amount": 10.0,
+                 "date": date.today().isoformat(), "description": "Batch test"}
+                for cat in (self.cat_income_id, self.cat_expense_id)
+            ]
+            status, body = self.req("POST", "/api/v1/transactions/batch", {"create": rows})
+            self.check(status == 200 and len(body.get("created", [])) == 2,
+                       "POST /transactions/batch (create x2) → 200")
+            batch_ids = [t["id"] for t in body.get("created", [])] if status == 200 else []
+            status, body = self.req("POST", "/api/v1/transactions/batch", {
+                "delete": batch_ids + [str(uuid.uuid4())]
+            })
+            self.check(status == 400, "batch con id inesistente → 400 (nessuna modifica)")
+            status, body = self.req("POST", "/api/v1/transactions/batch", {"delete": batch_ids})
+            self.check(status == 200 and len(body.get("deleted", [])) == 2,
+                       "POST /transactions/batch (delete x2) → 200")
+
+        # EXPORT
+        status, body = self.req("GET", "/api/v1/transactions/export", params={"search": "Stipendio test"})
+        self.check(status == 200, "GET /transactions/export → 200")
+        if status == 200:
+            lines = body.strip().splitlines()
+            self.check(lines[0].startswith("id,date,type,amount"), "export CSV: riga di intestazione")
+            self.check(len(lines) == 2 and "Stipendio test" in lines[1],
+                       f"export CSV filtrato: 1 transazione (= {len(lines) - 1})")
+        status, _ = self.req("GET", "/api/v1/transactions/export", params={"format": "xml"})
+        self.check(status == 400, "GET /transactions/export con formato non valido → 400")
+
     # =========================================================================
     # [5] TRANSFERS
     # =========================================================================
@@ -480,6 +670,14 @@ class Suite:
         status, body = self.req("GET", "/api/v1/transfers/statistics")
         self.check(status == 200, "GET /transfers/statistics → 200")
 
+        # RICONCILIAZIONE: saldi coerenti con transazioni e trasferimenti
+        status, body = self.req("GET", "/api/v1/accounts/verify-balances")
+        self.check(status == 200 and body.get("discrepancies_count") == 0,
+                   "verify-balances dopo transfer: nessuna discrepanza")
+        status, body = self.req("POST", f"/api/v1/accounts/{self.account_id}/fix-balance")
+        self.check(status == 200 and float(body.get("current_balance", -1)) == 3000.0,
+                   "POST /accounts/{id}/fix-balance → 200, balance invariato (3000)")
+
     # =========================================================================
     # [6] ANALYTICS
     # =========================================================================
@@ -507,6 +705,15 @@ class Suite:
         status, body = self.req("GET", "/api/v1/analytics/by-category")
         self.check(status == 200, "GET /analytics/by-category → 200")
 
+        status, body = self.req("GET", "/api/v1/analytics/by-category", params={"rollup": "true"})
+        self.check(status == 200, "GET /analytics/by-category?rollup=true → 200")
+        if status == 200:
+            roots = [c for c in body.get("categories", []) if c.get("parent_id") is None]
+            self.check(
+                abs(sum(c["total"] for c in roots) - body.get("grand_total", 0)) < 0.01,
+                "rollup: grand_total = somma delle categorie principali"
+            )
+
         # BY ACCOUNT
         status, body = self.req("GET", "/api/v1/analytics/by-account")
         self.check(status == 200, "GET /analytics/by-account → 200")
@@ -515,6 +722,52 @@ class Suite:
         status, body = self.req("GET", "/api/v1/analytics/daily-breakdown")
         self.check(status == 200, "GET /analytics/daily-breakdown → 200")
 
+        # MULTI-YEAR COMPARISON
+        status, body = self.req("GET", "/api/v1/analytics/multi-year-comparison", params={"last_n": 3})
+        self.check(status == 200, "GET /analytics/multi-year-comparison?last_n=3 → 200")
+        if status == 200:
+            self.check(len(body.get("years", [])) == 3, "3 anni confrontati")
+            self.check(len(body.get("totals_yoy", {})) == 2, "2 delta YoY")
+
+        status, _ = self.req("GET", "/api/v1/analytics/multi-year-comparison")
+        self.check(status == 400, "GET /analytics/multi-year-comparison senza anni → 400")
+
+        # BALANCE HISTORY: l'ultimo punto coincide con il balance attuale
+        status, body = self.req("GET", "/api/v1/analytics/balance-history",
+                                params={"granularity": "week"})
+        self.check(status == 200, "GET /analytics/balance-history?granularity=week → 200")
+        if status == 200 and self.account_id:
+            _, account = self.req("GET", f"/api/v1/accounts/{self.account_id}")
+            last = body.get("data", [{}])[-1].get("balances", {}).get(self.account_id)
+            expected = float(account.get("current_balance", 0))
+            self.check(last == expected, f"balance-history ultimo punto = current_balance ({last} == {expected})")
+
+        status, _ = self.req("GET", "/api/v1/analytics/balance-history", params={"granularity": "year"})
+        self.check(status == 400, "GET /analytics/balance-history con granularity non valida → 400")
+
+        # CACHE: la seconda lettura arriva dalla cache, una scrittura la invalida
+        url = f"{self.base}/api/v1/analytics/summary"
+        first = requests.get(url, headers=self.headers, timeout=10)
+        second = requests.get(url, headers=self.headers, timeout=10)
+        self.check(second.headers.get("X-Cache") == "HIT" and second.json() == first.json(),
+                   "GET /analytics/summary ripetuto → X-Cache: HIT, stesso contenuto")
+        if self.account_id and self.cat_expense_id:
+            status, body = self.req("POST", "/api/v1/transactions", {
+                "account_id": self.account_id,
+                "category_id": self.cat_expense_id,
+                "amount": 12.34,
+                "date": date.today().isoformat(),
+                "description": "Test invalidazione cache",
+            })
+            if self.check(status == 201, "POST /transactions (invalidazione cache) → 201"):
+                third = requests.get(url, headers=self.headers, timeout=10)
+                self.check(third.headers.get("X-Cache") == "MISS" and third.json() != second.json(),
+                           "dopo una scrittura → X-Cache: MISS con dati aggiornati")
+                self.req("DELETE", f"/api/v1/transactions/{body['id']}")
+        status, body = self.req("GET", "/health/cache")
+        self.check(status == 200 and body.get("endpoints", {}).get("analytics.summary", {}).get("hits", 0) >= 1,
+                   "GET /health/cache → hit registrati per analytics.summary")
+
     # =========================================================================
     # [7] CUSTOM CHARTS
     # =========================================================================
@@ -680,6 +933,13 @@ class Suite:
         self.check(len(body) > 0, f"Almeno una entry inserita ({len(body)} totali)")
         self.vac_entry_ids.extend([e["id"] for e in body])
 
+        status, listed = self.req("GET", "/api/v1/vacation/entries",
+                                  params={"year": year, "fields": "id,day_name"})
+        if self.check(status == 200, "GET /vacation/entries?fields=id,day_name → 200"):
+            by_id = {e["id"]: e for e in listed}
+            self.check(all(by_id.get(e["id"]) == {"id": e["id"], "day_name": e["day_name"]} for e in body),
+                       "fields=id,day_name: solo i campi richiesti, day_name calcolato")
+
     # =========================================================================
     # [11] VACATION BALANCE
     # =========================================================================